@@ -88,3 +88,13 @@ class AmootSMSService:
         except Exception as e:
             logger.error(f"General Error in Amoot Simple Service: {str(e)}", exc_info=True)
             return False
+
+    # ========== ارسال گروهی پیامک دلخواه ========== #
+    def send_bulk_message(self, mobiles: List[str], message_text: str) -> bool:
+        """
+        ارسال یک متن به چند شماره با یک درخواست SendSimple
+        (شماره‌ها با کاما جدا می‌شوند).
+        """
+        if not mobiles:
+            return True
+        return self.send_message(",".join(mobiles), message_text)
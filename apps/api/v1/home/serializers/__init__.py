@@ -1,3 +1,3 @@
 from .contact_serializers import ContactSerializer, ContactListSerializer
 from .tutorial_vid_serializers import *
-from .index_serializers import RecentPrescriptionSerializer, RecentTutorialSerializer
\ No newline at end of file
+from .index_serializers import RecentPrescriptionSerializer, RecentTutorialSerializer, HomeFeedPlanSerializer
\ No newline at end of file
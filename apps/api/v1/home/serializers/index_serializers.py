@@ -1,7 +1,10 @@
 from rest_framework import serializers
 
+from django.urls import reverse
+
 from apps.prescriptions.models import Prescription
 from apps.home.models import Tutorial
+from apps.api.v1.subscriptions.sub_serializers import PlanPublicSerializer
 
 # ========== RECENT PRESCRIPTION SERIALIZER ========== #
 class RecentPrescriptionSerializer(serializers.ModelSerializer):
@@ -11,7 +14,7 @@ class RecentPrescriptionSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Prescription
-        fields = ["title", "slug", "category_name", "access_level", "created_at"]
+        fields = ["title", "slug", "category_name", "access_level", "created_at", "view_count"]
 
 # ========== RECENT TUTORIAL SERIALIZER ========== #
 class RecentTutorialSerializer(serializers.ModelSerializer):
@@ -19,4 +22,14 @@ class RecentTutorialSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Tutorial
-        fields = ["title", "aparat_url", "created_at"]
\ No newline at end of file
+        fields = ["title", "aparat_url", "created_at"]
+# ========== HOME FEED PLAN SERIALIZER ========== #
+class HomeFeedPlanSerializer(PlanPublicSerializer):
+    """
+    پلن‌ها در payload کش شده‌ی صفحه‌ی اصلی؛ payload بدون request ساخته
+    می‌شود پس آدرس خرید نسبی است.
+    """
+    purchase_url = serializers.SerializerMethodField()
+
+    def get_purchase_url(self, obj):
+        return reverse('api:v1:order:purchase-detail', kwargs={'plan_id': obj.pk})
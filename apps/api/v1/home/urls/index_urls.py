@@ -1,7 +1,8 @@
 from django.urls import path
-from ..views import RecentPrescriptionsAPIView, RecentTutorialAPIView
+from ..views import RecentPrescriptionsAPIView, RecentTutorialAPIView, HomeFeedAPIView
 
 urlpatterns = [
     path('prescriptions/recent/', RecentPrescriptionsAPIView.as_view(), name='recent-prescriptions'),
     path('tutorials/recent/', RecentTutorialAPIView.as_view(), name='recent-tutorials'),
+    path('feed/', HomeFeedAPIView.as_view(), name='home-feed'),
 ]
\ No newline at end of file
@@ -3,5 +3,6 @@ from .base_views import *
 from .tutorial_vid_views import *
 from .index_views import (
     RecentPrescriptionsAPIView,
-    RecentTutorialAPIView
+    RecentTutorialAPIView,
+    HomeFeedAPIView,
 )
\ No newline at end of file
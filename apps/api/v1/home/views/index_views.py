@@ -1,7 +1,15 @@
+from rest_framework import status
 from rest_framework.generics import ListAPIView
-from drf_spectacular.utils import extend_schema_view, extend_schema
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiParameter, OpenApiResponse
+from drf_spectacular.types import OpenApiTypes
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control
 
 from apps.home.models import Tutorial
+from apps.home.services import get_home_feed
 from apps.prescriptions.models import Prescription, AccessChoices
 from ..serializers import (
     RecentPrescriptionSerializer,
@@ -10,7 +18,19 @@ from ..serializers import (
 
 # ========= RECENT PRESCRIPTIONS VIEW  ========= #
 @extend_schema_view(
-    get=extend_schema(tags=['Home'], summary='نمایش ۴ نسخه اخیر (رایگان)')
+    get=extend_schema(
+        tags=['Home'],
+        summary='نمایش ۴ نسخه اخیر (رایگان)',
+        parameters=[
+            OpenApiParameter(
+                name='sort',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='`recent` (پیش‌فرض)، `popular` بر اساس امتیاز محبوبیت یا `most_viewed` بر اساس تعداد بازدید',
+                required=False,
+            ),
+        ],
+    )
 )
 class RecentPrescriptionsAPIView(ListAPIView):
     """
@@ -19,7 +39,17 @@ class RecentPrescriptionsAPIView(ListAPIView):
     
     serializer_class = RecentPrescriptionSerializer
     permission_classes = []
-    queryset = Prescription.objects.filter(is_active=True, access_level=AccessChoices.free.value).order_by("-created_at")[:4]
+    sort_orderings = {
+        'recent': ['-created_at'],
+        'popular': ['-popularity', '-created_at'],
+        'most_viewed': ['-view_count', '-created_at'],
+    }
+
+    def get_queryset(self):
+        ordering = self.sort_orderings.get(self.request.query_params.get('sort'), self.sort_orderings['recent'])
+        return Prescription.objects.filter(
+            is_active=True, access_level=AccessChoices.free.value
+        ).select_related('category').order_by(*ordering)[:4]
 
 # ========= RECENT TUTORIAL VIEW  ========= #
 @extend_schema_view(
@@ -33,4 +63,45 @@ class RecentTutorialAPIView(ListAPIView):
     serializer_class = RecentTutorialSerializer
     permission_classes = []
     queryset = Tutorial.objects.all().order_by("-created_at")[:4]
-    
\ No newline at end of file
+
+
+# ========= HOME FEED VIEW  ========= #
+@extend_schema_view(
+    get=extend_schema(
+        tags=['Home'],
+        summary='داده‌های یکجای صفحه‌ی اصلی',
+        description="""
+            نسخه‌های رایگان اخیر و پربازدید، آموزش‌های اخیر، پلن‌های فعال و دسته‌بندی‌ها در یک پاسخ.
+            - payload از قبل ساخته و کش شده است و با تغییر محتوا دوباره ساخته می‌شود.
+            - **ETag**: با `If-None-Match` پاسخ `304` برمی‌گردد.
+        """,
+        responses={
+            200: OpenApiResponse(description='recent_prescriptions، popular_prescriptions، recent_tutorials، plans و categories'),
+            304: OpenApiResponse(description='تغییری نسبت به ETag ارسالی وجود ندارد'),
+        },
+    )
+)
+class HomeFeedAPIView(APIView):
+    """
+    payload کش شده‌ی صفحه‌ی اصلی؛ برای همه‌ی کاربران یکسان است پس احراز هویت
+    انجام نمی‌شود و پاسخ در کش‌های میانی (CDN/مرورگر) هم قابل نگه‌داری است.
+    """
+
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request, *args, **kwargs):
+        payload, etag = get_home_feed()
+        if request.headers.get('If-None-Match') == etag:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(payload)
+
+        response['ETag'] = etag
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=settings.HOME_FEED_MAX_AGE,
+            stale_while_revalidate=settings.HOME_FEED_MAX_AGE,
+        )
+        return response
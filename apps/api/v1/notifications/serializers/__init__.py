@@ -1,2 +1,2 @@
 from .admin_serializers import NotificationSerializer
-from .user_serializers import UserNotificationSerializer
\ No newline at end of file
+from .user_serializers import UserNotificationSerializer, UserAnnouncementSerializer
@@ -1,7 +1,7 @@
 from rest_framework import serializers
-from django.urls import reverse
+from django.contrib.contenttypes.models import ContentType
 
-from apps.notifications.models import Notification
+from apps.notifications.models import Notification, Announcement
 
 class UserNotificationSerializer(serializers.ModelSerializer):
     """
@@ -10,11 +10,13 @@ class UserNotificationSerializer(serializers.ModelSerializer):
     
     recipient_username = serializers.CharField(source='recipient.username', read_only=True)
     created_at_jalali = serializers.CharField(source='shamsi_created_at', read_only=True)
+    kind = serializers.SerializerMethodField()
     
     class Meta:
         model = Notification
         fields = [
             'id',
+            'kind',
             'recipient',
             'recipient_username',
             'title',
@@ -34,4 +36,49 @@ class UserNotificationSerializer(serializers.ModelSerializer):
             'content_type',
             'object_id',
         ]
-                    
\ No newline at end of file
+
+    def get_kind(self, obj):
+        return 'notification'
+
+
+class UserAnnouncementSerializer(serializers.ModelSerializer):
+    """
+    سریالایزر پیام گروهی در فید اعلان‌های کاربر.
+    خروجی هم‌شکل UserNotificationSerializer است تا کلاینت هر دو را یکسان نمایش دهد.
+    """
+
+    kind = serializers.SerializerMethodField()
+    recipient = serializers.SerializerMethodField()
+    recipient_username = serializers.SerializerMethodField()
+    is_read = serializers.BooleanField(read_only=True)
+    created_at_jalali = serializers.CharField(source='shamsi_created_at', read_only=True)
+    content_type = serializers.SerializerMethodField()
+    object_id = serializers.IntegerField(source='id', read_only=True)
+
+    class Meta:
+        model = Announcement
+        fields = [
+            'id',
+            'kind',
+            'recipient',
+            'recipient_username',
+            'title',
+            'message',
+            'is_read',
+            'created_at_jalali',
+            'content_type',
+            'object_id',
+        ]
+        read_only_fields = fields
+
+    def get_kind(self, obj):
+        return 'announcement'
+
+    def get_recipient(self, obj):
+        return self.context['request'].user.id
+
+    def get_recipient_username(self, obj):
+        return self.context['request'].user.username
+
+    def get_content_type(self, obj):
+        return ContentType.objects.get_for_model(Announcement).id
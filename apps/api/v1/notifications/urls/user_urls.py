@@ -1,8 +1,19 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from ..views import UserNotificationListView, UserNotificationMarkAsReadView
+from ..views import (
+    UserNotificationListView,
+    UserNotificationUnreadCountView,
+    UserNotificationMarkAsReadView,
+    UserNotificationMarkAllAsReadView,
+    UserAnnouncementMarkAsReadView,
+    notification_stream_view,
+)
 
 urlpatterns = [
     path('', UserNotificationListView.as_view(), name='notification-list'),
+    path('unread-count/', UserNotificationUnreadCountView.as_view(), name='notification-unread-count'),
+    path('stream/', notification_stream_view, name='notification-stream'),
+    path('mark-all-read/', UserNotificationMarkAllAsReadView.as_view(), name='notification-mark-all-read'),
     path('<int:pk>/', UserNotificationMarkAsReadView.as_view(), name='notification-read-as-mark'),
+    path('announcements/<int:pk>/', UserAnnouncementMarkAsReadView.as_view(), name='announcement-read-as-mark'),
 ]
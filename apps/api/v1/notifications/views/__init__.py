@@ -1,2 +1,9 @@
 from .admin_views import NotificationListView, NotificationMarkAsReadView
-from .user_views import UserNotificationListView, UserNotificationMarkAsReadView
\ No newline at end of file
+from .user_views import (
+    UserNotificationListView,
+    UserNotificationUnreadCountView,
+    UserNotificationMarkAsReadView,
+    UserNotificationMarkAllAsReadView,
+    UserAnnouncementMarkAsReadView,
+)
+from .stream_views import notification_stream_view
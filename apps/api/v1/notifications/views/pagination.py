@@ -0,0 +1,66 @@
+import base64
+from datetime import datetime
+
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
+
+from apps.notifications.services import FEED_PAGE_SIZE, feed_position, get_user_feed_page
+
+
+class NotificationFeedPagination:
+    """
+    صفحه‌بندی کرسری فید اعلان‌ها (اعلان‌های مستقیم + پیام‌های گروهی).
+    کرسر موقعیت (created_at, نوع, id) آخرین/اولین آیتم صفحه و جهت حرکت است.
+    """
+    cursor_query_param = 'cursor'
+    page_size = FEED_PAGE_SIZE
+    invalid_cursor_message = 'کرسر نامعتبر است.'
+
+    def paginate_feed(self, request, user):
+        self.request = request
+        position, reverse = self.decode_cursor(request)
+        items, has_more = get_user_feed_page(user, position, reverse, self.page_size)
+
+        self.next_position = self.previous_position = None
+        if reverse:
+            # از صفحه‌ی بعدی به عقب آمده‌ایم، پس صفحه‌ی بعد حتماً وجود دارد
+            self.next_position = feed_position(items[-1]) if items else position
+            if has_more:
+                self.previous_position = feed_position(items[0])
+        else:
+            if has_more:
+                self.next_position = feed_position(items[-1])
+            if position is not None:
+                self.previous_position = feed_position(items[0]) if items else position
+
+        return items
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    # ====== Cursor Encoding ====== #
+    def encode_cursor(self, position, reverse):
+        created_at, rank, pk = position
+        raw = f"{int(reverse)}|{created_at.isoformat()}|{rank}|{pk}"
+        cursor = base64.urlsafe_b64encode(raw.encode()).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            reverse, created_at, rank, pk = raw.split('|')
+            return (datetime.fromisoformat(created_at), int(rank), int(pk)), bool(int(reverse))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
@@ -0,0 +1,96 @@
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from apps.accounts.permissions import IsTokenJtiActive
+from apps.notifications.services import get_broker, get_unread_count, user_channels
+
+# ====== Stream Settings ====== #
+# هر اتصال بعد از این مدت بسته می‌شود و کلاینت دوباره وصل می‌شود
+STREAM_MAX_SECONDS = 5 * 60
+HEARTBEAT_SECONDS = 25
+RECONNECT_MILLISECONDS = 5000
+
+
+def _authenticate(request):
+    """
+    احراز هویت JWT مثل بقیه‌ی APIها (به علاوه‌ی بررسی active_jti).
+    خروجی: (کاربر، نقش) یا None
+    """
+    try:
+        result = JWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    if result is None:
+        return None
+
+    user, token = result
+    request.user, request.auth = user, token
+    if not IsTokenJtiActive().has_permission(request, None):
+        return None
+
+    return user, getattr(getattr(user, 'profile', None), 'role', None)
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _event_stream(user, channels):
+    """
+    ارسال تعداد خوانده نشده‌ها در شروع و بعد از هر رویداد.
+    رویدادهای اعلان/پیام گروهی جدید هدر آیتم را هم همراه دارند.
+    """
+    unread_count = sync_to_async(get_unread_count)
+
+    yield f"retry: {RECONNECT_MILLISECONDS}\n\n"
+    yield _sse('unread', {'unread_count': await unread_count(user)})
+
+    deadline = time.monotonic() + STREAM_MAX_SECONDS
+    async with get_broker().subscribe(channels) as subscription:
+        while time.monotonic() < deadline:
+            message = await subscription.get(timeout=HEARTBEAT_SECONDS)
+            if message is None:
+                yield ": keepalive\n\n"
+                continue
+
+            data = {'unread_count': await unread_count(user)}
+            if message.get('item'):
+                data['item'] = message['item']
+            yield _sse('unread', data)
+
+
+# ================================================ #
+# ====== USER NOTIFICATION EVENT STREAM VIEW ===== #
+# ================================================ #
+async def notification_stream_view(request):
+    """
+    استریم Server-Sent Events برای بروزرسانی لحظه‌ای شمارنده‌ی اعلان‌ها.
+    فقط روی اپلیکیشن ASGI (core/asgi.py) فعال است؛ در WSGI پاسخ 204
+    برمی‌گردد تا کلاینت به polling سبک unread-count برگردد.
+    Endpoint: GET /api/notifications/user/stream/
+    """
+    if request.method != 'GET':
+        return HttpResponse(status=405)
+
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+
+    auth = await sync_to_async(_authenticate)(request)
+    if auth is None:
+        return JsonResponse({'detail': 'اطلاعات احراز هویت نامعتبر است.'}, status=401)
+
+    user, role = auth
+    response = StreamingHttpResponse(
+        _event_stream(user, user_channels(user.pk, role)),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    # جلوگیری از بافر شدن پاسخ در nginx
+    response['X-Accel-Buffering'] = 'no'
+    return response
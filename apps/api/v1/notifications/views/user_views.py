@@ -2,8 +2,16 @@ from rest_framework import permissions, status, generics
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema_view, extend_schema
 
-from apps.notifications.models import Notification
-from ..serializers import UserNotificationSerializer
+from apps.notifications.models import Notification, Announcement
+from apps.notifications.services import (
+    get_read_count,
+    get_unread_count,
+    mark_notification_as_read,
+    mark_announcement_as_read,
+    mark_all_as_read,
+)
+from ..serializers import UserNotificationSerializer, UserAnnouncementSerializer
+from .pagination import NotificationFeedPagination
 
 # ======================================== #
 # ====== USER NOTIFICATION LIST VIEW ===== #
@@ -19,27 +27,68 @@ class UserNotificationListView(generics.ListAPIView):
     """
     serializer_class = UserNotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    feed_pagination_class = NotificationFeedPagination
 
-    def get_queryset(self):
-        """
-        فقط اعلان‌های مربوط به کاربر فعلی را برمی‌گرداند.
-        اعلان‌های خوانده نشده در ابتدا نمایش داده می‌شوند.
-        """
-        user = self.request.user
-        return Notification.objects.filter(recipient=user).order_by('is_read', '-created_at')
+    def serialize_item(self, item):
+        """ هر آیتم فید با سریالایزر نوع خودش """
+        serializer_class = UserAnnouncementSerializer if isinstance(item, Announcement) else UserNotificationSerializer
+        return serializer_class(item, context=self.get_serializer_context()).data
     
     def list(self, request, *args, **kwargs):
-        """ ارسال داده ها به همراه پیام های خوانده نشده """
-        queryset = self.get_queryset()
-        unread_count = queryset.filter(is_read=False).count()
-        is_read_count = queryset.filter(is_read=True).count()
-        serializer = self.get_serializer(queryset, many=True)
+        """
+        یک صفحه از فید به همراه تعداد خوانده نشده‌ها و total_count (تعداد خوانده شده‌ها،
+        مانند قبل). صفحه‌ی بعد/قبل با پارامتر cursor از لینک‌های next و previous خوانده می‌شود.
+
+        سازگاری: فید دیگر خوانده نشده‌ها را اول نمی‌آورد و فقط بر اساس جدیدترین
+        مرتب است، چون ترتیب خوانده نشده اول با تغییر وضعیت خواندن جابه‌جا می‌شود و
+        کرسر پایداری نمی‌دهد. کلاینتی که خوانده نشده‌ها را جدا لازم دارد از
+        is_read هر آیتم و unread_count استفاده کند.
+        """
+        paginator = self.feed_pagination_class()
+        feed = paginator.paginate_feed(request, request.user)
         return Response({
-            'unread_count': unread_count,
-            'total_count': is_read_count,
-            'notifications': serializer.data
+            'unread_count': get_unread_count(request.user),
+            'total_count': get_read_count(request.user),
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+            'notifications': [self.serialize_item(item) for item in feed]
         }, status=status.HTTP_200_OK)
 
+
+# ================================================ #
+# ======= USER NOTIFICATION UNREAD COUNT VIEW ===== #
+# ================================================ #
+@extend_schema_view(
+    get=extend_schema(tags=['Notifications'], summary='دریافت تعداد اعلان‌های خوانده‌نشده')
+)
+class UserNotificationUnreadCountView(generics.GenericAPIView):
+    """
+    API سبک برای polling تعداد اعلان‌های خوانده نشده (از کش).
+    Endpoint: GET /api/notifications/user/unread-count/
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        return Response({'unread_count': get_unread_count(request.user)}, status=status.HTTP_200_OK)
+
+
+# ================================================ #
+# ======= USER NOTIFICATION MARK ALL AS READ ===== #
+# ================================================ #
+@extend_schema_view(
+    post=extend_schema(tags=['Notifications'], summary='مارک کردن همه‌ی اعلان‌ها به عنوان خوانده شده')
+)
+class UserNotificationMarkAllAsReadView(generics.GenericAPIView):
+    """
+    خواندن همه‌ی اعلان‌ها و پیام‌های گروهی کاربر با یک درخواست.
+    Endpoint: POST /api/notifications/user/mark-all-read/
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        marked = mark_all_as_read(request.user)
+        return Response({'marked_count': marked, 'unread_count': 0}, status=status.HTTP_200_OK)
+
 # ================================================ #
 # ==== USER NOTIFICATION MARK AS READ VIEW ======= #
 # ================================================ #
@@ -65,9 +114,7 @@ class UserNotificationMarkAsReadView(generics.GenericAPIView):
 
     def _mark_as_read(self, notification):
         """یک متد کمکی برای جلوگیری از تکرار کد."""
-        if not notification.is_read:
-            notification.is_read = True
-            notification.save(update_fields=['is_read'])
+        mark_notification_as_read(self.request.user, notification)
         return notification
 
     def get(self, request, *args, **kwargs):
@@ -89,4 +136,42 @@ class UserNotificationMarkAsReadView(generics.GenericAPIView):
         notification = self._mark_as_read(notification)
         serializer = self.get_serializer(notification)
         return Response(serializer.data, status=status.HTTP_200_OK)
-        
\ No newline at end of file
+        
+
+# ================================================ #
+# === USER ANNOUNCEMENT MARK AS READ VIEW ======== #
+# ================================================ #
+@extend_schema_view(
+    get=extend_schema(tags=['Notifications'], summary='مشاهده پیام گروهی و مارک کردن به عنوان خوانده شده'),
+    post=extend_schema(tags=['Notifications'], summary='مارک کردن پیام گروهی به عنوان خوانده شده')
+)
+class UserAnnouncementMarkAsReadView(generics.GenericAPIView):
+    """
+    مانند UserNotificationMarkAsReadView برای پیام‌های گروهی.
+    خواندن پیام گروهی فقط یک رسید خواندن برای کاربر ثبت می‌کند.
+    Endpoint: GET, POST /api/notifications/user/announcements/<int:pk>/
+    """
+    serializer_class = UserAnnouncementSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        فقط پیام‌های گروهی که شامل کاربر فعلی می‌شوند.
+        """
+        return Announcement.objects.for_user(self.request.user)
+
+    def _mark_as_read(self, announcement):
+        """یک متد کمکی برای جلوگیری از تکرار کد."""
+        mark_announcement_as_read(self.request.user, announcement)
+        announcement.is_read = True
+        return announcement
+
+    def get(self, request, *args, **kwargs):
+        announcement = self._mark_as_read(self.get_object())
+        serializer = self.get_serializer(announcement)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def post(self, request, *args, **kwargs):
+        announcement = self._mark_as_read(self.get_object())
+        serializer = self.get_serializer(announcement)
+        return Response(serializer.data, status=status.HTTP_200_OK)
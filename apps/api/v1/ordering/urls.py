@@ -10,4 +10,5 @@ urlpatterns = [
     path('<slug:slug>/disposition/', views.OrderDispositionView.as_view(), name='order-disposition'),
     path('<slug:slug>/dynamic-fields/', views.OrderDynamicFieldsView.as_view(), name='order-dynamic-fields'),
     path('<slug:slug>/media/', views.OrderMediaView.as_view(), name='order-media'),
+    path('<slug:slug>/bundle/', views.OrderBundleView.as_view(), name='order-bundle'),
 ]
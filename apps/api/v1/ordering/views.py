@@ -1,20 +1,28 @@
-from rest_framework import generics, throttling, permissions
+import hashlib
+import json
+
+from rest_framework import generics, throttling, permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
 from rest_framework.filters import OrderingFilter
 
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Prefetch
 
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiResponse
 from drf_spectacular.types import OpenApiTypes
 
 from apps.accounts.permissions import IsTokenJtiActive
-from apps.ordering.models import (
-    Order, OrderSection, SectionItem, DrugSectionItem,
-    EmergencyDisposition, EmergencyNode, ItemRelationshipGroup, DynamicFieldNode
+from apps.ordering.models import Order
+from apps.popularity.services import record_view
+from apps.ordering.services import (
+    dynamic_field_tree_prefetch,
+    emergency_tree_prefetch,
+    get_sections_snapshot,
 )
+from apps.ordering.serializers import OrderSectionsSerializer
 from .serializers import (
-    OrderBaseSerializer, OrderSectionsSerializer,
+    OrderBaseSerializer,
     OrderDispositionSerializer, OrderDynamicFieldsSerializer,
     OrderMediaSerializer, OrderListSerializer
 )
@@ -32,7 +40,7 @@ from .permissions import IsOrderAccessible
                 name='ordering',
                 type=OpenApiTypes.STR,
                 location=OpenApiParameter.QUERY,
-                description='مرتب‌سازی: `created_at`, `-created_at`, `name`',
+                description='مرتب‌سازی: `created_at`, `-created_at`, `name`, `-view_count`, `-popularity`',
                 required=False,
             ),
         ],
@@ -46,7 +54,7 @@ class OrderListView(generics.ListAPIView):
     permission_classes = [permissions.AllowAny]
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
     filter_backends = [DjangoFilterBackend, OrderingFilter]
-    ordering_fields = ['created_at', 'updated_at', 'name']
+    ordering_fields = ['created_at', 'updated_at', 'name', 'view_count', 'popularity']
     ordering = ['-created_at']
 
     def get_queryset(self):
@@ -81,6 +89,12 @@ class OrderBaseView(generics.RetrieveAPIView):
     def get_queryset(self):
         return Order.objects.select_related('category').prefetch_related('aliases')
 
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        # بخش base نقطه‌ی ورود صفحه‌ی اوردر است؛ بازدید همین‌جا شمرده می‌شود
+        record_view('order', instance.pk, request)
+        return Response(self.get_serializer(instance).data)
+
 
 # ========== ORDER SECTIONS VIEW ========== #
 @extend_schema_view(
@@ -238,36 +252,22 @@ class OrderSectionsView(generics.RetrieveAPIView):
 
     def get_queryset(self):
         """
-        کوئری بهینه شده با prefetch برای واکشی تمام داده‌های مورد نیاز
-        شامل گروه‌های ارتباطی و آیتم‌های داخل آن‌ها.
+        خروجی از snapshot ذخیره شده روی Order خوانده می‌شود و درخت سکشن‌ها
+        فقط هنگام ساخت snapshot (بعد از تغییر) واکشی می‌شود.
         """
-        return Order.objects.prefetch_related(
-            Prefetch(
-                'sections',
-                queryset=OrderSection.objects.prefetch_related(
-                    Prefetch(
-                        'items',
-                        queryset=SectionItem.objects.prefetch_related('conditions')
-                    ),
-                    Prefetch(
-                        'drug_items',
-                        queryset=DrugSectionItem.objects.select_related('drug').prefetch_related('conditions')
-                    ),
-                    Prefetch(
-                        'relationship_groups',
-                        queryset=ItemRelationshipGroup.objects.prefetch_related(
-                            Prefetch(
-                                'text_items',
-                                queryset=SectionItem.objects.prefetch_related('conditions')
-                            ),
-                            Prefetch(
-                                'drug_items',
-                                queryset=DrugSectionItem.objects.select_related('drug').prefetch_related('conditions')
-                            )
-                        )
-                    )
-                )
-            )
+        return Order.objects.all()
+
+    def retrieve(self, request, *args, **kwargs):
+        order = self.get_object()
+        sections, digest = get_sections_snapshot(order)
+
+        etag = f'"{digest}"'
+        if request.headers.get('If-None-Match') == etag:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        return Response(
+            {'id': order.id, 'slug': order.slug, 'sections': sections},
+            headers={'ETag': etag},
         )
 
 
@@ -292,12 +292,7 @@ class OrderDispositionView(generics.RetrieveAPIView):
     lookup_field = 'slug'
 
     def get_queryset(self):
-        return Order.objects.prefetch_related(
-            Prefetch(
-                'emergency_disposition__nodes',
-                queryset=EmergencyNode.objects.filter(parent__isnull=True).prefetch_related('children')
-            )
-        )
+        return Order.objects.prefetch_related(emergency_tree_prefetch('emergency_disposition__nodes'))
 
 
 # ========== ORDER DYNAMIC FIELDS VIEW ========== #
@@ -319,12 +314,7 @@ class OrderDynamicFieldsView(generics.RetrieveAPIView):
     lookup_field = 'slug'
 
     def get_queryset(self):
-        return Order.objects.prefetch_related(
-            Prefetch(
-                'dynamic_field_groups__nodes',
-                queryset=DynamicFieldNode.objects.filter(parent__isnull=True).prefetch_related('children')
-            )
-        )
+        return Order.objects.prefetch_related(dynamic_field_tree_prefetch())
 
 
 # ========== ORDER MEDIA VIEW ========== #
@@ -348,3 +338,111 @@ class OrderMediaView(generics.RetrieveAPIView):
 
     def get_queryset(self):
         return Order.objects.prefetch_related('images', 'videos')
+
+
+# ========== ORDER BUNDLE VIEW ========== #
+# بخش‌های قابل درخواست در bundle و prefetch لازم برای هر کدام
+BUNDLE_PARTS = {
+    'base': lambda: ('aliases',),
+    'sections': lambda: (),
+    'disposition': lambda: ('emergency_disposition', emergency_tree_prefetch('emergency_disposition__nodes')),
+    'dynamic_fields': lambda: (dynamic_field_tree_prefetch(),),
+    'media': lambda: ('images', 'videos'),
+}
+
+
+def bundle_prefetch_lookups(parts):
+    return [lookup for part in parts for lookup in BUNDLE_PARTS[part]()]
+
+
+def serialize_bundle_part(part, order, context):
+    if part == 'base':
+        return OrderBaseSerializer(order, context=context).data
+    if part == 'disposition':
+        return OrderDispositionSerializer(order, context=context).data['emergency_disposition']
+    if part == 'dynamic_fields':
+        return OrderDynamicFieldsSerializer(order, context=context).data['dynamic_field_groups']
+    media = OrderMediaSerializer(order, context=context).data
+    return {'images': media['images'], 'videos': media['videos']}
+
+
+def serialize_order_bundle(order, parts, context):
+    """
+    خروجی bundle یک Order (با prefetch بخش‌ها) به همراه نسخه‌ی هر بخش.
+    خروجی: (data, versions) که versions لیست 'part:hash' است.
+    """
+    data = {'id': order.id, 'slug': order.slug}
+    versions = []
+    for part in parts:
+        if part == 'sections':
+            # snapshot از پیش ساخته شده و hash آن دوباره محاسبه نمی‌شود
+            data['sections'], digest = get_sections_snapshot(order)
+        else:
+            data[part] = serialize_bundle_part(part, order, context)
+            digest = hashlib.sha256(
+                json.dumps(data[part], sort_keys=True, default=str).encode('utf-8')
+            ).hexdigest()
+        versions.append(f'{part}:{digest}')
+    return data, versions
+
+
+@extend_schema_view(
+    get=extend_schema(
+        tags=['Ordering'],
+        summary='دریافت یکجای بخش‌های یک سفارش (Bundle)',
+        description="""
+            هر ترکیبی از بخش‌های `base`، `sections`، `disposition`، `dynamic_fields` و `media`
+            را در یک پاسخ برمی‌گرداند؛ خروجی هر بخش دقیقاً همان خروجی اندپوینت جداگانه‌ی آن است.
+            - **include**: لیست بخش‌ها با کاما (پیش‌فرض: همه)، مثلاً `?include=base,sections`
+            - **ETag**: نسخه‌ی ترکیبی بخش‌های درخواست شده؛ با `If-None-Match` پاسخ `304` برمی‌گردد.
+            - دسترسی، احراز هویت و throttle فقط یک بار برای کل درخواست بررسی می‌شوند.
+        """,
+        parameters=[
+            OpenApiParameter(
+                name='include',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='بخش‌ها با کاما: `base`, `sections`, `disposition`, `dynamic_fields`, `media`',
+                required=False,
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(description='بخش‌های درخواست شده به همراه id و slug سفارش'),
+            304: OpenApiResponse(description='تغییری نسبت به ETag ارسالی وجود ندارد'),
+            400: OpenApiResponse(description='نام بخش نامعتبر است'),
+        },
+    )
+)
+class OrderBundleView(generics.RetrieveAPIView):
+    permission_classes = [IsOrderAccessible, IsTokenJtiActive]
+    throttle_classes = [throttling.AnonRateThrottle, throttling.UserRateThrottle]
+    lookup_field = 'slug'
+
+    def get_parts(self):
+        include = self.request.query_params.get('include')
+        if not include:
+            return list(BUNDLE_PARTS)
+
+        parts = [part.strip() for part in include.split(',') if part.strip()]
+        invalid = [part for part in parts if part not in BUNDLE_PARTS]
+        if invalid:
+            raise ValidationError({'include': f"بخش نامعتبر: {', '.join(invalid)}"})
+        return list(dict.fromkeys(parts))
+
+    def get_queryset(self):
+        return Order.objects.select_related('category').prefetch_related(*bundle_prefetch_lookups(self.parts))
+
+    def retrieve(self, request, *args, **kwargs):
+        self.parts = self.get_parts()
+        order = self.get_object()
+        context = self.get_serializer_context()
+        if 'base' in self.parts:
+            record_view('order', order.pk, request)
+
+        data, versions = serialize_order_bundle(order, self.parts, context)
+        etag = '"{}"'.format(hashlib.sha256('|'.join(versions).encode('utf-8')).hexdigest())
+        if request.headers.get('If-None-Match') == etag:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        return Response(data, headers={'ETag': etag})
+
@@ -8,3 +8,4 @@ from .all_serializers import (
 from .pres_list_serializers import PrescriptionListSerializer
 from .pres_detail_serializers import PrescriptionDetailSerializer
 from .pres_detail_desc_seriailzers import PrescriptionDescriptionSerializer
+from .drug_usage_serializers import DrugUsageSerializer
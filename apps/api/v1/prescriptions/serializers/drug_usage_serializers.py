@@ -0,0 +1,33 @@
+from rest_framework import serializers
+
+from apps.prescriptions.models import DrugUsage
+
+
+# ======== DRUG USAGE SERIALIZER ======== #
+class DrugUsageSerializer(serializers.ModelSerializer):
+    """موارد استفاده‌ی دارو؛ عنوان نسخه‌ها و اوردرها از context خوانده می‌شود"""
+    drug = serializers.SerializerMethodField()
+    prescriptions = serializers.SerializerMethodField()
+    orders = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DrugUsage
+        fields = [
+            'drug', 'prescription_count', 'order_count',
+            'prescriptions', 'orders', 'updated_at',
+        ]
+
+    def get_drug(self, obj):
+        return {'id': obj.drug.id, 'title': obj.drug.title, 'code': obj.drug.code}
+
+    def get_prescriptions(self, obj):
+        return [
+            {'id': prescription.id, 'title': prescription.title, 'slug': prescription.slug}
+            for prescription in self.context.get('prescriptions', [])
+        ]
+
+    def get_orders(self, obj):
+        return [
+            {'id': order.id, 'name': order.name, 'slug': order.slug}
+            for order in self.context.get('orders', [])
+        ]
@@ -3,6 +3,7 @@ from rest_framework import serializers
 from django.urls import reverse
 
 from apps.prescriptions.models import Prescription
+from apps.prescriptions.services import get_related_prescriptions
 from .all_serializers import (
     PrescriptionAliasSerializer,
     PrescriptionCategorySerializer,
@@ -11,6 +12,7 @@ from .all_serializers import (
     PrescriptionVideoSerializer,
     DrugSerializer,
 )
+from .pres_list_serializers import PrescriptionListSerializer
 
 # ======== PRESCRIPTION DETAIL SERIALIZER ======== #
 class PrescriptionDetailSerializer(serializers.ModelSerializer):
@@ -23,6 +25,7 @@ class PrescriptionDetailSerializer(serializers.ModelSerializer):
     primary_name = serializers.SerializerMethodField()
     description_url = serializers.SerializerMethodField()
     is_saved = serializers.SerializerMethodField()
+    related_prescriptions = serializers.SerializerMethodField()
     
     class Meta:
         model = Prescription
@@ -33,6 +36,7 @@ class PrescriptionDetailSerializer(serializers.ModelSerializer):
             'images', 'videos', 'access_level',
             'primary_name', "description_url",
             'created_at', 'is_saved',
+            'related_prescriptions',
         ]
     
     def get_description_url(self, obj):
@@ -52,6 +56,10 @@ class PrescriptionDetailSerializer(serializers.ModelSerializer):
                 return True
         return False
     
+    def get_related_prescriptions(self, obj):
+        """نسخه‌های مشابه از جدول از پیش محاسبه شده"""
+        return PrescriptionListSerializer(get_related_prescriptions(obj), many=True, context=self.context).data
+    
     def get_all_names(self, obj):
         return obj.get_all_names()
     
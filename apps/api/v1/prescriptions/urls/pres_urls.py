@@ -5,6 +5,7 @@ app_name = 'prescriptions_api'
 
 urlpatterns = [
     path('', views.PrescriptionListView.as_view(), name='prescription-list'),
+    path('drugs/<int:pk>/usage/', views.DrugUsageView.as_view(), name='drug-usage'),
     path('<slug:slug>/', views.PrescriptionDetailView.as_view(), name='prescription-detail'),
     path('<slug:slug>/description/', views.PrescriptionDescriptionView.as_view(), name='prescription-description'),
 ]
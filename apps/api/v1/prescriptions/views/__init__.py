@@ -1,3 +1,4 @@
 from .pres_list_views import PrescriptionListView
 from .pres_detail_views import PrescriptionDetailView
-from .pres_detail_desc_views import PrescriptionDescriptionView
\ No newline at end of file
+from .pres_detail_desc_views import PrescriptionDescriptionView
+from .drug_usage_views import DrugUsageView
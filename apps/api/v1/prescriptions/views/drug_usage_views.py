@@ -0,0 +1,39 @@
+from rest_framework import generics, permissions, throttling
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema_view, extend_schema
+
+from django.shortcuts import get_object_or_404
+
+from apps.accounts.permissions import IsTokenJtiActive
+from apps.ordering.models import Order
+from apps.prescriptions.models import Drug, Prescription
+from apps.prescriptions.services import get_drug_usage
+from ..serializers import DrugUsageSerializer
+
+# ========== DRUG USAGE VIEW ========== #
+@extend_schema_view(
+    get=extend_schema(
+        tags=['Prescriptions'],
+        summary='موارد استفاده‌ی دارو',
+        description='نسخه‌ها و اوردرهایی که از دارو استفاده می‌کنند (از ایندکس معکوس، مخصوص ادمین).',
+    ),
+)
+class DrugUsageView(generics.RetrieveAPIView):
+    """
+    موارد استفاده‌ی یک دارو برای فراخوان دارویی یا بررسی اثر حذف آن
+    """
+
+    serializer_class = DrugUsageSerializer
+    permission_classes = [permissions.IsAdminUser, IsTokenJtiActive]
+    throttle_classes = [throttling.UserRateThrottle]
+
+    def get_object(self):
+        drug = get_object_or_404(Drug, pk=self.kwargs['pk'])
+        return get_drug_usage(drug.pk)
+
+    def retrieve(self, request, *args, **kwargs):
+        usage = self.get_object()
+        context = self.get_serializer_context()
+        context['prescriptions'] = Prescription.objects.filter(pk__in=usage.prescription_ids).order_by('pk')
+        context['orders'] = Order.objects.filter(pk__in=usage.order_ids).order_by('pk')
+        return Response(self.get_serializer_class()(usage, context=context).data)
@@ -1,9 +1,11 @@
 from rest_framework import generics, throttling
+from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema_view, extend_schema
 
 from django.db.models import Prefetch
 
 from apps.accounts.permissions import IsTokenJtiActive
+from apps.popularity.services import record_view
 from apps.prescriptions.models import Prescription, PrescriptionDrug
 from ..serializers import PrescriptionDetailSerializer
 from .permissions import IsPrescriptionAccessible
@@ -37,4 +39,9 @@ class PrescriptionDetailView(generics.RetrieveAPIView):
         )
         
         return queryset
-        
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        # شمارش بازدید فقط در Redis؛ ستون‌های دیتابیس با تسک دوره‌ای به‌روز می‌شوند
+        record_view('prescription', instance.pk, request)
+        return Response(self.get_serializer(instance).data)
@@ -30,7 +30,7 @@ class PrescriptionListView(generics.ListAPIView):
     permission_classes = [permissions.AllowAny]
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
     filter_backends = [DjangoFilterBackend, OrderingFilter]
-    ordering_fields = ['created_at', 'updated_at', 'title']
+    ordering_fields = ['created_at', 'updated_at', 'title', 'view_count', 'popularity']
     ordering = ['-created_at']
 
     def get_queryset(self):
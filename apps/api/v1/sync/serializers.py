@@ -0,0 +1,45 @@
+from rest_framework import serializers
+
+from apps.prescriptions.models import Drug, Prescription, PrescriptionCategory, PrescriptionDrug
+from apps.api.v1.prescriptions.serializers import (
+    PrescriptionAliasSerializer,
+    PrescriptionImageSerializer,
+    PrescriptionVideoSerializer,
+)
+
+
+# ========== SYNC SERIALIZERS ========== #
+# خروجی فشرده؛ روابط فقط با شناسه آمده‌اند و کلاینت خودش آن‌ها را وصل می‌کند
+class SyncCategorySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PrescriptionCategory
+        fields = ['id', 'title', 'slug', 'color_code', 'updated_at']
+
+
+class SyncDrugSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Drug
+        fields = ['id', 'title', 'code', 'updated_at']
+
+
+class SyncPrescriptionSerializer(serializers.ModelSerializer):
+    aliases = PrescriptionAliasSerializer(many=True, read_only=True)
+    images = PrescriptionImageSerializer(many=True, read_only=True)
+    videos = PrescriptionVideoSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Prescription
+        fields = [
+            'id', 'title', 'slug', 'category_id', 'access_level',
+            'description', 'detailed_description',
+            'aliases', 'images', 'videos', 'updated_at',
+        ]
+
+
+class SyncPrescriptionDrugSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PrescriptionDrug
+        fields = [
+            'id', 'prescription_id', 'drug_id', 'dosage', 'amount', 'instructions',
+            'is_combination', 'is_substitute', 'order', 'group_number',
+        ]
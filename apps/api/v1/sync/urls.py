@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+app_name = 'sync_api'
+
+urlpatterns = [
+    path('changes/', views.SyncChangesView.as_view(), name='sync-changes'),
+]
@@ -0,0 +1,84 @@
+from rest_framework import generics, throttling, permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiResponse
+from drf_spectacular.types import OpenApiTypes
+
+from django.db.models import prefetch_related_objects
+
+from apps.accounts.permissions import IsTokenJtiActive
+from apps.sync.models import ContentChange
+from apps.sync.services import SYNC_PAGE_SIZE, InvalidCursor, read_changes
+from apps.api.v1.ordering.views import BUNDLE_PARTS, bundle_prefetch_lookups, serialize_order_bundle
+from .serializers import (
+    SyncCategorySerializer, SyncDrugSerializer,
+    SyncPrescriptionSerializer, SyncPrescriptionDrugSerializer,
+)
+
+SYNC_SERIALIZERS = {
+    ContentChange.ENTITY_CATEGORY: SyncCategorySerializer,
+    ContentChange.ENTITY_DRUG: SyncDrugSerializer,
+    ContentChange.ENTITY_PRESCRIPTION: SyncPrescriptionSerializer,
+    ContentChange.ENTITY_PRESCRIPTION_DRUG: SyncPrescriptionDrugSerializer,
+}
+
+
+# ========== SYNC CHANGES VIEW ========== #
+@extend_schema_view(
+    get=extend_schema(
+        tags=['Sync'],
+        summary='فید تغییرات برای همگام‌سازی آفلاین',
+        description="""
+            تغییرات دسته‌بندی‌ها، داروها، نسخه‌ها، داروهای نسخه و اوردرها (کل bundle) بعد از cursor.
+            - **cursor**: مقدار `cursor` پاسخ قبلی؛ بدون آن همگام‌سازی از اول است.
+            - **limit**: تعداد تغییرات هر صفحه (پیش‌فرض 100، حداکثر 500).
+            - هر تغییر `{type, id, op, data}` است؛ برای `op=delete` فیلد `data` نمی‌آید.
+              محتوایی که دیگر در دسترس کاربر نیست (غیرفعال یا ویژه بدون اشتراک) هم `delete` می‌شود.
+            - **reset=true**: کلاینت باید داده‌ی محلی را پاک کند (اولین همگام‌سازی، cursor منقضی یا تغییر اشتراک).
+            - تا وقتی `has_more=true` است صفحه‌ی بعد را با cursor جدید بگیرید.
+        """,
+        parameters=[
+            OpenApiParameter(name='cursor', type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, required=False),
+            OpenApiParameter(name='limit', type=OpenApiTypes.INT, location=OpenApiParameter.QUERY, required=False),
+        ],
+        responses={
+            200: OpenApiResponse(description='changes, cursor, has_more, reset'),
+            400: OpenApiResponse(description='cursor یا limit نامعتبر است'),
+        },
+    )
+)
+class SyncChangesView(generics.GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated, IsTokenJtiActive]
+    throttle_classes = [throttling.UserRateThrottle]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = int(request.query_params.get('limit', SYNC_PAGE_SIZE))
+            page = read_changes(request.user, request.query_params.get('cursor'), limit)
+        except InvalidCursor as e:
+            raise ValidationError({'cursor': str(e)})
+        except ValueError:
+            raise ValidationError({'limit': "limit باید عدد باشد"})
+
+        context = self.get_serializer_context()
+        orders = [obj for entity, _, obj in page.changes if entity == ContentChange.ENTITY_ORDER and obj]
+        prefetch_related_objects(orders, *bundle_prefetch_lookups(BUNDLE_PARTS))
+
+        changes = []
+        for entity, object_id, obj in page.changes:
+            if obj is None:
+                changes.append({'type': entity, 'id': object_id, 'op': 'delete'})
+                continue
+            if entity == ContentChange.ENTITY_ORDER:
+                data, _ = serialize_order_bundle(obj, list(BUNDLE_PARTS), context)
+            else:
+                data = SYNC_SERIALIZERS[entity](obj, context=context).data
+            changes.append({'type': entity, 'id': object_id, 'op': 'upsert', 'data': data})
+
+        return Response({
+            'changes': changes,
+            'cursor': page.cursor,
+            'has_more': page.has_more,
+            'reset': page.reset,
+        })
@@ -12,4 +12,5 @@ urlpatterns = [
     path('questions/', include('apps.api.v1.questions.question_urls')),
     path('payment/', include('apps.api.v1.payment.urls')),
     path('notifications/', include('apps.api.v1.notifications.urls')),
+    path('sync/', include('apps.api.v1.sync.urls')),
 ]
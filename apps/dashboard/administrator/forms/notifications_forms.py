@@ -32,7 +32,7 @@ class SingleNotificationForm(forms.ModelForm):
 class AnnouncementForm(forms.ModelForm):
     class Meta:
         model = Announcement
-        fields = ['title', 'message', 'target_role']
+        fields = ['title', 'message', 'target_role', 'send_sms', 'send_email']
         widgets = {
             'target_role': forms.Select(attrs={
                 'class': 'w-full border border-slate-300 rounded-lg px-3 py-2 focus:outline-none focus:ring-2 focus:ring-indigo-500 focus:border-indigo-500 transition duration-150 ease-in-out sm:text-sm',
@@ -271,6 +271,19 @@ class DynamicFieldChildNodeForm(forms.ModelForm):
 
 
 class SkipEmptyNodeFormSet(BaseInlineFormSet):
+    """
+    preloaded: فرزندان از پیش واکشی شده‌ی گره (مثلاً با children_by_parent)؛
+    در این حالت فرم‌ست برای خواندن فرزندان کوئری جداگانه نمی‌زند.
+    """
+    def __init__(self, *args, preloaded=None, **kwargs):
+        self.preloaded = preloaded
+        super().__init__(*args, **kwargs)
+
+    def get_queryset(self):
+        if self.preloaded is not None:
+            return self.preloaded
+        return super().get_queryset()
+
     def full_clean(self):
         super().full_clean()
         for form in self.forms:
@@ -363,6 +376,19 @@ class EmergencyChildNodeForm(forms.ModelForm):
         return self.cleaned_data.get('order_index') or 0
 
 class SkipEmptyNodeFormSet(BaseInlineFormSet):
+    """
+    preloaded: فرزندان از پیش واکشی شده‌ی گره (مثلاً با children_by_parent)؛
+    در این حالت فرم‌ست برای خواندن فرزندان کوئری جداگانه نمی‌زند.
+    """
+    def __init__(self, *args, preloaded=None, **kwargs):
+        self.preloaded = preloaded
+        super().__init__(*args, **kwargs)
+
+    def get_queryset(self):
+        if self.preloaded is not None:
+            return self.preloaded
+        return super().get_queryset()
+
     def full_clean(self):
         super().full_clean()
         for form in self.forms:
@@ -1,23 +1,38 @@
+import logging
 import os
-from google.analytics.data_v1beta import BetaAnalyticsDataClient
-from google.analytics.data_v1beta.types import (
-    DateRange,
-    Dimension,
-    Metric,
-    RunReportRequest,
-)
+import time
+from datetime import timedelta
 
 from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# ====== Report Cache Settings ====== #
+GA_REPORT_CACHE_KEY = 'dashboard:ga:last_7_days_report'
+GA_REFRESH_LOCK_KEY = 'dashboard:ga:last_7_days_report:refreshing'
+
+# بعد از این مدت گزارش کهنه محسوب می‌شود و در پس‌زمینه تازه‌سازی می‌شود
+GA_REPORT_FRESH_SECONDS = getattr(settings, 'GA4_REPORT_FRESH_SECONDS', 15 * 60)
+# گزارش کهنه تا این مدت نگه داشته می‌شود تا داشبورد هیچ‌وقت خالی نماند
+GA_REPORT_MAX_AGE_SECONDS = 24 * 60 * 60
+GA_REFRESH_LOCK_SECONDS = 5 * 60
+
+# کلاینت گوگل در هر پروسه یک بار ساخته می‌شود
+_client = None
+
 
 # ===== Google Analytics Service ===== #
 class GoogleAnalyticsService:
     """
     سرویس گوگل که اطلاعات مربوط به وبسایت رو دریافت میکنه
     و در یک قالب نمایش میده.
+    کتابخانه‌ی گوگل فقط هنگام اولین درخواست واقعی import می‌شود.
     """
     def __init__(self):
         """
-        مقداردهی اولیه کلاینت و تنظیم فایل اعتبارسنجی
+        مقداردهی اولیه و بررسی تنظیمات
         """
         # دریافت تنظیمات از settings.py
         self.property_id = getattr(settings, 'GA4_PROPERTY_ID', None)
@@ -26,43 +41,135 @@ class GoogleAnalyticsService:
         if not self.property_id:
             raise ValueError("GA4_PROPERTY_ID is not set in Django settings.")
 
-        # تنظیم Environment Variable برای دسترسی کتابخانه گوگل
-        os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = self.key_file_path
-        self.client = BetaAnalyticsDataClient()
+    @property
+    def client(self):
+        """ساخت تنبل کلاینت گوگل و استفاده‌ی مجدد از آن در طول عمر پروسه"""
+        global _client
+        if _client is None:
+            from google.analytics.data_v1beta import BetaAnalyticsDataClient
+
+            _client = BetaAnalyticsDataClient.from_service_account_file(self.key_file_path)
+        return _client
 
     def get_last_7_days_report(self):
         """
         دریافت گزارش بازدید ۷ روز گذشته
         خروجی: لیستی از دیکشنری‌ها شامل تاریخ، کاربران فعال و بازدید صفحات
         """
-        try:
-            request = RunReportRequest(
-                property=f"properties/{self.property_id}",
-                dimensions=[Dimension(name="date")],
-                metrics=[
-                    Metric(name="activeUsers"),
-                    Metric(name="screenPageViews"),
-                    Metric(name="newUsers")
-                ],
-                date_ranges=[DateRange(start_date="7daysAgo", end_date="today")],
-            )
-
-            response = self.client.run_report(request)
-
-            data = []
-            for row in response.rows:
-                data.append({
-                    "date": row.dimension_values[0].value,
-                    # مقادیر متریک به صورت رشته برمی‌گردند، تبدیل به int می‌کنیم
-                    "active_users": int(row.metric_values[0].value),
-                    "page_views": int(row.metric_values[1].value),
-                    "new_users": int(row.metric_values[2].value),
-                })
-
-            # ===== مرتب سازی براساس تاریخ بازدید ===== #
-            data.sort(key=lambda x: x['date'])
-            return data
-
-        except Exception as e:
-            print(f"Google Analytics API Error: {e}")
-            return []
+        from google.analytics.data_v1beta.types import (
+            DateRange,
+            Dimension,
+            Metric,
+            RunReportRequest,
+        )
+
+        request = RunReportRequest(
+            property=f"properties/{self.property_id}",
+            dimensions=[Dimension(name="date")],
+            metrics=[
+                Metric(name="activeUsers"),
+                Metric(name="screenPageViews"),
+                Metric(name="newUsers")
+            ],
+            date_ranges=[DateRange(start_date="7daysAgo", end_date="today")],
+        )
+
+        response = self.client.run_report(request)
+
+        data = []
+        for row in response.rows:
+            data.append({
+                "date": row.dimension_values[0].value,
+                # مقادیر متریک به صورت رشته برمی‌گردند، تبدیل به int می‌کنیم
+                "active_users": int(row.metric_values[0].value),
+                "page_views": int(row.metric_values[1].value),
+                "new_users": int(row.metric_values[2].value),
+            })
+
+        # ===== مرتب سازی براساس تاریخ بازدید ===== #
+        data.sort(key=lambda x: x['date'])
+        return data
+
+
+# ===== Fake Analytics Service ===== #
+class FakeAnalyticsService:
+    """
+    سرویس جایگزین بدون ارتباط با گوگل برای تست‌ها، محیط توسعه و تست بار.
+    داده‌ها قطعی (deterministic) هستند.
+    """
+    def get_last_7_days_report(self):
+        today = timezone.localdate()
+        data = []
+        for offset in range(7, -1, -1):
+            day = today - timedelta(days=offset)
+            seed = day.toordinal()
+            data.append({
+                "date": day.strftime("%Y%m%d"),
+                "active_users": 100 + seed % 50,
+                "page_views": 400 + seed % 200,
+                "new_users": 20 + seed % 15,
+            })
+        return data
+
+
+ANALYTICS_BACKENDS = {
+    'google': GoogleAnalyticsService,
+    'fake': FakeAnalyticsService,
+}
+
+
+def get_analytics_service():
+    """ساخت سرویس آنالیتیکس بر اساس GA4_BACKEND در تنظیمات"""
+    backend = getattr(settings, 'GA4_BACKEND', 'google')
+    return ANALYTICS_BACKENDS[backend]()
+
+
+# ===== Cached Report ===== #
+def refresh_last_7_days_report():
+    """
+    دریافت گزارش از سرویس و ذخیره در کش.
+    توسط تسک دوره‌ای (و در صورت کهنه بودن کش) در پس‌زمینه اجرا می‌شود.
+    """
+    try:
+        data = get_analytics_service().get_last_7_days_report()
+    except Exception as e:
+        logger.error(f"Google Analytics API Error: {e}", exc_info=True)
+        return None
+    finally:
+        cache.delete(GA_REFRESH_LOCK_KEY)
+
+    cache.set(
+        GA_REPORT_CACHE_KEY,
+        {'data': data, 'fetched_at': time.time()},
+        GA_REPORT_MAX_AGE_SECONDS,
+    )
+    return data
+
+
+def get_cached_last_7_days_report():
+    """
+    خواندن گزارش از کش (stale-while-revalidate).
+    اگر گزارش کهنه یا موجود نباشد، تازه‌سازی در پس‌زمینه زمان‌بندی می‌شود
+    و همان داده‌ی فعلی (یا لیست خالی) برگردانده می‌شود؛ درخواست هیچ‌وقت
+    منتظر گوگل نمی‌ماند.
+    """
+    cached = cache.get(GA_REPORT_CACHE_KEY)
+
+    if cached is None or time.time() - cached['fetched_at'] > GA_REPORT_FRESH_SECONDS:
+        _schedule_refresh()
+
+    return cached['data'] if cached else []
+
+
+def _schedule_refresh():
+    """زمان‌بندی تازه‌سازی گزارش؛ با قفل کش فقط یک تسک در صف قرار می‌گیرد"""
+    if not cache.add(GA_REFRESH_LOCK_KEY, True, GA_REFRESH_LOCK_SECONDS):
+        return
+
+    from apps.dashboard.tasks import refresh_google_analytics_report
+
+    try:
+        refresh_google_analytics_report.delay()
+    except Exception as e:
+        cache.delete(GA_REFRESH_LOCK_KEY)
+        logger.error(f"Could not schedule Google Analytics refresh: {e}")
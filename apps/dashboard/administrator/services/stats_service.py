@@ -0,0 +1,46 @@
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+# ====== Header Stats Settings ====== #
+HEADER_STATS_CACHE_PREFIX = 'dashboard_header_stats'
+HEADER_STATS_TIMEOUT = 30
+
+
+# ====== Header Stats ====== #
+def get_header_stats(queryset, counters, cache_key, timeout=HEADER_STATS_TIMEOUT):
+    """
+    محاسبه‌ی همه‌ی شمارنده‌های کارت‌های بالای صفحه‌ی لیست با یک کوئری aggregate.
+
+    - queryset: مدل یا کوئری‌ست پایه
+    - counters: دیکشنری {نام شمارنده: Q یا None یا عبارت تجمیعی}
+        None یعنی شمارش همه‌ی رکوردها، Q یعنی Count('pk', filter=Q)
+        و در غیر این صورت خود عبارت (مثلاً Count با distinct) استفاده می‌شود.
+    - cache_key: نام یکتای آمار این صفحه؛ نتیجه برای timeout ثانیه کش می‌شود.
+
+    مثال:
+        get_header_stats(Drug, {
+            'total': None,
+            'order': Q(is_for_order=True),
+        }, cache_key='drugs')
+    """
+    full_key = f'{HEADER_STATS_CACHE_PREFIX}:{cache_key}'
+    stats = cache.get(full_key)
+    if stats is not None:
+        return stats
+
+    if not hasattr(queryset, 'aggregate'):
+        queryset = queryset.objects.all()
+
+    aggregates = {}
+    for name, counter in counters.items():
+        if counter is None:
+            aggregates[name] = Count('pk')
+        elif isinstance(counter, Q):
+            aggregates[name] = Count('pk', filter=counter)
+        else:
+            aggregates[name] = counter
+
+    stats = queryset.order_by().aggregate(**aggregates)
+    cache.set(full_key, stats, timeout)
+    return stats
+
@@ -0,0 +1,159 @@
+from datetime import datetime, timedelta
+
+import jdatetime
+from django.db.models import Case, Count, IntegerField, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+# ====== Bucket Sizes ====== #
+BUCKET_DAY = 'day'
+BUCKET_WEEK = 'week'
+BUCKET_JALALI_MONTH = 'jmonth'
+
+BUCKET_CHOICES = (BUCKET_DAY, BUCKET_WEEK, BUCKET_JALALI_MONTH)
+
+# نگاشت پارامتر period که فرانت‌اند می‌فرستد به اندازه‌ی بازه
+PERIOD_TO_BUCKET = {
+    'daily': BUCKET_DAY,
+    'weekly': BUCKET_WEEK,
+    'monthly': BUCKET_JALALI_MONTH,
+}
+
+# بازه‌ی پیش‌فرض هر نوع بازه (بر حسب روز)
+DEFAULT_RANGE_DAYS = {
+    BUCKET_DAY: 30,
+    BUCKET_WEEK: 7 * 12,
+    BUCKET_JALALI_MONTH: 365,
+}
+
+
+# ====== Bucket Boundaries ====== #
+def _local_midnight(day):
+    """شروع روز (نیمه‌شب) به وقت محلی به صورت datetime آگاه از منطقه زمانی"""
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def _bucket_starts(start_day, end_day, bucket):
+    """
+    لیست تاریخ شروع بازه‌ها از start_day تا end_day (میلادی).
+    هفته‌ها از شنبه شروع می‌شوند و ماه‌ها، ماه‌های شمسی هستند.
+    """
+    if bucket == BUCKET_DAY:
+        return [start_day + timedelta(days=i) for i in range((end_day - start_day).days + 1)]
+
+    if bucket == BUCKET_WEEK:
+        # در تقویم شمسی هفته از شنبه آغاز می‌شود (weekday شنبه = 5)
+        first = start_day - timedelta(days=(start_day.weekday() - 5) % 7)
+        return [first + timedelta(weeks=i) for i in range((end_day - first).days // 7 + 1)]
+
+    if bucket == BUCKET_JALALI_MONTH:
+        jdate = jdatetime.date.fromgregorian(date=start_day).replace(day=1)
+        starts = []
+        while True:
+            gregorian = jdate.togregorian()
+            if gregorian > end_day:
+                return starts
+            starts.append(gregorian)
+            jdate = (jdate + timedelta(days=32)).replace(day=1)
+
+    raise ValueError(f"Unknown bucket size: {bucket}")
+
+
+def _bucket_label(day, bucket):
+    """برچسب شمسی هر بازه برای نمایش در نمودار"""
+    jdate = jdatetime.date.fromgregorian(date=day)
+    if bucket == BUCKET_JALALI_MONTH:
+        return jdate.strftime("%Y/%m")
+    return jdate.strftime("%m/%d")
+
+
+# ====== Time Series Query ====== #
+def build_time_series(queryset, date_field, values=None, bucket=BUCKET_DAY, start=None, end=None):
+    """
+    تجمیع زمانی داده‌ها با یک کوئری GROUP BY.
+
+    - queryset: کوئری‌ست فیلتر شده‌ی مدل (مثلاً پرداخت‌های موفق)
+    - date_field: نام فیلد تاریخ که بازه‌بندی روی آن انجام می‌شود
+    - values: دیکشنری {نام سری: عبارت تجمیعی}؛ پیش‌فرض شمارش رکوردها
+    - bucket: روزانه، هفتگی (شنبه تا جمعه) یا ماه شمسی
+    - start / end: بازه‌ی زمانی؛ پیش‌فرض بر اساس نوع بازه
+
+    بازه‌های روزانه با TruncDate و بازه‌های هفتگی/ماهانه با یک Case روی
+    مرزهای از پیش محاسبه شده در خود دیتابیس گروه‌بندی می‌شوند، پس
+    تجمیع‌های غیرجمع‌پذیر (مثل Count با distinct) هم درست محاسبه می‌شوند.
+    بازه‌های خالی با صفر پر می‌شوند.
+
+    خروجی:
+        {
+            'labels': ['2025-03-21', ...],       # تاریخ میلادی شروع هر بازه
+            'jalali_labels': ['01/01', ...],     # برچسب شمسی هر بازه
+            'series': {'value': [0, 3, ...]},    # یک آرایه به ازای هر سری
+        }
+    """
+    if bucket not in BUCKET_CHOICES:
+        raise ValueError(f"Unknown bucket size: {bucket}")
+
+    values = values or {'value': Count('pk')}
+    end = end or timezone.now()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS[bucket])
+
+    starts = _bucket_starts(timezone.localdate(start), timezone.localdate(end), bucket)
+    boundaries = [_local_midnight(day) for day in starts]
+
+    queryset = queryset.filter(**{
+        f'{date_field}__gte': boundaries[0],
+        f'{date_field}__lte': end,
+    })
+
+    if bucket == BUCKET_DAY:
+        bucket_expression = TruncDate(date_field, tzinfo=timezone.get_current_timezone())
+    else:
+        bucket_expression = Case(
+            *[
+                When(**{f'{date_field}__gte': boundary}, then=Value(index))
+                for index, boundary in reversed(list(enumerate(boundaries)))
+            ],
+            output_field=IntegerField(),
+        )
+
+    # order_by() خالی برای حذف ordering پیش‌فرض مدل از GROUP BY
+    rows = queryset.order_by().annotate(
+        bucket=bucket_expression
+    ).values('bucket').annotate(**values)
+
+    position = {day: index for index, day in enumerate(starts)} if bucket == BUCKET_DAY else None
+    series = {name: [0] * len(starts) for name in values}
+
+    for row in rows:
+        index = position.get(row['bucket']) if position is not None else row['bucket']
+        if index is None:
+            continue
+        for name in values:
+            value = row[name] or 0
+            series[name][index] = float(value) if not isinstance(value, int) else value
+
+    return {
+        'labels': [day.isoformat() for day in starts],
+        'jalali_labels': [_bucket_label(day, bucket) for day in starts],
+        'series': series,
+    }
+
+
+def chart_response_data(time_series, datasets):
+    """
+    تبدیل خروجی build_time_series به قالب Chart.js.
+
+    datasets: لیستی از دیکشنری‌ها که کلید series نام سری و بقیه‌ی کلیدها
+    تنظیمات نمایشی (label، borderColor و ...) هستند.
+    """
+    return {
+        'labels': time_series['labels'],
+        'jalali_labels': time_series['jalali_labels'],
+        'datasets': [
+            {
+                **{key: value for key, value in dataset.items() if key != 'series'},
+                'data': time_series['series'][dataset.get('series', 'value')],
+            }
+            for dataset in datasets
+        ],
+    }
@@ -1,16 +1,22 @@
 from django.urls import path
 from ..views import (
     DrugListView,
+    DrugDetailView,
     DrugCreateView,
     DrugUpdateView,
     DrugDeleteView,
+    DrugSearchAjaxView,
+    DrugQuickCreateAjaxView,
 )
 
 app_name = 'drugs'
 
 urlpatterns = [
     path('drugs/', DrugListView.as_view(), name='drug_list'),
+    path('drugs/<int:pk>/', DrugDetailView.as_view(), name='drug_detail'),
     path('drugs/create/', DrugCreateView.as_view(), name='drug_create'),
     path('drugs/<int:pk>/update/', DrugUpdateView.as_view(), name='drug_update'),
     path('drugs/<int:pk>/delete/', DrugDeleteView.as_view(), name='drug_delete'),
+    path('drugs/search/', DrugSearchAjaxView.as_view(), name='drug_search'),
+    path('drugs/quick-create/', DrugQuickCreateAjaxView.as_view(), name='drug_quick_create'),
 ]
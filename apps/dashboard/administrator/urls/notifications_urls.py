@@ -3,6 +3,7 @@ from ..views import (
     AnnouncementCreateView,
     AnnouncementDeleteView,
     AnnouncementDetailView,
+    AnnouncementProgressView,
     AnnouncementUpdateView,
     NotificationCreateView,
     NotificationDeleteView,
@@ -20,5 +21,6 @@ urlpatterns = [
     path('announcements/<int:pk>/delete/', AnnouncementDeleteView.as_view(), name='announcement_delete'),
     path('announcements/<int:pk>/', AnnouncementDetailView.as_view(), name='announcement_detail'),
     path('announcements/<int:pk>/update/', AnnouncementUpdateView.as_view(), name='announcement_update'),
+    path('announcements/<int:pk>/progress/', AnnouncementProgressView.as_view(), name='announcement_progress'),
     path('api/search-users/', UserSearchJsonView.as_view(), name='user_search_json'),
 ]
@@ -6,8 +6,6 @@ from ..views import (
     OrderDetailView,
     OrderManageView,
     OrderDeleteView,
-    DrugSearchAjaxView,
-    DrugQuickCreateAjaxView,
 
     # ===== Dynamic ===== #
     PreClinicalManageView,
@@ -27,12 +25,10 @@ urlpatterns = [
     path('order/<int:pk>', OrderDetailView.as_view(), name='order_detail'),
     path('orders/<int:pk>/copy/', OrderCopyView.as_view(), name='order_copy'),
     path('orders/<int:pk>/delete/', OrderDeleteView.as_view(), name='order_delete'),
-    path('orders/drugs/quick-create/', DrugQuickCreateAjaxView.as_view(), name='drug_quick_create_ajax'),
 
     # ===== Ordering ===== #
     path('orders/create/', OrderManageView.as_view(), name='order_create'),
     path('orders/<int:pk>/edit/', OrderManageView.as_view(), name='order_edit'),
-    path('orders/drugs/search/', DrugSearchAjaxView.as_view(), name='drug_search_ajax'),
 
     # ===== Dynamic ===== #
     path('orders/<int:order_pk>/preclinical/', PreClinicalManageView.as_view(), name='preclinical'),
@@ -63,6 +63,7 @@ from .notifications_views import (
     AnnouncementUpdateView,
     AnnouncementDeleteView,
     AnnouncementDetailView,
+    AnnouncementProgressView,
     NotificationDeleteView,
     NotificationCreateView,
     UserSearchJsonView,
@@ -1,5 +1,6 @@
 from django.views.generic import TemplateView, View
-from django.db.models import Count, Sum, Q, F
+from django.db.models import Count, Sum, Q, F, Prefetch
+from django.core.paginator import Paginator
 from django.utils import timezone
 from django.http import JsonResponse
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -10,7 +11,15 @@ from collections import defaultdict
 from apps.accounts.models import User, Profile
 from apps.subscriptions.models import Subscription, Plan, Membership, SubscriptionStatusChoicesModel
 from apps.payment.models import Payment
-from apps.dashboard.administrator.services.google_analytics_service import GoogleAnalyticsService
+from apps.dashboard.administrator.services.google_analytics_service import get_cached_last_7_days_report
+from apps.dashboard.administrator.services.time_series_service import (
+    BUCKET_DAY,
+    BUCKET_WEEK,
+    BUCKET_JALALI_MONTH,
+    PERIOD_TO_BUCKET,
+    build_time_series,
+    chart_response_data,
+)
 
 # ====== ANALYSIS DASHBOARD VIEW ====== #
 class AnalysisDashboardView(LoginRequiredMixin, TemplateView):
@@ -107,97 +116,116 @@ class AnalysisDashboardView(LoginRequiredMixin, TemplateView):
 
 # ====== USER STATS DETAIL VIEW ====== #
 class UserStatsDetailView(LoginRequiredMixin, View):
-    """جزئیات آمار کاربران"""
+    """
+    جزئیات آمار کاربران به صورت صفحه‌بندی شده.
+    پارامترها: type (admin/regular/premium)، page و q برای جستجو
+    """
+    paginate_by = 20
     
     def get(self, request, *args, **kwargs):
         user_type = request.GET.get('type')
         
         if user_type == 'admin':
-            return self.get_admin_users()
+            queryset, serialize = self.get_admin_users(), self.serialize_admin
         elif user_type == 'regular':
-            return self.get_regular_users()
+            queryset, serialize = self.get_regular_users(), self.serialize_regular
         elif user_type == 'premium':
-            return self.get_premium_users()
+            queryset, serialize = self.get_premium_users(), self.serialize_premium
         else:
             return JsonResponse({'error': 'نوع کاربر نامعتبر است'}, status=400)
+        
+        search = request.GET.get('q', '').strip()
+        if search:
+            queryset = queryset.filter(
+                Q(first_name__icontains=search) |
+                Q(last_name__icontains=search) |
+                Q(phone_number__icontains=search) |
+                Q(email__icontains=search)
+            )
+        
+        paginator = Paginator(queryset, self.paginate_by)
+        page = paginator.get_page(request.GET.get('page'))
+        
+        return JsonResponse({
+            'users': [serialize(user) for user in page.object_list],
+            'type': user_type,
+            'pagination': {
+                'page': page.number,
+                'num_pages': paginator.num_pages,
+                'count': paginator.count,
+                'has_next': page.has_next(),
+                'has_previous': page.has_previous(),
+            },
+        })
     
     def get_admin_users(self):
         """لیست ادمین‌ها"""
-        admins = User.objects.filter(
+        return User.objects.filter(
             Q(is_staff=True) |
             Q(is_superuser=True) |
             Q(profile__role="admin")
-        ).select_related('profile').order_by('-date_joined')
-        
-        data = []
-        for admin in admins:
-            data.append({
-                'id': admin.id,
-                'full_name': admin.full_name,
-                'phone_number': admin.phone_number,
-                'email': admin.email,
-                'date_joined': admin.shamsi_date_joined,
-            })
-        
-        return JsonResponse({'users': data, 'type': 'admin'})
+        ).order_by('-date_joined')
     
     def get_regular_users(self):
         """لیست کاربران عادی"""
-        regular_users = User.objects.filter(
+        return User.objects.filter(
             is_staff=False,
             is_superuser=False,
             profile__role__in=['visitor', 'regular']
         ).select_related('profile').order_by('-date_joined')
-        
-        data = []
-        for user in regular_users:
-            data.append({
-                'id': user.id,
-                'full_name': user.full_name,
-                'phone_number': user.phone_number,
-                'email': user.email,
-                'medical_code': user.profile.medical_code or '—',
-                'date_joined': user.shamsi_date_joined,
-            })
-        
-        return JsonResponse({'users': data, 'type': 'regular'})
     
     def get_premium_users(self):
-        """لیست کاربران ویژه"""
-        premium_users = User.objects.filter(
+        """
+        لیست کاربران ویژه همراه با آخرین اشتراک فعال هر کاربر.
+        اشتراک فعال با یک Prefetch (فقط برای کاربران همان صفحه) لود می‌شود.
+        """
+        active_subscriptions = Subscription.objects.filter(
+            status=SubscriptionStatusChoicesModel.active.value,
+            end_date__gt=timezone.now()
+        ).select_related('plan__membership').order_by('-end_date')
+        
+        return User.objects.filter(
             profile__role='premium'
-        ).select_related('profile').prefetch_related(
-            'subscriptions__plan__membership'
+        ).prefetch_related(
+            Prefetch('subscriptions', queryset=active_subscriptions[:1], to_attr='latest_active_subscriptions')
         ).order_by('-date_joined')
+    
+    def serialize_admin(self, user):
+        return {
+            'id': user.id,
+            'full_name': user.full_name,
+            'phone_number': user.phone_number,
+            'email': user.email,
+            'date_joined': user.shamsi_date_joined,
+        }
+    
+    def serialize_regular(self, user):
+        return {
+            **self.serialize_admin(user),
+            'medical_code': user.profile.medical_code or '—',
+        }
+    
+    def serialize_premium(self, user):
+        active_subscription = next(iter(user.latest_active_subscriptions), None)
+        
+        plan_info = None
+        if active_subscription:
+            plan_info = {
+                'plan_name': active_subscription.plan.name,
+                'membership': active_subscription.plan.membership.title,
+                'price': active_subscription.payment_amount,
+                'start_date': active_subscription.shamsi_start_date,
+                'end_date': active_subscription.shamsi_end_date,
+                'days_remaining': active_subscription.days_remaining,
+            }
         
-        data = []
-        for user in premium_users:
-            # آخرین اشتراک فعال
-            active_subscription = user.subscriptions.filter(
-                status=SubscriptionStatusChoicesModel.active.value,
-                end_date__gt=timezone.now()
-            ).first()
-            
-            plan_info = None
-            if active_subscription:
-                plan_info = {
-                    'plan_name': active_subscription.plan.name,
-                    'membership': active_subscription.plan.membership.title,
-                    'price': active_subscription.payment_amount,
-                    'start_date': active_subscription.shamsi_start_date,
-                    'end_date': active_subscription.shamsi_end_date,
-                    'days_remaining': active_subscription.days_remaining,
-                }
-            
-            data.append({
-                'id': user.id,
-                'full_name': user.full_name,
-                'phone_number': user.phone_number,
-                'email': user.email,
-                'active_subscription': plan_info,
-            })
-        
-        return JsonResponse({'users': data, 'type': 'premium'})
+        return {
+            'id': user.id,
+            'full_name': user.full_name,
+            'phone_number': user.phone_number,
+            'email': user.email,
+            'active_subscription': plan_info,
+        }
 
 # ====== PAYMENTS STATS DETAIL VIEW ====== #
 class PaymentStatsDetailView(LoginRequiredMixin, View):
@@ -215,27 +243,44 @@ class PaymentStatsDetailView(LoginRequiredMixin, View):
         else:
             return JsonResponse({'error': 'بازه زمانی نامعتبر است'}, status=400)
     
+    def get_payments_series(self, bucket):
+        """درآمد و تعداد پرداخت‌های موفق در هر بازه"""
+        time_series = build_time_series(
+            Payment.objects.filter(status='COMPLETED'),
+            'created_at',
+            values={
+                'total_income': Sum('final_amount'),
+                'payment_count': Count('id'),
+            },
+            bucket=bucket,
+        )
+        
+        return [
+            {
+                'date': label,
+                'jalali_date': jalali_label,
+                'total_income': total_income,
+                'payment_count': payment_count,
+            }
+            for label, jalali_label, total_income, payment_count in zip(
+                time_series['labels'],
+                time_series['jalali_labels'],
+                time_series['series']['total_income'],
+                time_series['series']['payment_count'],
+            )
+        ]
+    
     def get_daily_stats(self):
         """آمار روزانه"""
         end_date = timezone.now()
         start_date = end_date - timedelta(days=30)
         
-        payments = Payment.objects.filter(
-            status='COMPLETED',
-            created_at__range=[start_date, end_date]
-        ).extra({
-            'date': "DATE(created_at)"
-        }).values('date').annotate(
-            total_income=Sum('final_amount'),
-            payment_count=Count('id')
-        ).order_by('date')
-        
         # گروه‌بندی بر اساس پلن
         plan_stats = Payment.objects.filter(
             status='COMPLETED',
             created_at__range=[start_date, end_date],
             subscription__isnull=False
-        ).select_related('subscription__plan__membership').values(
+        ).values(
             'subscription__plan__name',
             'subscription__plan__membership__title'
         ).annotate(
@@ -245,48 +290,22 @@ class PaymentStatsDetailView(LoginRequiredMixin, View):
         
         return JsonResponse({
             'period': 'daily',
-            'payments': list(payments),
+            'payments': self.get_payments_series(BUCKET_DAY),
             'plan_stats': list(plan_stats),
         })
     
     def get_weekly_stats(self):
         """آمار هفتگی"""
-        end_date = timezone.now()
-        start_date = end_date - timedelta(weeks=12)
-        
-        payments = Payment.objects.filter(
-            status='COMPLETED',
-            created_at__range=[start_date, end_date]
-        ).extra({
-            'week': "YEARWEEK(created_at)"
-        }).values('week').annotate(
-            total_income=Sum('final_amount'),
-            payment_count=Count('id')
-        ).order_by('week')
-        
         return JsonResponse({
             'period': 'weekly',
-            'payments': list(payments),
+            'payments': self.get_payments_series(BUCKET_WEEK),
         })
     
     def get_monthly_stats(self):
-        """آمار ماهانه"""
-        end_date = timezone.now()
-        start_date = end_date - timedelta(days=365)
-        
-        payments = Payment.objects.filter(
-            status='COMPLETED',
-            created_at__range=[start_date, end_date]
-        ).extra({
-            'month': "DATE_FORMAT(created_at, '%%Y-%%m')"
-        }).values('month').annotate(
-            total_income=Sum('final_amount'),
-            payment_count=Count('id')
-        ).order_by('month')
-        
+        """آمار ماهانه (ماه‌های شمسی)"""
         return JsonResponse({
             'period': 'monthly',
-            'payments': list(payments),
+            'payments': self.get_payments_series(BUCKET_JALALI_MONTH),
         })
 
 
@@ -316,27 +335,24 @@ class SubscriptionStatsDetailView(LoginRequiredMixin, View):
         # کل مشترکین
         total_subscribers = Subscription.objects.filter(status=SubscriptionStatusChoicesModel.active.value).values('user').distinct().count()
         
-        # روند ماهانه مشترکین جدید
-        monthly_trend = []
-        for i in range(6):
-            month = timezone.now().replace(day=1) - timedelta(days=30*i)
-            month_start = month.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            if i == 0:
-                month_end = timezone.now()
-            else:
-                month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-            
-            count = Subscription.objects.filter(
-                status=SubscriptionStatusChoicesModel.active.value,
-                start_date__range=[month_start, month_end]
-            ).values('user').distinct().count()
-            
-            monthly_trend.append({
-                'month': month_start.strftime('%Y-%m'),
-                'subscribers': count,
-            })
+        # روند ماهانه مشترکین جدید (شش ماه شمسی اخیر)
+        now = timezone.now()
+        time_series = build_time_series(
+            Subscription.objects.filter(status=SubscriptionStatusChoicesModel.active.value),
+            'start_date',
+            values={'subscribers': Count('user', distinct=True)},
+            bucket=BUCKET_JALALI_MONTH,
+            start=now - timedelta(days=31 * 5),
+            end=now,
+        )
         
-        monthly_trend.reverse()
+        monthly_trend = [
+            {'month': month, 'subscribers': subscribers}
+            for month, subscribers in zip(
+                time_series['jalali_labels'][-6:],
+                time_series['series']['subscribers'][-6:],
+            )
+        ]
         
         return JsonResponse({
             'subscribers_this_month': subscribers_this_month,
@@ -399,237 +415,71 @@ class SubscriptionStatsDetailView(LoginRequiredMixin, View):
             })
         
         return JsonResponse({'membership_stats': data})
-        
-
-    
-    def get_users_chart_data(self):
-        """داده‌های نمودار کاربران"""
-        end_date = timezone.now()
-        start_date = end_date - timedelta(days=30)
-        
-        # کاربران جدید روزانه
-        new_users = User.objects.filter(
-            date_joined__range=[start_date, end_date]
-        ).extra({
-            'date': "DATE(date_joined)"
-        }).values('date').annotate(
-            count=Count('id')
-        ).order_by('date')
-        
-        labels = []
-        data = []
-        
-        current_date = start_date.date()
-        while current_date <= end_date.date():
-            date_str = current_date.strftime('%Y-%m-%d')
-            daily_count = 0
-            
-            for item in new_users:
-                if item['date'].strftime('%Y-%m-%d') == date_str:
-                    daily_count = item['count']
-                    break
-            
-            labels.append(current_date.strftime('%m/%d'))
-            data.append(daily_count)
-            current_date += timedelta(days=1)
-        
-        return JsonResponse({
-            'labels': labels,
-            'datasets': [{
-                'label': 'کاربران جدید',
-                'data': data,
-                'borderColor': '#10B981',
-                'backgroundColor': 'rgba(16, 185, 129, 0.1)',
-            }]
-        })
-    
-    def get_subscriptions_chart_data(self):
-        """داده‌های نمودار اشتراک‌ها"""
-        end_date = timezone.now()
-        start_date = end_date - timedelta(days=30)
-        
-        # اشتراک‌های جدید روزانه
-        new_subs = Subscription.objects.filter(
-            start_date__range=[start_date, end_date]
-        ).extra({
-            'date': "DATE(start_date)"
-        }).values('date').annotate(
-            count=Count('id')
-        ).order_by('date')
-        
-        labels = []
-        data = []
-        
-        current_date = start_date.date()
-        while current_date <= end_date.date():
-            date_str = current_date.strftime('%Y-%m-%d')
-            daily_count = 0
-            
-            for item in new_subs:
-                if item['date'].strftime('%Y-%m-%d') == date_str:
-                    daily_count = item['count']
-                    break
-            
-            labels.append(current_date.strftime('%m/%d'))
-            data.append(daily_count)
-            current_date += timedelta(days=1)
-        
-        return JsonResponse({
-            'labels': labels,
-            'datasets': [{
-                'label': 'اشتراک‌های جدید',
-                'data': data,
-                'borderColor': '#8B5CF6',
-                'backgroundColor': 'rgba(139, 92, 246, 0.1)',
-            }]
-        })
 
 class ChartDataView(View):
     """داده‌های نمودار"""
     
     def get(self, request, *args, **kwargs):
         chart_type = request.GET.get('type', 'income')
+        bucket = PERIOD_TO_BUCKET.get(request.GET.get('period', 'daily'))
+        
+        if bucket is None:
+            return JsonResponse({'error': 'بازه زمانی نامعتبر است'}, status=400)
         
         if chart_type == 'income':
-            return self.get_income_chart_data()
+            return self.get_income_chart_data(bucket)
         elif chart_type == 'users':
-            return self.get_users_chart_data()
+            return self.get_users_chart_data(bucket)
         elif chart_type == 'subscriptions':
-            return self.get_subscriptions_chart_data()
+            return self.get_subscriptions_chart_data(bucket)
         else:
             return JsonResponse({'error': 'نوع نمودار نامعتبر است'}, status=400)
     
-    def get_income_chart_data(self):
+    def get_income_chart_data(self, bucket):
         """داده‌های نمودار درآمد"""
-        end_date = timezone.now()
-        start_date = end_date - timedelta(days=30)
-        
-        # داده‌های روزانه
-        daily_data = Payment.objects.filter(
-            status='COMPLETED',
-            created_at__range=[start_date, end_date]
-        ).extra({
-            'date': "DATE(created_at)"
-        }).values('date').annotate(
-            amount=Sum('final_amount')
-        ).order_by('date')
-        
-        labels = []
-        data = []
-        
-        current_date = start_date.date()
-        while current_date <= end_date.date():
-            date_str = current_date.strftime('%Y-%m-%d')
-            daily_amount = 0
-            
-            for item in daily_data:
-                if item['date'].strftime('%Y-%m-%d') == date_str:
-                    daily_amount = float(item['amount'])
-                    break
-            
-            labels.append(current_date.strftime('%m/%d'))
-            data.append(daily_amount)
-            current_date += timedelta(days=1)
+        time_series = build_time_series(
+            Payment.objects.filter(status='COMPLETED'),
+            'created_at',
+            values={'amount': Sum('final_amount')},
+            bucket=bucket,
+        )
         
-        return JsonResponse({
-            'labels': labels,
-            'datasets': [{
-                'label': 'درآمد روزانه (ریال)',
-                'data': data,
-                'borderColor': '#3B82F6',
-                'backgroundColor': 'rgba(59, 130, 246, 0.1)',
-            }]
-        })
+        return JsonResponse(chart_response_data(time_series, [{
+            'series': 'amount',
+            'label': 'درآمد (ریال)',
+            'borderColor': '#3B82F6',
+            'backgroundColor': 'rgba(59, 130, 246, 0.1)',
+        }]))
     
-    def get_users_chart_data(self):
+    def get_users_chart_data(self, bucket):
         """داده‌های نمودار کاربران"""
-        end_date = timezone.now()
-        start_date = end_date - timedelta(days=30)
-        
-        # کاربران جدید روزانه
-        new_users = User.objects.filter(
-            date_joined__range=[start_date, end_date]
-        ).extra({
-            'date': "DATE(date_joined)"
-        }).values('date').annotate(
-            count=Count('id')
-        ).order_by('date')
-        
-        labels = []
-        data = []
-        
-        current_date = start_date.date()
-        while current_date <= end_date.date():
-            date_str = current_date.strftime('%Y-%m-%d')
-            daily_count = 0
-            
-            for item in new_users:
-                if item['date'].strftime('%Y-%m-%d') == date_str:
-                    daily_count = item['count']
-                    break
-            
-            labels.append(current_date.strftime('%m/%d'))
-            data.append(daily_count)
-            current_date += timedelta(days=1)
+        time_series = build_time_series(User.objects.all(), 'date_joined', bucket=bucket)
         
-        return JsonResponse({
-            'labels': labels,
-            'datasets': [{
-                'label': 'کاربران جدید',
-                'data': data,
-                'borderColor': '#10B981',
-                'backgroundColor': 'rgba(16, 185, 129, 0.1)',
-            }]
-        })
+        return JsonResponse(chart_response_data(time_series, [{
+            'label': 'کاربران جدید',
+            'borderColor': '#10B981',
+            'backgroundColor': 'rgba(16, 185, 129, 0.1)',
+        }]))
     
-    def get_subscriptions_chart_data(self):
+    def get_subscriptions_chart_data(self, bucket):
         """داده‌های نمودار اشتراک‌ها"""
-        end_date = timezone.now()
-        start_date = end_date - timedelta(days=30)
-        
-        # اشتراک‌های جدید روزانه
-        new_subs = Subscription.objects.filter(
-            status=SubscriptionStatusChoicesModel.active.value,
-            start_date__range=[start_date, end_date]
-        ).extra({
-            'date': "DATE(start_date)"
-        }).values('date').annotate(
-            count=Count('id')
-        ).order_by('date')
-        
-        labels = []
-        data = []
-        
-        current_date = start_date.date()
-        while current_date <= end_date.date():
-            date_str = current_date.strftime('%Y-%m-%d')
-            daily_count = 0
-            
-            for item in new_subs:
-                if item['date'].strftime('%Y-%m-%d') == date_str:
-                    daily_count = item['count']
-                    break
-            
-            labels.append(current_date.strftime('%m/%d'))
-            data.append(daily_count)
-            current_date += timedelta(days=1)
+        time_series = build_time_series(
+            Subscription.objects.filter(status=SubscriptionStatusChoicesModel.active.value),
+            'start_date',
+            bucket=bucket,
+        )
         
-        return JsonResponse({
-            'labels': labels,
-            'datasets': [{
-                'label': 'اشتراک‌های جدید',
-                'data': data,
-                'borderColor': '#8B5CF6',
-                'backgroundColor': 'rgba(139, 92, 246, 0.1)',
-            }]
-        })
+        return JsonResponse(chart_response_data(time_series, [{
+            'label': 'اشتراک‌های جدید',
+            'borderColor': '#8B5CF6',
+            'backgroundColor': 'rgba(139, 92, 246, 0.1)',
+        }]))
 
 # ===== Analytics Data Json View ===== #
 class AnalyticsDataJsonView(LoginRequiredMixin, View):
     def get(self, request, *args, **kwargs):
         try:
-            ga_service = GoogleAnalyticsService()
-            raw_data = ga_service.get_last_7_days_report()
+            raw_data = get_cached_last_7_days_report()
             
             labels = []
             users_data = []
@@ -7,6 +7,7 @@ from django.contrib import messages
 from apps.prescriptions.models import PrescriptionCategory
 from apps.accounts.permissions import IsTokenJtiActive, HasAdminAccessPermission
 from ..forms import CategoryForm, TAILWIND_COLOR_CHOICES
+from ..services.stats_service import get_header_stats
 
 
 # ===== لینک‌های پایه بردکرامب ===== #
@@ -40,9 +41,7 @@ class CategoryListView(LoginRequiredMixin, IsTokenJtiActive, HasAdminAccessPermi
         context['color_choices'] = [c for c in TAILWIND_COLOR_CHOICES if c[0]]
         context['breadcrumb'] = [BREADCRUMB_HOME, {'label': 'مدیریت دسته‌بندی‌ها', 'url': ''}]
         context['search'] = self.request.GET.get('search', '')
-        context['stats'] = {
-            'total': PrescriptionCategory.objects.count(),
-        }
+        context['stats'] = get_header_stats(PrescriptionCategory, {'total': None}, cache_key='categories')
         return context
 
 
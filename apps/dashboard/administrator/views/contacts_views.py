@@ -7,6 +7,7 @@ from django.http import JsonResponse
 from django.views.generic import ListView, DetailView, View
 from django.views.decorators.csrf import csrf_exempt
 from django.db import transaction, models
+from django.db.models import Q
 from django.urls import reverse_lazy
 
 import logging
@@ -16,6 +17,7 @@ import json
 from apps.home.models import Contact
 from apps.accounts.permissions import IsTokenJtiActive, HasAdminAccessPermission
 from ..services.email_service import send_contact_response_email
+from ..services.stats_service import get_header_stats
 
 logger = logging.getLogger(__name__)
 
@@ -56,11 +58,11 @@ class ContactsListView(LoginRequiredMixin, IsTokenJtiActive, HasAdminAccessPermi
         context['search'] = self.request.GET.get('search', '')
         context['status_filter'] = self.request.GET.get('status', 'all')
 
-        context['stats'] = {
-            'total': Contact.objects.count(),
-            'unread': Contact.objects.filter(admin_response__isnull=True).count(),
-            'answered': Contact.objects.filter(status='answered').count(),
-        }
+        context['stats'] = get_header_stats(Contact, {
+            'total': None,
+            'unread': Q(admin_response__isnull=True),
+            'answered': Q(status='answered'),
+        }, cache_key='contacts')
 
         # تاریخ شمسی برای هر پیام
         for contact in context['contacts']:
@@ -9,6 +9,7 @@ import jdatetime
 
 from apps.order.models import DiscountCode
 from apps.accounts.permissions import IsTokenJtiActive, HasAdminAccessPermission
+from ..services.stats_service import get_header_stats
 
 BREADCRUMB_HOME = {'label': 'داشبورد', 'url': reverse_lazy('dashboard:index:index')}
 BREADCRUMB_DISCOUNTS = {'label': 'مدیریت کدهای تخفیف', 'url': reverse_lazy('dashboard:orders:discount_list')}
@@ -41,11 +42,11 @@ class DiscountListView(LoginRequiredMixin, IsTokenJtiActive, HasAdminAccessPermi
         context['breadcrumb'] = [BREADCRUMB_HOME, {'label': 'مدیریت کدهای تخفیف', 'url': ''}]
         context['search'] = self.request.GET.get('search', '')
         context['status_filter'] = self.request.GET.get('status', 'all')
-        context['stats'] = {
-            'total': DiscountCode.objects.count(),
-            'active': DiscountCode.objects.filter(is_active=True).count(),
-            'inactive': DiscountCode.objects.filter(is_active=False).count(),
-        }
+        context['stats'] = get_header_stats(DiscountCode, {
+            'total': None,
+            'active': Q(is_active=True),
+            'inactive': Q(is_active=False),
+        }, cache_key='discounts')
 
         for discount in context['discounts']:
             if discount.start_at:
@@ -1,13 +1,21 @@
-from django.views.generic import ListView, View
+import json
+
+from django.views.generic import DetailView, ListView, View
+from django.views.decorators.csrf import csrf_exempt
+from django.utils.decorators import method_decorator
+from django.http import JsonResponse
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
 from django.contrib import messages
 from django.db.models import Q
 
-from apps.prescriptions.models import Drug
+from apps.ordering.models import Order
+from apps.prescriptions.models import Drug, Prescription
+from apps.prescriptions.services import drug_result, get_drug_usage, search_drugs
 from apps.accounts.permissions import IsTokenJtiActive, HasAdminAccessPermission
 from ..forms import DrugForm
+from ..services.stats_service import get_header_stats
 
 
 # ===== لینک‌های پایه بردکرامب ===== #
@@ -27,7 +35,7 @@ class DrugListView(LoginRequiredMixin, IsTokenJtiActive, HasAdminAccessPermissio
     paginate_by = 20
 
     def get_queryset(self):
-        queryset = Drug.objects.order_by('-created_at')
+        queryset = Drug.objects.select_related('usage').order_by('-created_at')
 
         search = self.request.GET.get('search', '').strip()
         drug_type = self.request.GET.get('type', '').strip()
@@ -49,11 +57,35 @@ class DrugListView(LoginRequiredMixin, IsTokenJtiActive, HasAdminAccessPermissio
         context['breadcrumb'] = [BREADCRUMB_HOME, {'label': 'مدیریت داروها', 'url': ''}]
         context['search'] = self.request.GET.get('search', '')
         context['drug_type'] = self.request.GET.get('type', '')
-        context['stats'] = {
-            'total': Drug.objects.count(),
-            'order': Drug.objects.filter(is_for_order=True).count(),
-            'prescription': Drug.objects.filter(is_for_order=False).count(),
-        }
+        context['stats'] = get_header_stats(Drug, {
+            'total': None,
+            'order': Q(is_for_order=True),
+            'prescription': Q(is_for_order=False),
+        }, cache_key='drugs')
+        return context
+
+
+# ================================================== #
+# =================== جزئیات دارو ================== #
+# ================================================== #
+class DrugDetailView(LoginRequiredMixin, IsTokenJtiActive, HasAdminAccessPermission, DetailView):
+    """ موارد استفاده‌ی دارو در نسخه‌ها و اوردرها از ایندکس معکوس """
+
+    model = Drug
+    template_name = 'dashboard/drugs/detail.html'
+    context_object_name = 'drug'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        usage = get_drug_usage(self.object.pk)
+        context['usage'] = usage
+        context['prescriptions'] = Prescription.objects.filter(
+            pk__in=usage.prescription_ids
+        ).select_related('category').order_by('title')
+        context['orders'] = Order.objects.filter(
+            pk__in=usage.order_ids
+        ).select_related('category').order_by('name')
+        context['breadcrumb'] = [BREADCRUMB_HOME, BREADCRUMB_DRUGS, {'label': self.object.title, 'url': ''}]
         return context
 
 
@@ -99,6 +131,69 @@ class DrugDeleteView(LoginRequiredMixin, IsTokenJtiActive, HasAdminAccessPermiss
     def post(self, request, pk, *args, **kwargs):
         drug = get_object_or_404(Drug, pk=pk)
         title = drug.title
+        usage = get_drug_usage(drug.pk)
         drug.delete()
-        messages.success(request, f'داروی «{title}» با موفقیت حذف شد.')
+        if usage.is_used:
+            messages.success(
+                request,
+                f'داروی «{title}» حذف شد و از {usage.prescription_count} نسخه و {usage.order_count} اوردر هم حذف شد.'
+            )
+        else:
+            messages.success(request, f'داروی «{title}» با موفقیت حذف شد.')
         return redirect('dashboard:drugs:drug_list')
+
+
+# ================================================== #
+# ================ جستجو و ایجاد سریع =============== #
+# ================================================== #
+class DrugSearchAjaxView(LoginRequiredMixin, HasAdminAccessPermission, View):
+    """
+    جستجوی دارو برای ویرایشگر نسخه و اوردر از ایندکس پیشوندی داخل حافظه.
+    ?scope=order فقط داروهای اوردر را برمی‌گرداند.
+    """
+
+    def get(self, request, *args, **kwargs):
+        query = request.GET.get('q', '').strip()
+        if len(query) < 2:
+            return JsonResponse({'results': []})
+
+        for_order = True if request.GET.get('scope') == 'order' else None
+        return JsonResponse({'results': search_drugs(query, for_order=for_order)})
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class DrugQuickCreateAjaxView(LoginRequiredMixin, HasAdminAccessPermission, View):
+    """
+    ایجاد سریع دارو از داخل ویرایشگرها؛ اگر دارویی با همین عنوان باشد همان
+    برگردانده می‌شود. خروجی drug هم‌شکل نتایج DrugSearchAjaxView است.
+    """
+
+    def post(self, request, *args, **kwargs):
+        try:
+            data = json.loads(request.body)
+            title = data.get('title', '').strip()
+            code = data.get('code', '').strip()
+            for_order = data.get('for_order', True)
+
+            if title:
+                drug, created = Drug.objects.get_or_create(
+                    title=title,
+                    defaults={'is_for_order': for_order, 'code': code}
+                )
+
+                if not created and ((for_order and not drug.is_for_order) or (code and not drug.code)):
+                    drug.is_for_order = drug.is_for_order or for_order
+                    drug.code = drug.code or code
+                    drug.save()
+
+                return JsonResponse({
+                    'success': True,
+                    'id': drug.id,
+                    'text': drug.title,
+                    'drug': drug_result(drug),
+                    'message': f'داروی «{drug.title}» با موفقیت ایجاد شد.' if created else f'داروی «{drug.title}» از قبل وجود دارد.',
+                })
+        except Exception as e:
+            return JsonResponse({'success': False, 'error': str(e)})
+
+        return JsonResponse({'success': False, 'error': 'اطلاعات نامعتبر است'})
@@ -7,7 +7,6 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth import get_user_model
 from django.db.models import Sum
 from django.utils import timezone
-from django.core.cache import cache
 from django.db.models.functions import TruncMonth
 from django.urls import reverse_lazy
 
@@ -16,6 +15,7 @@ from apps.subscriptions.models import Subscription, SubscriptionStatusChoicesMod
 from apps.questions.models import Question
 from apps.payment.models import Payment, PaymentStatus
 from apps.home.models import Contact
+from core.cache import stale_while_revalidate
 
 User = get_user_model()
 
@@ -27,15 +27,7 @@ def admin_dashboard_view(request):
     if not (request.user.is_staff or request.user.is_superuser or getattr(request.user.profile, "role", None) == "admin"):
         return render(request, '403.html', status=403)
 
-    cache_key = 'admin_dashboard_stats'
-    cached_data = cache.get(cache_key)
-
-    if cached_data:
-        context = cached_data
-    else:
-        context = _calculate_dashboard_stats()
-        cache.set(cache_key, context, timeout=20)
-
+    context = dict(_calculate_dashboard_stats())
     context.update(_get_realtime_data())
 
     # ===== اضافه کردن بردکرامب و stats برای قالب ===== #
@@ -54,8 +46,12 @@ def admin_dashboard_view(request):
     return render(request, 'dashboard/index/dashboard.html', context)
 
 
+@stale_while_revalidate('admin_dashboard_stats', fresh_for=60, stale_for=10 * 60)
 def _calculate_dashboard_stats():
-    """محاسبه آمارهای داشبورد"""
+    """
+    محاسبه آمارهای داشبورد.
+    نتیجه کش می‌شود و با سیگنال‌های apps.dashboard.signals باطل می‌شود.
+    """
     now = timezone.now()
 
     # شروع ماه شمسی جاری
@@ -134,20 +130,24 @@ def _calculate_dashboard_stats():
     }
 
 
+@stale_while_revalidate('admin_dashboard_realtime', fresh_for=15, stale_for=5 * 60)
 def _get_realtime_data():
-    """داده‌هایی که باید همیشه به‌روز باشند"""
-    pending_users = Profile.objects.select_related('user').filter(
+    """
+    داده‌هایی که باید همیشه به‌روز باشند.
+    کش کوتاه‌مدت دارد و با ثبت سوال یا پیام جدید فوراً باطل می‌شود.
+    """
+    pending_users = list(Profile.objects.select_related('user').filter(
         auth_status=AuthStatusChoices.PENDING.value,
         documents__isnull=False
-    ).order_by('-created_at')[:3]
+    ).order_by('-created_at')[:3])
 
-    recent_questions = Question.objects.select_related(
+    recent_questions = list(Question.objects.select_related(
         'user', 'prescription'
-    ).filter(is_answered=False).order_by('-created_at')[:3]
+    ).filter(is_answered=False).order_by('-created_at')[:3])
 
-    recent_contacts = Contact.objects.filter(
+    recent_contacts = list(Contact.objects.filter(
         status__in=['pending', 'in_progress']
-    ).order_by('-created_at')[:4]
+    ).order_by('-created_at')[:4])
 
     return {
         'pending_users': pending_users,
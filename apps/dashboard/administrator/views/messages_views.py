@@ -14,6 +14,7 @@ import jdatetime
 from apps.questions.models import Question
 from apps.accounts.permissions import IsTokenJtiActive, HasAdminAccessPermission
 from ..services.email_service import send_email_to_answered_question
+from ..services.stats_service import get_header_stats
 
 BREADCRUMB_HOME = {'label': 'داشبورد', 'url': reverse_lazy('dashboard:index:index')}
 BREADCRUMB_QUESTIONS = {'label': 'سوالات کاربران', 'url': reverse_lazy('dashboard:questions:list')}
@@ -58,11 +59,11 @@ class QuestionsListView(LoginRequiredMixin, IsTokenJtiActive, HasAdminAccessPerm
         context['breadcrumb'] = [BREADCRUMB_HOME, {'label': 'سوالات کاربران', 'url': ''}]
         context['search'] = self.request.GET.get('search', '')
         context['status'] = self.request.GET.get('status', '')
-        context['stats'] = {
-            'total_questions': Question.objects.count(),
-            'unread_questions': Question.objects.filter(is_answered=False).count(),
-            'read_questions': Question.objects.filter(is_answered=True).count(),
-        }
+        context['stats'] = get_header_stats(Question, {
+            'total_questions': None,
+            'unread_questions': Q(is_answered=False),
+            'read_questions': Q(is_answered=True),
+        }, cache_key='questions')
         for question in context['questions']:
             if question.created_at:
                 jalali_date = jdatetime.datetime.fromgregorian(
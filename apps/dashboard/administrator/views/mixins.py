@@ -6,7 +6,7 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import CreateView, UpdateView
 from django.db.models import Max
 
-from apps.prescriptions.models import Prescription, PrescriptionDrug, Drug
+from apps.prescriptions.models import Prescription, PrescriptionDrug
 from ..forms import (
     PrescriptionForm, 
     PrescriptionDrugFormSet, 
@@ -73,11 +73,6 @@ class PrescriptionFormMixin:
                 prefix='videos'
             )
         
-        # اضافه کردن لیست تمام داروها برای جاوااسکریپت
-        context['all_drugs'] = list(
-            Drug.objects.values('id', 'title', 'code').order_by('title')
-        )
-        
         return context
 
     def form_valid(self, form):
@@ -5,101 +5,134 @@ from django.urls import reverse_lazy
 from django.utils.html import strip_tags
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q
+from django.db.models import Q, Count, Prefetch, Value, CharField
 from django.contrib.contenttypes.models import ContentType
 
 from apps.accounts.models import User
 from apps.accounts.permissions import IsTokenJtiActive, HasAdminAccessPermission
-from apps.notifications.models import Notification, Announcement
+from apps.notifications.models import Notification, Announcement, AnnouncementRead
 from ..forms import SingleNotificationForm, AnnouncementForm
+from ..services.stats_service import get_header_stats
 
 
 # ===== لینک‌های پایه بردکرامب ===== #
 BREADCRUMB_HOME = {'label': 'داشبورد', 'url': reverse_lazy('dashboard:index:index')}
 
 
-def _build_notifications(search='', filter_type='all'):
-    """ ساخت لیست ترکیبی اعلان‌های تکی و گروهی با فیلتر سرورساید """
-    try:
-        announcement_ct = ContentType.objects.get_for_model(Announcement)
-    except Exception:
-        announcement_ct = None
-
-    single_notifs = Notification.objects.select_related('recipient').exclude(
-        content_type=announcement_ct
-    ).order_by('-created_at')
+def _notifications_union(search='', filter_type='all'):
+    """
+    کوئری UNION سبک (نوع، شناسه، زمان) از اعلان‌های تکی و پیام‌های گروهی.
+    مرتب‌سازی و صفحه‌بندی در خود دیتابیس انجام می‌شود و فقط ردیف‌های
+    صفحه‌ی جاری با _hydrate_notifications کامل می‌شوند.
+    """
+    announcement_ct = ContentType.objects.get_for_model(Announcement)
+    kind_field = CharField()
 
+    singles = Notification.objects.exclude(content_type=announcement_ct)
     if search:
-        single_notifs = single_notifs.filter(
+        singles = singles.filter(
             Q(title__icontains=search) |
             Q(message__icontains=search) |
             Q(recipient__first_name__icontains=search) |
             Q(recipient__last_name__icontains=search)
         )
     if filter_type == 'unread':
-        single_notifs = single_notifs.filter(is_read=False)
+        singles = singles.filter(is_read=False)
     elif filter_type == 'read':
-        single_notifs = single_notifs.filter(is_read=True)
-
-    combined_list = []
-
-    # --- پیام‌های تکی ---
-    for notification in single_notifs:
-        combined_list.append({
-            'type': 'single',
-            'id': notification.id,
-            'title': notification.title or 'بدون عنوان',
-            'message_preview': strip_tags(notification.message)[:60],
-            'full_message': notification.message,
-            'recipient_name': notification.recipient.get_full_name() if notification.recipient else 'ناشناس',
-            'recipient_initial': (notification.recipient.first_name[:1] if notification.recipient and notification.recipient.first_name else '?'),
-            'is_read': notification.is_read,
-            'created_at': notification.created_at,
-            'created_at_shamsi': notification.shamsi_created_at,
-        })
+        singles = singles.filter(is_read=True)
+
+    rows = singles.order_by().annotate(
+        kind=Value('single', output_field=kind_field)
+    ).values('kind', 'id', 'created_at')
 
     # --- اطلاعیه‌های گروهی (فقط وقتی فیلتر خوانده/نخوانده فعال نیست) ---
-    if announcement_ct and filter_type == 'all':
-        announcements = Announcement.objects.all().order_by('-created_at')
+    if filter_type == 'all':
+        announcements = Announcement.objects.all()
         if search:
             announcements = announcements.filter(
                 Q(title__icontains=search) | Q(message__icontains=search)
             )
+        rows = rows.union(
+            announcements.order_by().annotate(
+                kind=Value('group', output_field=kind_field)
+            ).values('kind', 'id', 'created_at'),
+            all=True,
+        )
 
-        for ann in announcements:
-            related_notifs = Notification.objects.filter(
-                content_type=announcement_ct,
-                object_id=ann.id
-            ).select_related('recipient')
-
-            total_sent = related_notifs.count()
-            read_count = related_notifs.filter(is_read=True).count()
-
-            sample_recipients = []
-            for n in related_notifs[:5]:
-                if n.recipient:
-                    sample_recipients.append({
-                        'name': n.recipient.get_full_name(),
-                        'status': 'خوانده' if n.is_read else 'نخوانده',
-                    })
-
-            combined_list.append({
-                'type': 'group',
-                'id': ann.id,
-                'announcement_id': ann.id,
-                'title': ann.title,
-                'message_preview': strip_tags(ann.message)[:60],
-                'full_message': ann.message,
-                'total_sent': total_sent,
-                'read_count': read_count,
-                'read_percent': round(read_count / total_sent * 100) if total_sent else 0,
-                'samples': sample_recipients,
-                'created_at': ann.created_at,
-                'created_at_shamsi': ann.shamsi_created_at,
-            })
+    return rows.order_by('-created_at', '-id')
+
+
+def _single_item(notification):
+    recipient = notification.recipient
+    return {
+        'type': 'single',
+        'id': notification.id,
+        'title': notification.title or 'بدون عنوان',
+        'message_preview': strip_tags(notification.message)[:60],
+        'full_message': notification.message,
+        'recipient_name': recipient.get_full_name() if recipient else 'ناشناس',
+        'recipient_initial': (recipient.first_name[:1] if recipient and recipient.first_name else '?'),
+        'is_read': notification.is_read,
+        'created_at': notification.created_at,
+        'created_at_shamsi': notification.shamsi_created_at,
+    }
+
+
+def _group_item(ann):
+    # تعداد گیرندگان در لحظه‌ی ارسال؛ کاربرانی که بعداً اضافه شده‌اند حساب نمی‌شوند
+    total_sent = ann.total_recipients if ann.is_sent else 0
+    read_count = ann.read_count
+    return {
+        'type': 'group',
+        'id': ann.id,
+        'announcement_id': ann.id,
+        'title': ann.title,
+        'message_preview': strip_tags(ann.message)[:60],
+        'full_message': ann.message,
+        'total_sent': total_sent,
+        'read_count': read_count,
+        'read_percent': round(read_count / total_sent * 100) if total_sent else 0,
+        'samples': [
+            {'name': read.user.get_full_name(), 'status': 'خوانده'}
+            for read in ann.latest_reads
+        ],
+        'has_external_channels': ann.has_external_channels,
+        'delivery_status': ann.delivery_status,
+        'delivery_status_display': ann.get_delivery_status_display(),
+        'delivery_percent': ann.delivery_percent,
+        'created_at': ann.created_at,
+        'created_at_shamsi': ann.shamsi_created_at,
+    }
+
+
+def _hydrate_notifications(rows):
+    """
+    تبدیل ردیف‌های صفحه‌ی جاری به دیکشنری‌های نمایشی با تعداد کوئری ثابت:
+    یک کوئری برای اعلان‌های تکی، یک کوئری گروه‌بندی شده برای پیام‌های
+    گروهی و تعداد خوانده شدنشان و یک prefetch نمونه‌ها.
+    """
+    single_ids = [row['id'] for row in rows if row['kind'] == 'single']
+    group_ids = [row['id'] for row in rows if row['kind'] == 'group']
+
+    singles = Notification.objects.select_related('recipient').in_bulk(single_ids) if single_ids else {}
+
+    groups = {}
+    if group_ids:
+        groups = Announcement.objects.annotate(read_count=Count('reads')).prefetch_related(
+            Prefetch(
+                'reads',
+                queryset=AnnouncementRead.objects.select_related('user').order_by('-read_at')[:5],
+                to_attr='latest_reads',
+            )
+        ).in_bulk(group_ids)
 
-    combined_list.sort(key=lambda x: x.get('created_at'), reverse=True)
-    return combined_list
+    items = []
+    for row in rows:
+        if row['kind'] == 'single' and row['id'] in singles:
+            items.append(_single_item(singles[row['id']]))
+        elif row['kind'] == 'group' and row['id'] in groups:
+            items.append(_group_item(groups[row['id']]))
+    return items
 
 
 # ================================================ #
@@ -115,7 +148,13 @@ class NotificationDashboardView(LoginRequiredMixin, IsTokenJtiActive, HasAdminAc
     def get_queryset(self):
         search = self.request.GET.get('search', '').strip()
         filter_type = self.request.GET.get('filter', 'all').strip()
-        return _build_notifications(search, filter_type)
+        return _notifications_union(search, filter_type)
+
+    def paginate_queryset(self, queryset, page_size):
+        """ فقط ردیف‌های صفحه‌ی جاری به آیتم کامل تبدیل می‌شوند """
+        paginator, page, rows, is_paginated = super().paginate_queryset(queryset, page_size)
+        page.object_list = _hydrate_notifications(list(rows))
+        return paginator, page, page.object_list, is_paginated
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -125,12 +164,13 @@ class NotificationDashboardView(LoginRequiredMixin, IsTokenJtiActive, HasAdminAc
         context['filter_type'] = self.request.GET.get('filter', 'all')
 
         announcement_ct = ContentType.objects.get_for_model(Announcement)
-        total_single = Notification.objects.exclude(content_type=announcement_ct).count()
-        context['stats'] = {
-            'total_single': total_single,
-            'unread': Notification.objects.exclude(content_type=announcement_ct).filter(is_read=False).count(),
-            'announcements': Announcement.objects.count(),
-        }
+        context['stats'] = get_header_stats(Notification.objects.exclude(content_type=announcement_ct), {
+            'total_single': None,
+            'unread': Q(is_read=False),
+        }, cache_key='notifications')
+        context['stats'].update(
+            get_header_stats(Announcement, {'announcements': None}, cache_key='announcements')
+        )
         return context
 
 
@@ -213,7 +253,10 @@ class AnnouncementCreateView(LoginRequiredMixin, IsTokenJtiActive, HasAdminAcces
             announcement.sender = request.user
             announcement.save()
             count = announcement.send_announcement()
-            messages.success(request, f'پیام گروهی ایجاد و برای {count} کاربر ارسال شد.')
+            if announcement.has_external_channels:
+                messages.success(request, f'پیام گروهی برای {count} کاربر منتشر شد و ارسال پیامک/ایمیل در پس‌زمینه در حال انجام است.')
+            else:
+                messages.success(request, f'پیام گروهی ایجاد و برای {count} کاربر ارسال شد.')
         else:
             messages.error(request, f'خطا در ثبت پیام گروهی: {form.errors.as_text()}')
         return redirect('dashboard:notifications:notifications_list')
@@ -244,8 +287,7 @@ class AnnouncementDeleteView(LoginRequiredMixin, IsTokenJtiActive, HasAdminAcces
 
     def post(self, request, pk, *args, **kwargs):
         ann = get_object_or_404(Announcement, pk=pk)
-        ct = ContentType.objects.get_for_model(Announcement)
-        Notification.objects.filter(content_type=ct, object_id=ann.id).delete()
+        # رسیدهای خواندن به صورت cascade حذف می‌شوند
         ann.delete()
         messages.success(request, 'پیام گروهی و تمام اعلان‌های وابسته حذف شدند.')
         return redirect('dashboard:notifications:notifications_list')
@@ -266,5 +308,27 @@ class AnnouncementDetailView(LoginRequiredMixin, IsTokenJtiActive, HasAdminAcces
                 'message': ann.message,
                 'target_role': ann.target_role,
                 'is_sent': ann.is_sent,
+                'send_sms': ann.send_sms,
+                'send_email': ann.send_email,
+            }
+        })
+
+
+# ================================================ #
+# ========= پیشرفت ارسال پیام گروهی (AJAX) ======= #
+# ================================================ #
+class AnnouncementProgressView(LoginRequiredMixin, IsTokenJtiActive, HasAdminAccessPermission, View):
+    """ وضعیت ارسال پیامک/ایمیل پیام گروهی برای polling داشبورد """
+
+    def get(self, request, pk, *args, **kwargs):
+        ann = get_object_or_404(Announcement, pk=pk)
+        return JsonResponse({
+            'success': True,
+            'data': {
+                'status': ann.delivery_status,
+                'status_display': ann.get_delivery_status_display(),
+                'total': ann.total_recipients,
+                'sent': ann.delivered_count,
+                'percent': ann.delivery_percent,
             }
         })
@@ -5,17 +5,13 @@ from django.shortcuts import (
     render, redirect, get_object_or_404
 )
 from django.views.generic import DetailView, ListView, View
-from django.views.decorators.csrf import csrf_exempt
 from django.db import transaction
-from django.db.models import Q, Max, Prefetch
+from django.db.models import Q, Max, Prefetch, prefetch_related_objects
 from django.urls import reverse_lazy, reverse
-from django.utils.decorators import method_decorator
-from django.http import JsonResponse
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import ValidationError
 
-from apps.prescriptions.models import Drug
 from apps.ordering.models import (
     Order, Condition, OrderSection,
     SectionItem, DrugSectionItem,
@@ -49,6 +45,16 @@ from ..forms import (
     OrderImageFormSet,
     OrderVideoFormSet,
 )
+from apps.ordering.services import (
+    children_by_parent,
+    copy_order,
+    dynamic_field_tree_prefetch,
+    emergency_tree_prefetch,
+    invalidate_sections_snapshots,
+    sync_item_conditions,
+    sync_relationship_groups,
+)
+from ..services.stats_service import get_header_stats
 
 logger = logging.getLogger('order_manager')
 
@@ -103,89 +109,15 @@ def _emit_error_messages(request, all_error_lines: list[str], summary: str = 'ل
 # ==================== Order List ===================== #
 # ===================================================== #
 class OrderCopyView(LoginRequiredMixin, View):
-    @transaction.atomic
     def post(self, request, pk):
         original_order = get_object_or_404(Order, pk=pk)
 
-        new_order = Order.objects.get(pk=pk)
-        new_order.pk = None
-        new_order.name = f"{new_order.name} (کپی)"
-        new_order.save()
-
-        for old_section in original_order.sections.all():
-            old_section_id = old_section.pk
-            
-            new_section = OrderSection.objects.get(pk=old_section_id)
-            new_section.pk = None
-            new_section.order = new_order
-            new_section.save()
-
-            for item in SectionItem.objects.filter(section_id=old_section_id):
-                old_conditions = list(item.conditions.all())
-                item.pk = None
-                item.section = new_section
-                item.save()
-                if old_conditions:
-                    item.conditions.set(old_conditions)
-
-            for drug_item in DrugSectionItem.objects.filter(section_id=old_section_id):
-                old_conditions = list(drug_item.conditions.all())
-                drug_item.pk = None
-                drug_item.section = new_section
-                drug_item.save()
-                if old_conditions:
-                    drug_item.conditions.set(old_conditions)
-
-        for old_group in original_order.dynamic_field_groups.all():
-            old_group_id = old_group.pk
-            
-            new_group = DynamicFieldGroup.objects.get(pk=old_group_id)
-            new_group.pk = None
-            new_group.order = new_order
-            new_group.save()
-
-            old_nodes = DynamicFieldNode.objects.filter(group_id=old_group_id)
-            node_mapping = {}
-            
-            for old_node in old_nodes:
-                new_node = DynamicFieldNode.objects.get(pk=old_node.pk)
-                new_node.pk = None
-                new_node.group = new_group
-                new_node.parent = None
-                new_node.save()
-                node_mapping[old_node.pk] = new_node
-                
-            for old_node in old_nodes:
-                if old_node.parent_id:
-                    new_node = node_mapping[old_node.pk]
-                    new_node.parent = node_mapping[old_node.parent_id]
-                    new_node.save()
-
-        if hasattr(original_order, 'emergency_disposition'):
-            old_disp = original_order.emergency_disposition
-            old_disp_id = old_disp.pk
-            
-            new_disp = EmergencyDisposition.objects.get(pk=old_disp_id)
-            new_disp.pk = None
-            new_disp.order = new_order
-            new_disp.save()
-
-            old_nodes = EmergencyNode.objects.filter(disposition_id=old_disp_id)
-            node_mapping = {}
-            
-            for old_node in old_nodes:
-                new_node = EmergencyNode.objects.get(pk=old_node.pk)
-                new_node.pk = None
-                new_node.disposition = new_disp
-                new_node.parent = None
-                new_node.save()
-                node_mapping[old_node.pk] = new_node
-                
-            for old_node in old_nodes:
-                if old_node.parent_id:
-                    new_node = node_mapping[old_node.pk]
-                    new_node.parent = node_mapping[old_node.parent_id]
-                    new_node.save()
+        try:
+            new_order = copy_order(original_order)
+        except ValidationError as e:
+            logger.error(f"❌ ValidationError during order copy: {e}")
+            messages.error(request, 'کپی اوردر ناموفق بود؛ اوردری با نام نسخه کپی از قبل وجود دارد.')
+            return redirect('dashboard:ordering:order_list')
 
         messages.success(request, f'اوردر با موفقیت کپی شد. اکنون در حال ویرایش نسخه کپی هستید.')
         return redirect(reverse('dashboard:ordering:order_edit', kwargs={'pk': new_order.pk}))
@@ -234,7 +166,7 @@ class OrderListView(LoginRequiredMixin, ListView):
         context['sort_by'] = self.request.GET.get('sort_by', '-created_at')
 
         # ===== آمار کارت‌ها ===== #
-        total = Order.objects.count()
+        total = get_header_stats(Order, {'total': None}, cache_key='orders')['total']
         active = Order.objects.filter(is_active=True).count() if hasattr(Order, 'is_active') else 0
         draft = Order.objects.filter(is_draft=True).count() if hasattr(Order, 'is_draft') else 0
 
@@ -562,7 +494,7 @@ class OrderManageView(View):
                     saved_items_map = {}
 
                     # =======================================================================
-                    # مرحله ۱: ابتدا تمام آیتم‌ها و داروها را ذخیره کن
+                    # مرحله ۱: ذخیره‌ی آیتم‌ها و داروها (فرم‌ست فقط ردیف‌های تغییر کرده را ذخیره می‌کند)
                     # =======================================================================
                     for data in nested_sections:
                         if data['section_form'].prefix not in section_map:
@@ -581,23 +513,18 @@ class OrderManageView(View):
                         for item_form in data['item_fs'].forms:
                             if item_form.instance.pk and item_form not in data['item_fs'].deleted_forms:
                                 saved_items_map[item_form.prefix] = item_form.instance
-                                item_form.instance.conditions.clear()
 
                         for drug_form in data['drug_fs'].forms:
                             if drug_form.instance.pk and drug_form not in data['drug_fs'].deleted_forms:
                                 saved_items_map[drug_form.prefix] = drug_form.instance
-                                drug_form.instance.conditions.clear()
 
                     # =======================================================================
-                    # مرحله ۲: پاکسازی ایمن دیتابیس از روابط قدیمی
+                    # مرحله ۲: اعمال تفاوت روابط و شرط‌ها با وضعیت ذخیره شده
+                    # (فقط ردیف‌های تغییر کرده درج، به‌روزرسانی یا حذف می‌شوند)
                     # =======================================================================
-                    SectionItem.objects.filter(section__order=saved_order).update(relationship_group=None)
-                    DrugSectionItem.objects.filter(section__order=saved_order).update(relationship_group=None)
-                    ItemRelationshipGroup.objects.filter(section__order=saved_order).delete()
+                    condition_links = []
+                    condition_items = list(saved_items_map.values())
 
-                    # =======================================================================
-                    # مرحله ۳: بازسازی روابط و شرط‌های جدید
-                    # =======================================================================
                     for data in nested_sections:
                         section_instance = section_map.get(data['section_form'].prefix)
                         if not section_instance or not section_instance.pk:
@@ -607,43 +534,50 @@ class OrderManageView(View):
 
                         # پردازش روابط
                         relationships_json = request.POST.get(f'section_relationships_{index}')
-                        if relationships_json:
-                            try:
-                                relationships_data = json.loads(relationships_json)
-                                for order_idx, rel_data in enumerate(relationships_data):
-                                    operator = rel_data.get('operator')
-                                    linked_prefixes = rel_data.get('items', [])
-                                    
-                                    if operator and linked_prefixes:
-                                        group = ItemRelationshipGroup.objects.create(
-                                            section=section_instance,
-                                            operator=operator,
-                                            order_index=order_idx
-                                        )
-                                        for prefix in linked_prefixes:
-                                            if prefix in saved_items_map:
-                                                saved_item = saved_items_map[prefix]
-                                                saved_item.relationship_group = group
-                                                saved_item.save(update_fields=['relationship_group'])
-                            except json.JSONDecodeError:
-                                logger.error(f"Error decoding relationships JSON for section {index}")
+                        try:
+                            relationships_data = json.loads(relationships_json) if relationships_json else []
+                        except json.JSONDecodeError:
+                            # روابط این سکشن دست‌نخورده می‌ماند
+                            logger.error(f"Error decoding relationships JSON for section {index}")
+                        else:
+                            groups = []
+                            for order_idx, rel_data in enumerate(relationships_data):
+                                operator = rel_data.get('operator')
+                                linked_prefixes = rel_data.get('items', [])
+                                if operator and linked_prefixes:
+                                    groups.append((
+                                        order_idx,
+                                        operator,
+                                        [saved_items_map[prefix] for prefix in linked_prefixes if prefix in saved_items_map],
+                                    ))
+                            sync_relationship_groups(section_instance, groups)
 
                         # پردازش شرط‌ها
                         conditions_json = request.POST.get(f'section_conditions_{index}')
                         if conditions_json:
                             try:
                                 conditions_data = json.loads(conditions_json)
-                                for cond_data in conditions_data:
-                                    cond_text = cond_data.get('text', '')
-                                    linked_prefixes = cond_data.get('items', [])
-                                    
-                                    if cond_text and linked_prefixes:
-                                        condition_obj, _ = Condition.objects.get_or_create(text=cond_text)
-                                        for prefix in linked_prefixes:
-                                            if prefix in saved_items_map:
-                                                saved_items_map[prefix].conditions.add(condition_obj)
                             except json.JSONDecodeError:
                                 logger.error(f"Error decoding conditions JSON for section {index}")
+                                # شرط‌های آیتم‌های این سکشن دست‌نخورده می‌ماند
+                                condition_items = [
+                                    item for item in condition_items if item.section_id != section_instance.pk
+                                ]
+                                continue
+
+                            for cond_data in conditions_data:
+                                cond_text = cond_data.get('text', '')
+                                linked_prefixes = cond_data.get('items', [])
+                                if cond_text and linked_prefixes:
+                                    condition_links.extend(
+                                        (saved_items_map[prefix], cond_text)
+                                        for prefix in linked_prefixes if prefix in saved_items_map
+                                    )
+
+                    sync_item_conditions(condition_items, condition_links)
+
+                    # تغییرات گروهی سیگنال ندارند؛ snapshot سکشن‌ها بعد از commit ساخته می‌شود
+                    invalidate_sections_snapshots([saved_order.pk])
 
                     messages.success(request, 'اوردر با موفقیت ذخیره شد.')
                     return redirect(reverse('dashboard:ordering:order_edit', kwargs={'pk': saved_order.pk}))
@@ -772,57 +706,6 @@ class OrderManageView(View):
         }
         return render(request, self.template_name, context)
 
-# ===================================================== #
-# ==================== Drug Search ==================== #
-# ===================================================== #
-class DrugSearchAjaxView(View):
-    def get(self, request, *args, **kwargs):
-        query = request.GET.get('q', '').strip()
-
-        if len(query) < 2:
-            return JsonResponse({'results': []})
-        
-        drugs = Drug.objects.filter(is_for_order=True).filter(
-            Q(title__icontains=query) | Q(code__icontains=query)
-        )[:20]
-        
-        results = [
-            {
-                'id': drug.id, 
-                'text': f"{drug.title} (کد: {drug.code})" if drug.code else drug.title, 
-                'code': drug.code
-            } 
-            for drug in drugs
-        ]
-        
-        return JsonResponse({'results': results})
-
-@method_decorator(csrf_exempt, name='dispatch')
-class DrugQuickCreateAjaxView(View):
-    def post(self, request, *args, **kwargs):
-        try:
-            data = json.loads(request.body)
-            title = data.get('title', '').strip()
-            code = data.get('code', '').strip()
-            
-            if title:
-                drug, created = Drug.objects.get_or_create(
-                    title=title, 
-                    defaults={'is_for_order': True, 'code': code}
-                )
-                
-                if not created:
-                    drug.is_for_order = True
-                    if code and not drug.code:
-                        drug.code = code
-                    drug.save()
-                    
-                return JsonResponse({'success': True, 'id': drug.id, 'text': drug.title})
-        except Exception as e:
-            return JsonResponse({'success': False, 'error': str(e)})
-            
-        return JsonResponse({'success': False, 'error': 'اطلاعات نامعتبر است'})
-
 # ====================================================== #
 # ==================== Dynamic View ==================== #
 # ====================================================== #
@@ -832,20 +715,24 @@ class PreClinicalManageView(View):
     def get_order(self, order_pk):
         return get_object_or_404(Order, pk=order_pk)
 
+    def _load_groups(self, order):
+        """
+        گروه‌ها و تمام گره‌های Order با دو کوئری (همان loader مورد استفاده‌ی API).
+        خروجی: لیست (group, children_by_parent) که کلید None گره‌های ریشه است.
+        """
+        prefetch_related_objects([order], dynamic_field_tree_prefetch())
+        return [(group, children_by_parent(group.nodes.all())) for group in order.dynamic_field_groups.all()]
+
     def _build_nested(self, order, post_data=None):
-        groups = DynamicFieldGroup.objects.filter(order=order).order_by('order_index')
         nested = []
-        for group in groups:
-            root_nodes = DynamicFieldNode.objects.filter(
-                group=group, parent=None
-            ).prefetch_related('children').order_by('order_index')
-
+        for group, tree in self._load_groups(order):
             node_entries = []
-            for node in root_nodes:
+            for node in tree[None]:
                 child_fs = DynamicFieldChildNodeFormSet(
                     post_data or None,
                     instance=node,
                     prefix=f'group-{group.pk}-node-{node.pk}-children',
+                    preloaded=tree[node.pk],
                 )
                 node_entries.append({
                     'node': node,
@@ -945,23 +832,25 @@ class PreClinicalManageView(View):
 
         # ===== ذخیره همه ===== #
         if action == 'save_all':
-            groups = DynamicFieldGroup.objects.filter(order=order)
             all_valid = True
             all_group_forms = []
             all_node_data = []
 
-            for group in groups:
+            for group, tree in self._load_groups(order):
                 gf = DynamicFieldGroupForm(request.POST, instance=group, prefix=f'group-{group.pk}')
                 if not gf.is_valid():
                     all_valid = False
                 all_group_forms.append((group, gf))
 
-                for node in DynamicFieldNode.objects.filter(group=group, parent=None):
+                for node in tree[None]:
                     nf = DynamicFieldRootNodeForm(
                         request.POST, instance=node, prefix=f'group-{group.pk}-node-{node.pk}'
                     )
                     cf = DynamicFieldChildNodeFormSet(
-                        request.POST, instance=node, prefix=f'group-{group.pk}-node-{node.pk}-children'
+                        request.POST,
+                        instance=node,
+                        prefix=f'group-{group.pk}-node-{node.pk}-children',
+                        preloaded=tree[node.pk],
                     )
                     if not nf.is_valid() or not cf.is_valid():
                         all_valid = False
@@ -1037,17 +926,21 @@ class EmergencyDispositionManageView(View):
         disp, _ = EmergencyDisposition.objects.get_or_create(order=order)
         return disp
 
+    def _load_tree(self, disposition):
+        """تمام گره‌های تعیین تکلیف با یک کوئری، گروه‌بندی شده بر اساس والد"""
+        prefetch_related_objects([disposition], emergency_tree_prefetch())
+        return children_by_parent(disposition.nodes.all())
+
     def _build_nested(self, disposition, post_data=None):
-        root_nodes = EmergencyNode.objects.filter(
-            disposition=disposition, parent=None
-        ).prefetch_related('children').order_by('order_index')
+        tree = self._load_tree(disposition)
 
         nested = []
-        for node in root_nodes:
+        for node in tree[None]:
             child_fs = ChildNodeFormSet(
                 post_data or None,
                 instance=node,
                 prefix=f'node-{node.pk}-children',
+                preloaded=tree[node.pk],
             )
             nested.append({
                 'node': node,
@@ -1153,15 +1046,13 @@ class EmergencyDispositionManageView(View):
 
         # ===== ذخیره تمامی گره‌ها ===== #
         if action == 'save_all':
-            root_nodes = EmergencyNode.objects.filter(
-                disposition=disposition, parent=None
-            ).order_by('order_index')
+            tree = self._load_tree(disposition)
 
             all_node_forms = []
             all_child_formsets = []
             all_valid = True
 
-            for node in root_nodes:
+            for node in tree[None]:
                 nf = EmergencyRootNodeForm(
                     request.POST,
                     instance=node,
@@ -1171,6 +1062,7 @@ class EmergencyDispositionManageView(View):
                     request.POST,
                     instance=node,
                     prefix=f'node-{node.pk}-children',
+                    preloaded=tree[node.pk],
                 )
                 if not nf.is_valid():
                     all_valid = False
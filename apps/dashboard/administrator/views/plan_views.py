@@ -4,10 +4,12 @@ from django.http import JsonResponse
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import get_object_or_404, redirect
 from django.contrib import messages
+from django.db.models import Count, Q
 import json
 
 from apps.subscriptions.models import Plan, Membership, Feature, FeatureType, PlanTag
 from ..forms import PlanForm, MembershipForm, FeatureForm
+from ..services.stats_service import get_header_stats
 
 
 # ========================== #
@@ -29,11 +31,11 @@ class PlanListView(LoginRequiredMixin, ListView):
             {'label': 'مدیریت پلن‌ها و Membership‌ها', 'url': ''}
         ]
 
-        context['stats'] = {
-            'total_memberships': Membership.objects.count(),
-            'active_memberships': Membership.objects.filter(is_active=True).count(),
-            'total_plans': Plan.objects.count(),
-        }
+        context['stats'] = get_header_stats(Membership, {
+            'total_memberships': Count('pk', distinct=True),
+            'active_memberships': Count('pk', filter=Q(is_active=True), distinct=True),
+            'total_plans': Count('plans', distinct=True),
+        }, cache_key='plans')
 
         context['features'] = Feature.objects.all().order_by('feature_type', 'name')
         context['feature_types'] = FeatureType.choices
@@ -12,6 +12,7 @@ from .mixins import PrescriptionFormMixin
 from ..forms.prescriptions_forms import *
 from apps.prescriptions.models import Prescription, PrescriptionDrug
 from apps.accounts.permissions import HasAdminAccessPermission, IsTokenJtiActive
+from ..services.stats_service import get_header_stats
 
 # ===== بردکرامب پایه ===== #
 BREADCRUMB_HOME = {'label': 'داشبورد', 'url': reverse_lazy('dashboard:index:index')}
@@ -65,15 +66,11 @@ class PrescriptionListView(LoginRequiredMixin, IsTokenJtiActive, HasAdminAccessP
         context['sort_by'] = self.request.GET.get('sort_by', '')
 
         # ===== آمار کارت‌ها ===== #
-        total = Prescription.objects.count()
-        premium = Prescription.objects.filter(access_level='PREMIUM').count()
-        free = Prescription.objects.filter(access_level='FREE').count()
-
-        context['stats'] = {
-            'total': total,
-            'premium': premium,
-            'free': free,
-        }
+        context['stats'] = get_header_stats(Prescription, {
+            'total': None,
+            'premium': Q(access_level='PREMIUM'),
+            'free': Q(access_level='FREE'),
+        }, cache_key='prescriptions')
 
         # ===== فرم فیلتر ===== #
         context['filter_form'] = PrescriptionFilterForm(self.request.GET)
@@ -176,11 +173,6 @@ class PrescriptionCreateView(LoginRequiredMixin, CreateView):
             {'label': 'مدیریت نسخه‌ها', 'url': reverse_lazy('dashboard:prescriptions:prescription_list')},
             {'label': 'افزودن نسخه جدید' if not self.object else f'ویرایش نسخه: {self.object.title}', 'url': ''}
         ]
-
-        # تمام داروها برای JavaScript
-        context['all_drugs_json'] = json.dumps(
-            list(Drug.objects.values('id', 'title', 'code').order_by('title'))
-        )
         
         return context
     
@@ -265,11 +257,6 @@ class PrescriptionUpdateView(LoginRequiredMixin, UpdateView):
             {'label': 'مدیریت نسخه‌ها', 'url': reverse_lazy('dashboard:prescriptions:prescription_list')},
             {'label': 'افزودن نسخه جدید' if not self.object else f'ویرایش نسخه: {self.object.title}', 'url': ''}
         ]
-
-        # تمام داروها برای JavaScript
-        context['all_drugs_json'] = json.dumps(
-            list(Drug.objects.values('id', 'title', 'code').order_by('title'))
-        )
         
         # داروهای موجود
         existing_drugs = []
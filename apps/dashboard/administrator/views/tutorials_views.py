@@ -14,6 +14,7 @@ from apps.accounts.permissions import IsTokenJtiActive, HasAdminAccessPermission
 from apps.home.models import Tutorial
 import json
 import logging
+from ..services.stats_service import get_header_stats
 
 logger = logging.getLogger(__name__)
 
@@ -43,17 +44,11 @@ class TutorialsListView(LoginRequiredMixin, IsTokenJtiActive, HasAdminAccessPerm
         context['search'] = self.request.GET.get('search', '')
 
         # آمار
-        total = Tutorial.objects.count()
-        recent = Tutorial.objects.filter(
-            created_at__gte=timezone.now() - timezone.timedelta(days=7)
-        ).count()
-        views = 0  # در صورت وجود فیلد بازدید، محاسبه شود
-
-        context['stats'] = {
-            'total': total,
-            'recent': recent,
-            'views': views,
-        }
+        context['stats'] = get_header_stats(Tutorial, {
+            'total': None,
+            'recent': Q(created_at__gte=timezone.now() - timezone.timedelta(days=7)),
+        }, cache_key='tutorials')
+        context['stats']['views'] = 0  # در صورت وجود فیلد بازدید، محاسبه شود
 
         # داده‌های JSON برای Alpine
         tutorials_data = []
@@ -4,7 +4,7 @@ from django.utils import timezone
 from django.views.generic import ListView, View
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.http import JsonResponse, HttpResponse
@@ -15,10 +15,11 @@ from openpyxl.styles import Font, Alignment, PatternFill
 
 # ===== Local Imports ===== #
 from apps.accounts.permissions import IsTokenJtiActive, HasAdminAccessPermission
-from apps.accounts.models import Profile, AuthStatusChoices
+from apps.accounts.models import AuthStatusChoices
 from ..forms import UserSearchForm, UserEditForm, ProfileEditForm, AddUserForm
 from ..services.email_service import resend_auth_email, send_auth_checked_email
 from apps.accounts.services import AmootSMSService
+from ..services.stats_service import get_header_stats
 
 User = get_user_model()
 
@@ -80,16 +81,17 @@ class AdminUsersListView(LoginRequiredMixin, IsTokenJtiActive, HasAdminAccessPer
         context = super().get_context_data(**kwargs)
         context['search_form'] = UserSearchForm(self.request.GET or None)
         context['breadcrumb'] = [BREADCRUMB_HOME, {'label': 'مدیریت کاربران', 'url': ''}]
-        context['stats'] = {
-            'total_users': User.objects.count(),
-            'premium_users': Profile.objects.filter(role='premium').count(),
-            'pending_verification': Profile.objects.filter(
-                role='visitor',
-                auth_status=AuthStatusChoices.PENDING.value,
-                documents__isnull=False
-            ).count(),
-            'approved_users': Profile.objects.filter(auth_status='APPROVED').count(),
-        }
+        # join با documents ممکن است ردیف تکراری بسازد، پس شمارش‌ها distinct هستند
+        context['stats'] = get_header_stats(User, {
+            'total_users': Count('pk', distinct=True),
+            'premium_users': Count('pk', filter=Q(profile__role='premium'), distinct=True),
+            'pending_verification': Count('pk', filter=Q(
+                profile__role='visitor',
+                profile__auth_status=AuthStatusChoices.PENDING.value,
+                profile__documents__isnull=False
+            ), distinct=True),
+            'approved_users': Count('pk', filter=Q(profile__auth_status='APPROVED'), distinct=True),
+        }, cache_key='users')
         for user in context['users']:
             user.jalali_date = get_jalali_date(user.date_joined)
         return context
@@ -0,0 +1,39 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.payment.models import Payment, PaymentStatus
+from apps.questions.models import Question
+from apps.home.models import Contact
+from apps.dashboard.administrator.views.index_views import (
+    _calculate_dashboard_stats,
+    _get_realtime_data,
+)
+
+
+# ====== Dashboard Cache Invalidation ====== #
+def invalidate_dashboard_stats():
+    """باطل کردن کش آمار و پنل‌های لحظه‌ای داشبورد بعد از commit تراکنش"""
+    transaction.on_commit(_calculate_dashboard_stats.invalidate)
+    transaction.on_commit(_get_realtime_data.invalidate)
+
+
+@receiver(post_save, sender=Payment)
+def invalidate_on_payment_completed(sender, instance, **kwargs):
+    """پرداخت موفق روی درآمد و تعداد کاربران ویژه اثر می‌گذارد"""
+    if instance.status == PaymentStatus.COMPLETED:
+        invalidate_dashboard_stats()
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_on_question_change(sender, **kwargs):
+    """ثبت یا پاسخ سوال روی شمارنده‌ی سوالات بی‌پاسخ اثر می‌گذارد"""
+    invalidate_dashboard_stats()
+
+
+@receiver(post_save, sender=Contact)
+@receiver(post_delete, sender=Contact)
+def invalidate_on_contact_change(sender, **kwargs):
+    """پیام‌های تماس جدید باید فوراً در داشبورد دیده شوند"""
+    transaction.on_commit(_get_realtime_data.invalidate)
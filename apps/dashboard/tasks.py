@@ -0,0 +1,19 @@
+# apps/dashboard/tasks.py
+
+import logging
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True, time_limit=120, soft_time_limit=90)
+def refresh_google_analytics_report():
+    """تازه‌سازی گزارش گوگل آنالیتیکس در کش داشبورد"""
+    from apps.dashboard.administrator.services.google_analytics_service import refresh_last_7_days_report
+
+    data = refresh_last_7_days_report()
+    if data is None:
+        return "Failed"
+
+    logger.info(f"Google Analytics report refreshed ({len(data)} rows)")
+    return f"Refreshed: {len(data)} rows"
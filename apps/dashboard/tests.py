@@ -1,3 +1,26 @@
-from django.test import TestCase
+from unittest.mock import patch
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.dashboard.administrator.services import google_analytics_service as ga
+
+
+@override_settings(GA4_BACKEND='fake')
+class GoogleAnalyticsCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_empty_cache_schedules_refresh_without_blocking(self):
+        with patch('apps.dashboard.tasks.refresh_google_analytics_report.delay') as delay:
+            self.assertEqual(ga.get_cached_last_7_days_report(), [])
+            # درخواست دوم نباید تسک تکراری در صف بگذارد
+            ga.get_cached_last_7_days_report()
+        delay.assert_called_once()
+
+    def test_fresh_report_is_served_from_cache(self):
+        data = ga.refresh_last_7_days_report()
+        with patch('apps.dashboard.tasks.refresh_google_analytics_report.delay') as delay:
+            self.assertEqual(ga.get_cached_last_7_days_report(), data)
+        delay.assert_not_called()
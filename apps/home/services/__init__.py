@@ -0,0 +1,7 @@
+from .home_feed import (
+    HOME_FEED_SIZE,
+    build_home_feed,
+    get_home_feed,
+    refresh_home_feed,
+    invalidate_home_feed,
+)
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import logging
+
+from django.db import transaction
+from django.db.models import Prefetch
+
+from apps.home.models import Tutorial
+from apps.prescriptions.models import AccessChoices, Prescription, PrescriptionCategory
+from apps.subscriptions.models import Feature, Plan
+from core.cache import stale_while_revalidate
+
+logger = logging.getLogger(__name__)
+
+HOME_FEED_TIMEOUT = 24 * 60 * 60
+HOME_FEED_SIZE = 4
+
+
+# ====== Build ====== #
+def build_home_feed():
+    """
+    ساخت کامل payload صفحه‌ی اصلی: نسخه‌های رایگان اخیر و پربازدید، آموزش‌های
+    اخیر، پلن‌های فعال و دسته‌بندی‌ها. خروجی برای همه‌ی کاربران یکسان است.
+    خروجی: (payload, etag)
+    """
+    # سریالایزرهای API تنها منبع شکل خروجی هستند؛ payload همان خروجی اندپوینت‌های جداگانه است
+    from apps.api.v1.home.serializers import (
+        HomeFeedPlanSerializer,
+        RecentPrescriptionSerializer,
+        RecentTutorialSerializer,
+    )
+    from apps.api.v1.prescriptions.serializers import PrescriptionCategorySerializer
+
+    free_prescriptions = Prescription.objects.filter(
+        is_active=True, access_level=AccessChoices.free.value
+    ).select_related('category')
+    plans = Plan.objects.filter(
+        is_active=True, membership__is_active=True
+    ).select_related('membership').prefetch_related(
+        Prefetch('membership__features', queryset=Feature.objects.filter(is_active=True))
+    ).order_by('duration_days')
+
+    payload = {
+        'recent_prescriptions': RecentPrescriptionSerializer(
+            free_prescriptions.order_by('-created_at')[:HOME_FEED_SIZE], many=True
+        ).data,
+        'popular_prescriptions': RecentPrescriptionSerializer(
+            free_prescriptions.filter(view_count__gt=0).order_by('-popularity', '-created_at')[:HOME_FEED_SIZE],
+            many=True,
+        ).data,
+        'recent_tutorials': RecentTutorialSerializer(
+            Tutorial.objects.order_by('-created_at')[:HOME_FEED_SIZE], many=True
+        ).data,
+        'plans': HomeFeedPlanSerializer(plans, many=True).data,
+        'categories': PrescriptionCategorySerializer(PrescriptionCategory.objects.all(), many=True).data,
+    }
+    payload = json.loads(json.dumps(payload, default=str))
+    digest = hashlib.sha256(
+        json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    ).hexdigest()
+    return payload, f'"{digest}"'
+
+
+# ====== Cache ====== #
+@stale_while_revalidate('home:feed', fresh_for=HOME_FEED_TIMEOUT, stale_for=HOME_FEED_TIMEOUT)
+def _cached_home_feed():
+    return build_home_feed()
+
+
+def get_home_feed():
+    """
+    payload صفحه‌ی اصلی از کش. بعد از انقضا فقط یک درخواست آن را می‌سازد و
+    بقیه payload قبلی را می‌گیرند. خروجی: (payload, etag)
+    """
+    return _cached_home_feed()
+
+
+def refresh_home_feed():
+    """ساخت payload و جایگزینی آن در کش؛ تا پایان ساخت payload قبلی سرو می‌شود. خروجی: (payload, etag)"""
+    return _cached_home_feed.refresh()
+
+
+# ====== Invalidation ====== #
+def _rebuild_after_commit():
+    # خطای ساخت نباید ذخیره‌ی محتوا را خراب کند؛ در این حالت payload قبلی باطل
+    # می‌شود تا اولین درخواست آن را بسازد
+    try:
+        refresh_home_feed()
+    except Exception as e:
+        logger.error(f"Could not rebuild home feed: {e}", exc_info=True)
+        _cached_home_feed.invalidate()
+
+
+def invalidate_home_feed():
+    """
+    ساخت دوباره‌ی payload بعد از commit؛ تا آن موقع payload قبلی سرو می‌شود و
+    درخواست‌های مهمان هیچ‌وقت به ساخت همزمان نمی‌رسند.
+    """
+    transaction.on_commit(_rebuild_after_commit)
@@ -1,40 +1,70 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.contrib.contenttypes.models import ContentType
 
-from apps.home.models import Contact
+from apps.home.models import Contact, Tutorial
+from apps.home.services import invalidate_home_feed
 from apps.accounts.models import User
+from apps.prescriptions.models import Prescription, PrescriptionCategory
+from apps.subscriptions.models import Feature, Membership, Plan
 from apps.notifications.models import Notification
+from apps.notifications.services import outbox_handler, enqueue_event, create_notifications
 
 
 @receiver(post_save, sender=Contact)
 def notify_user_on_contact_response(sender, instance, created, **kwargs):
     """
     زمانی که ادمین به پیام تماس پاسخ می‌دهد، نوتیفیکیشن برای کاربر ارسال می‌شود
+    (ساخت نوتیفیکیشن در پس‌زمینه از طریق outbox)
     """
     if created or not instance.admin_response:
         return
     
-    # پیدا کردن کاربر بر اساس شماره تلفن
-    try:
-        user = User.objects.get(phone_number=instance.phone)
-    except User.DoesNotExist:
+    # کلید یکتا جلوی ارسال دوباره را می‌گیرد
+    enqueue_event(
+        'contact_responded',
+        {'contact_id': instance.pk},
+        idempotency_key=f'contact:{instance.pk}:response',
+    )
+
+
+@outbox_handler('contact_responded')
+def create_contact_response_notification(payload):
+    instance = Contact.objects.filter(pk=payload['contact_id']).first()
+    if instance is None:
         return
-    
-    # بررسی اینکه قبلاً نوتیف ارسال نشده باشد
-    content_type = ContentType.objects.get_for_model(Contact)
-    if Notification.objects.filter(
-        recipient=user,
-        content_type=content_type,
-        object_id=instance.id
-    ).exists():
+
+    # پیدا کردن کاربر بر اساس شماره تلفن
+    user = User.objects.filter(phone_number=instance.phone).first()
+    if user is None:
         return
     
     # ایجاد نوتیفیکیشن
-    Notification.objects.create(
-        recipient=user,
-        title="پاسخ به پیام تماس شما",
-        message=instance.admin_response,
-        content_type=content_type,
-        object_id=instance.id
-    )
+    create_notifications([
+        Notification(
+            recipient=user,
+            title="پاسخ به پیام تماس شما",
+            message=instance.admin_response,
+            content_type=ContentType.objects.get_for_model(Contact),
+            object_id=instance.id,
+            idempotency_key=f'contact:{instance.pk}:response',
+        )
+    ])
+
+
+# ====== Home Feed ====== #
+@receiver(post_save, sender=Prescription)
+@receiver(post_delete, sender=Prescription)
+@receiver(post_save, sender=PrescriptionCategory)
+@receiver(post_delete, sender=PrescriptionCategory)
+@receiver(post_save, sender=Tutorial)
+@receiver(post_delete, sender=Tutorial)
+@receiver(post_save, sender=Plan)
+@receiver(post_delete, sender=Plan)
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+@receiver(post_save, sender=Feature)
+@receiver(post_delete, sender=Feature)
+@receiver(m2m_changed, sender=Membership.features.through)
+def refresh_home_feed_on_content_change(sender, **kwargs):
+    invalidate_home_feed()
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.notifications.services.retention_service import (
+    archive_read_notifications,
+    compact_table,
+    table_report,
+)
+
+
+class Command(BaseCommand):
+    """
+    گزارش حجم جدول اعلان‌ها، بایگانی اعلان‌های خوانده شده‌ی قدیمی و
+    بازپس‌گیری فضای آزاد جدول.
+
+    مثال:
+        python manage.py notifications_retention
+        python manage.py notifications_retention --archive --compact --days 60
+    """
+    help = 'Reports notification table size, archives old read notifications and compacts the table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.NOTIFICATIONS_RETENTION_DAYS,
+            help='Archive read notifications older than this many days.',
+        )
+        parser.add_argument('--archive', action='store_true', help='Move archivable notifications to the archive table.')
+        parser.add_argument('--compact', action='store_true', help='Reclaim free space (OPTIMIZE / VACUUM).')
+
+    def handle(self, *args, **options):
+        days = options['days']
+        self._print_report(table_report(days), days)
+
+        if options['archive']:
+            archived = archive_read_notifications(days)
+            self.stdout.write(self.style.SUCCESS(f'{archived} اعلان بایگانی شد.'))
+
+        if options['compact']:
+            if compact_table():
+                self.stdout.write(self.style.SUCCESS('فشرده‌سازی جدول انجام شد.'))
+            else:
+                self.stdout.write(self.style.WARNING('فشرده‌سازی برای این دیتابیس پشتیبانی نمی‌شود.'))
+
+        if options['archive'] or options['compact']:
+            self._print_report(table_report(days), days)
+
+    def _print_report(self, report, days):
+        self.stdout.write(self.style.NOTICE('--- گزارش جدول اعلان‌ها ---'))
+        self.stdout.write(f"اعلان‌ها: {report['notifications']} (خوانده نشده: {report['unread']})")
+        self.stdout.write(f"قابل بایگانی (خوانده شده و قدیمی‌تر از {days} روز): {report['archivable']}")
+        self.stdout.write(f"بایگانی شده: {report['archived']}")
+
+        if 'data_bytes' in report:
+            self.stdout.write(
+                f"حجم داده: {report['data_bytes'] // 1024} KB | "
+                f"ایندکس: {report['index_bytes'] // 1024} KB | "
+                f"فضای آزاد (bloat): {report['free_bytes'] // 1024} KB"
+            )
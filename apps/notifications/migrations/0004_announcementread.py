@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_alter_notification_message'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnnouncementRead',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('read_at', models.DateTimeField(auto_now_add=True, verbose_name='زمان خواندن')),
+            ],
+            options={
+                'verbose_name': 'رسید خواندن پیام گروهی',
+                'verbose_name_plural': 'رسیدهای خواندن پیام\u200cهای گروهی',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['is_sent', 'target_role', '-created_at'], name='notificatio_is_sent_055dfd_idx'),
+        ),
+        migrations.AddField(
+            model_name='announcementread',
+            name='announcement',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reads', to='notifications.announcement', verbose_name='پیام گروهی'),
+        ),
+        migrations.AddField(
+            model_name='announcementread',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='announcement_reads', to=settings.AUTH_USER_MODEL, verbose_name='کاربر'),
+        ),
+        migrations.AddConstraint(
+            model_name='announcementread',
+            constraint=models.UniqueConstraint(fields=('announcement', 'user'), name='unique_announcement_read'),
+        ),
+    ]
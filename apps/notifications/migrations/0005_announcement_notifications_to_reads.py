@@ -0,0 +1,45 @@
+from django.db import migrations
+
+
+def forwards(apps, schema_editor):
+    """
+    تبدیل اعلان‌های تکی ساخته شده از پیام‌های گروهی به رسید خواندن
+    و حذف ردیف‌های تکراری هر کاربر.
+    """
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Notification = apps.get_model('notifications', 'Notification')
+    Announcement = apps.get_model('notifications', 'Announcement')
+    AnnouncementRead = apps.get_model('notifications', 'AnnouncementRead')
+
+    content_type = ContentType.objects.filter(app_label='notifications', model='announcement').first()
+    if content_type is None:
+        return
+
+    announcement_notifications = Notification.objects.filter(content_type=content_type)
+
+    read_rows = announcement_notifications.filter(
+        is_read=True,
+        object_id__in=Announcement.objects.values('id'),
+    ).values_list('object_id', 'recipient_id').iterator()
+    batch = []
+    for announcement_id, user_id in read_rows:
+        batch.append(AnnouncementRead(announcement_id=announcement_id, user_id=user_id))
+        if len(batch) >= 5000:
+            AnnouncementRead.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        AnnouncementRead.objects.bulk_create(batch, ignore_conflicts=True)
+
+    announcement_notifications.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notifications', '0004_announcementread'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:02
+
+from django.db import migrations, models
+
+
+def mark_sent_as_completed(apps, schema_editor):
+    """پیام‌های گروهی ارسال شده‌ی قبلی، ارسال کامل محسوب می‌شوند"""
+    Announcement = apps.get_model('notifications', 'Announcement')
+    Announcement.objects.filter(is_sent=True).update(delivery_status='completed')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0005_announcement_notifications_to_reads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='announcement',
+            name='delivered_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='تعداد ارسال شده'),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='delivery_status',
+            field=models.CharField(choices=[('pending', 'در صف ارسال'), ('in_progress', 'در حال ارسال'), ('completed', 'ارسال کامل'), ('failed', 'ناموفق')], default='pending', max_length=20, verbose_name='وضعیت ارسال'),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='delivery_updated_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='آخرین بروزرسانی ارسال'),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='last_recipient_id',
+            field=models.PositiveBigIntegerField(default=0, verbose_name='آخرین گیرنده\u200cی پردازش شده'),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='send_email',
+            field=models.BooleanField(default=False, verbose_name='ارسال ایمیل'),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='send_sms',
+            field=models.BooleanField(default=False, verbose_name='ارسال پیامک'),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='total_recipients',
+            field=models.PositiveIntegerField(default=0, verbose_name='تعداد گیرندگان'),
+        ),
+        migrations.RunPython(mark_sent_as_completed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notifications', '0006_announcement_delivery_progress'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.PositiveBigIntegerField(unique=True, verbose_name='شناسه\u200cی اعلان اصلی')),
+                ('title', models.CharField(max_length=100, verbose_name='عنوان اعلان')),
+                ('message', models.TextField(verbose_name='متن اعلان')),
+                ('content_type_id', models.PositiveIntegerField(verbose_name='نوع محتوا')),
+                ('object_id', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(verbose_name='تاریخ ایجاد')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='تاریخ بایگانی')),
+            ],
+            options={
+                'verbose_name': 'اعلان بایگانی شده',
+                'verbose_name_plural': 'اعلان\u200cهای بایگانی شده',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', '-created_at', '-id'], name='notif_recipient_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'is_read', '-created_at'], name='notif_recipient_read_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['is_read', 'created_at'], name='notif_read_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationarchive',
+            name='recipient',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_notifications', to=settings.AUTH_USER_MODEL, verbose_name='گیرنده'),
+        ),
+        migrations.AddIndex(
+            model_name='notificationarchive',
+            index=models.Index(fields=['recipient', '-created_at'], name='notif_archive_recipient_idx'),
+        ),
+    ]
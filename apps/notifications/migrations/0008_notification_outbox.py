@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0007_notification_indexes_and_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='idempotency_key',
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True, verbose_name='کلید یکتایی'),
+        ),
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(max_length=50, verbose_name='نوع رویداد')),
+                ('payload', models.JSONField(default=dict, verbose_name='داده\u200cها')),
+                ('idempotency_key', models.CharField(max_length=100, unique=True, verbose_name='کلید یکتایی')),
+                ('status', models.CharField(choices=[('pending', 'در انتظار'), ('processed', 'پردازش شده'), ('failed', 'ناموفق')], default='pending', max_length=20, verbose_name='وضعیت')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='تعداد تلاش')),
+                ('last_error', models.TextField(blank=True, verbose_name='آخرین خطا')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاریخ ایجاد')),
+                ('processed_at', models.DateTimeField(blank=True, null=True, verbose_name='تاریخ پردازش')),
+            ],
+            options={
+                'verbose_name': 'رویداد اعلان',
+                'verbose_name_plural': 'صف رویدادهای اعلان',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='notif_outbox_status_idx')],
+            },
+        ),
+    ]
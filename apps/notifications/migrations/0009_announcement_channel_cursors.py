@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:56
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_recipient_cursor(apps, schema_editor):
+    """ارسال‌های نیمه‌کاره از همان نقطه‌ی قبلی در هر دو کانال ادامه پیدا می‌کنند"""
+    Announcement = apps.get_model('notifications', 'Announcement')
+    Announcement.objects.update(
+        last_sms_recipient_id=F('last_recipient_id'),
+        last_email_recipient_id=F('last_recipient_id'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0008_notification_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='announcement',
+            name='last_email_recipient_id',
+            field=models.PositiveBigIntegerField(default=0, verbose_name='آخرین گیرنده\u200cی ایمیل'),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='last_sms_recipient_id',
+            field=models.PositiveBigIntegerField(default=0, verbose_name='آخرین گیرنده\u200cی پیامک'),
+        ),
+        migrations.RunPython(copy_recipient_cursor, migrations.RunPython.noop),
+    ]
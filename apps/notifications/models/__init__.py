@@ -1,2 +1,5 @@
 from .notification import Notification
-from .announcement import Announcement
\ No newline at end of file
+from .announcement import Announcement
+from .announcement_read import AnnouncementRead
+from .notification_archive import NotificationArchive
+from .outbox import NotificationOutbox
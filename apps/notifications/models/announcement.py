@@ -1,11 +1,40 @@
 import jdatetime
 
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from .notification import Notification
 from apps.accounts.models import Profile
+from .announcement_read import AnnouncementRead
+
+
+# ===== Announcement QuerySet ===== #
+class AnnouncementQuerySet(models.QuerySet):
+
+    def for_user(self, user):
+        """
+        پیام‌های گروهی منتشر شده‌ای که شامل این کاربر می‌شوند.
+        مثل قبل، فقط پیام‌هایی که بعد از عضویت کاربر ارسال شده‌اند.
+        """
+        role = getattr(getattr(user, 'profile', None), 'role', None)
+        if role is None or role == 'admin':
+            return self.none()
+
+        return self.filter(
+            models.Q(target_role='all') | models.Q(target_role=role),
+            is_sent=True,
+            created_at__gte=user.date_joined,
+        )
+
+    def with_read_state(self, user):
+        """اضافه کردن فیلد is_read بر اساس رسید خواندن کاربر"""
+        return self.annotate(
+            is_read=models.Exists(
+                AnnouncementRead.objects.filter(announcement=models.OuterRef('pk'), user=user)
+            )
+        )
+
 
 # ===== Announcement Model ===== #
 class Announcement(models.Model):
@@ -20,6 +49,18 @@ class Announcement(models.Model):
         ('premium', 'کاربران ویژه'),
     ]
 
+    DELIVERY_PENDING = 'pending'
+    DELIVERY_IN_PROGRESS = 'in_progress'
+    DELIVERY_COMPLETED = 'completed'
+    DELIVERY_FAILED = 'failed'
+
+    DELIVERY_STATUSES = [
+        (DELIVERY_PENDING, 'در صف ارسال'),
+        (DELIVERY_IN_PROGRESS, 'در حال ارسال'),
+        (DELIVERY_COMPLETED, 'ارسال کامل'),
+        (DELIVERY_FAILED, 'ناموفق'),
+    ]
+
     title = models.CharField(max_length=100, verbose_name=_("عنوان"))
     message = models.TextField(verbose_name=_("متن پیام"))
     
@@ -39,47 +80,93 @@ class Announcement(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_sent = models.BooleanField(default=False, verbose_name=_("ارسال شده؟"))
 
+    # ===== ارسال از کانال‌های خارجی (پیامک / ایمیل) ===== #
+    send_sms = models.BooleanField(default=False, verbose_name=_("ارسال پیامک"))
+    send_email = models.BooleanField(default=False, verbose_name=_("ارسال ایمیل"))
+
+    # ===== پیشرفت ارسال ===== #
+    delivery_status = models.CharField(
+        max_length=20,
+        choices=DELIVERY_STATUSES,
+        default=DELIVERY_PENDING,
+        verbose_name=_("وضعیت ارسال")
+    )
+    total_recipients = models.PositiveIntegerField(default=0, verbose_name=_("تعداد گیرندگان"))
+    delivered_count = models.PositiveIntegerField(default=0, verbose_name=_("تعداد ارسال شده"))
+    # آخرین Profile پردازش شده در همه‌ی کانال‌ها؛ مبنای delivered_count
+    last_recipient_id = models.PositiveBigIntegerField(default=0, verbose_name=_("آخرین گیرنده‌ی پردازش شده"))
+    # پیشرفت هر کانال جداگانه ذخیره می‌شود تا خطای یک کانال باعث ارسال دوباره‌ی کانال دیگر نشود
+    last_sms_recipient_id = models.PositiveBigIntegerField(default=0, verbose_name=_("آخرین گیرنده‌ی پیامک"))
+    last_email_recipient_id = models.PositiveBigIntegerField(default=0, verbose_name=_("آخرین گیرنده‌ی ایمیل"))
+    delivery_updated_at = models.DateTimeField(null=True, blank=True, verbose_name=_("آخرین بروزرسانی ارسال"))
+
+    objects = AnnouncementQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_sent', 'target_role', '-created_at']),
+        ]
+
     def __str__(self):
         return f"{self.title} - {self.get_target_role_display()}"
 
+    def get_recipients(self):
+        """
+        کاربران هدف این پیام گروهی (ادمین‌ها شامل نمی‌شوند).
+        مثل for_user فقط کاربرانی که قبل از ایجاد پیام عضو شده‌اند.
+        """
+        profiles = Profile.objects.exclude(role='admin')
+        if self.created_at is not None:
+            profiles = profiles.filter(user__date_joined__lte=self.created_at)
+        if self.target_role != 'all':
+            profiles = profiles.filter(role=self.target_role)
+        return profiles
+
     def send_announcement(self):
         """
-        ارسال پیام به کاربرها با گروهی کاربرها.
+        انتشار پیام گروهی.
+        پیام فقط یک بار ذخیره می‌شود و در زمان خواندن با اعلان‌های هر
+        کاربر ادغام می‌شود (fan-out-on-read)، پس هزینه‌ی ارسال ثابت است.
+        اگر پیامک یا ایمیل انتخاب شده باشد، ارسال آن‌ها بعد از commit به
+        تسک پس‌زمینه سپرده می‌شود و پیشرفتش روی همین رکورد ثبت می‌شود.
+        خروجی: تعداد کاربرانی که پیام را دریافت می‌کنند.
         """
         # ===== اگر قبلا ارسال شده بود ===== #
         if self.is_sent:
             return 0
-        # ===== تفکیک کاربران براساس نقش ===== #
-        users_query = Profile.objects.select_related("user").exclude(role='admin')
-        if self.target_role != 'all':
-            users_query = users_query.filter(role=self.target_role)
-            
-        # ===== جلوگیری از پرشدن حافظه ===== #
-        profiles = users_query.iterator()
-        
-        notifications_to_create = []
-        for profile in profiles:
-            notification = Notification(
-                recipient=profile.user,
-                title=self.title,
-                message=self.message,
-                content_object=self,
-            )
-            notifications_to_create.append(notification)
-            
-            # ===== جلوگیری از پر شدن رم و کند شدن سیستم ===== #
-            if len(notifications_to_create) >= 5000:
-                Notification.objects.bulk_create(notifications_to_create)
-                notifications_to_create = []
-                
-        # ===== اگر پیام ها باقی ماند یا کمتر از 5000 تا بود ===== # 
-        if notifications_to_create:
-            Notification.objects.bulk_create(notifications_to_create)
-
-        # ===== ذخیره پیام ===== #
+
         self.is_sent = True
-        self.save()
-        return len(notifications_to_create)
+        self.total_recipients = self.get_recipients().count()
+        self.delivery_updated_at = timezone.now()
+
+        if self.has_external_channels:
+            self.delivery_status = self.DELIVERY_PENDING
+        else:
+            # پیام داخل سایت همین حالا برای همه قابل مشاهده است
+            self.delivery_status = self.DELIVERY_COMPLETED
+            self.delivered_count = self.total_recipients
+
+        self.save(update_fields=[
+            'is_sent', 'total_recipients', 'delivered_count',
+            'delivery_status', 'delivery_updated_at',
+        ])
+
+        if self.has_external_channels:
+            from apps.notifications.tasks import deliver_announcement
+
+            transaction.on_commit(lambda: deliver_announcement.delay(self.pk))
+
+        return self.total_recipients
+
+    @property
+    def has_external_channels(self):
+        return self.send_sms or self.send_email
+
+    @property
+    def delivery_percent(self):
+        if not self.total_recipients:
+            return 100 if self.delivery_status == self.DELIVERY_COMPLETED else 0
+        return round(self.delivered_count / self.total_recipients * 100)
     
     @property
     def shamsi_created_at(self):
@@ -0,0 +1,45 @@
+import jdatetime
+
+from django.db import models
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+
+
+# ===== Announcement Read Model ===== #
+class AnnouncementRead(models.Model):
+    """
+    رسید خوانده شدن پیام گروهی توسط یک کاربر.
+    پیام‌های گروهی فقط یک بار ذخیره می‌شوند و برای هر کاربر فقط
+    در صورت خواندن یک ردیف ثبت می‌شود (جدول تُنُک).
+    """
+    announcement = models.ForeignKey(
+        "notifications.Announcement",
+        on_delete=models.CASCADE,
+        related_name='reads',
+        verbose_name=_("پیام گروهی")
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='announcement_reads',
+        verbose_name=_("کاربر")
+    )
+    read_at = models.DateTimeField(auto_now_add=True, verbose_name=_("زمان خواندن"))
+
+    class Meta:
+        verbose_name = _("رسید خواندن پیام گروهی")
+        verbose_name_plural = _("رسیدهای خواندن پیام‌های گروهی")
+        constraints = [
+            models.UniqueConstraint(fields=['announcement', 'user'], name='unique_announcement_read'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.announcement_id}"
+
+    @property
+    def shamsi_read_at(self):
+        if self.read_at is None:
+            return "—"
+
+        jdate = jdatetime.datetime.fromgregorian(datetime=self.read_at)
+        return jdate.strftime("%Y/%m/%d - %H:%M")
@@ -28,8 +28,18 @@ class Notification(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="تاریخ ایجاد")
 
+    # کلید یکتا برای جلوگیری از ساخت اعلان تکراری (مثلاً question:12:answered)
+    idempotency_key = models.CharField(max_length=100, null=True, blank=True, unique=True, verbose_name="کلید یکتایی")
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # فید کاربر (صفحه‌بندی کرسری روی created_at, id)
+            models.Index(fields=['recipient', '-created_at', '-id'], name='notif_recipient_feed_idx'),
+            # شمارش خوانده نشده‌ها و انتخاب اعلان‌های قابل بایگانی
+            models.Index(fields=['recipient', 'is_read', '-created_at'], name='notif_recipient_read_idx'),
+            models.Index(fields=['is_read', 'created_at'], name='notif_read_created_idx'),
+        ]
 
     def __str__(self):
         return f"اعلان برای {self.recipient.username}: {self.message[:30]}..."
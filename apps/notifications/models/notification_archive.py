@@ -0,0 +1,46 @@
+import jdatetime
+
+from django.db import models
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+
+
+# ===== Notification Archive Model ===== #
+class NotificationArchive(models.Model):
+    """
+    بایگانی فشرده‌ی اعلان‌های خوانده شده‌ی قدیمی.
+    اعلان‌ها بعد از مدت نگهداری از جدول اصلی به اینجا منتقل می‌شوند تا
+    جدول Notification کوچک بماند؛ این جدول فقط برای گزارش و پیگیری است.
+    """
+    original_id = models.PositiveBigIntegerField(unique=True, verbose_name=_("شناسه‌ی اعلان اصلی"))
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_notifications',
+        db_constraint=False,
+        verbose_name=_("گیرنده")
+    )
+    title = models.CharField(max_length=100, verbose_name=_("عنوان اعلان"))
+    message = models.TextField(verbose_name=_("متن اعلان"))
+    content_type_id = models.PositiveIntegerField(verbose_name=_("نوع محتوا"))
+    object_id = models.PositiveIntegerField()
+    created_at = models.DateTimeField(verbose_name=_("تاریخ ایجاد"))
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name=_("تاریخ بایگانی"))
+
+    class Meta:
+        verbose_name = _("اعلان بایگانی شده")
+        verbose_name_plural = _("اعلان‌های بایگانی شده")
+        indexes = [
+            models.Index(fields=['recipient', '-created_at'], name='notif_archive_recipient_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient_id} - {self.title}"
+
+    @property
+    def shamsi_created_at(self):
+        if self.created_at is None:
+            return "—"
+
+        jdate = jdatetime.datetime.fromgregorian(datetime=self.created_at)
+        return jdate.strftime("%Y/%m/%d - %H:%M")
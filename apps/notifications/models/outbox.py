@@ -0,0 +1,40 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+# ===== Notification Outbox Model ===== #
+class NotificationOutbox(models.Model):
+    """
+    صف رویدادهایی که باید به اعلان تبدیل شوند (الگوی outbox).
+    سیگنال‌ها در درخواست کاربر فقط یک رویداد در همان تراکنش ثبت می‌کنند و
+    ساخت اعلان‌ها (مثلاً برای همه‌ی ادمین‌ها) توسط worker انجام می‌شود.
+    idempotency_key یکتا است تا یک رویداد هیچ‌وقت دو بار ثبت نشود.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSED = 'processed'
+    STATUS_FAILED = 'failed'
+
+    STATUSES = [
+        (STATUS_PENDING, 'در انتظار'),
+        (STATUS_PROCESSED, 'پردازش شده'),
+        (STATUS_FAILED, 'ناموفق'),
+    ]
+
+    event_type = models.CharField(max_length=50, verbose_name=_("نوع رویداد"))
+    payload = models.JSONField(default=dict, verbose_name=_("داده‌ها"))
+    idempotency_key = models.CharField(max_length=100, unique=True, verbose_name=_("کلید یکتایی"))
+    status = models.CharField(max_length=20, choices=STATUSES, default=STATUS_PENDING, verbose_name=_("وضعیت"))
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name=_("تعداد تلاش"))
+    last_error = models.TextField(blank=True, verbose_name=_("آخرین خطا"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("تاریخ ایجاد"))
+    processed_at = models.DateTimeField(null=True, blank=True, verbose_name=_("تاریخ پردازش"))
+
+    class Meta:
+        verbose_name = _("رویداد اعلان")
+        verbose_name_plural = _("صف رویدادهای اعلان")
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='notif_outbox_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} - {self.idempotency_key}"
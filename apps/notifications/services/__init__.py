@@ -0,0 +1,32 @@
+from .feed_service import (
+    FEED_PAGE_SIZE,
+    feed_position,
+    item_kind,
+    get_user_feed,
+    get_user_feed_page,
+    get_user_notifications,
+    get_user_announcements,
+    get_read_count,
+    mark_notification_as_read,
+    mark_announcement_as_read,
+    mark_all_as_read,
+)
+from .unread_counter import (
+    get_unread_count,
+    increment_unread_notifications,
+    invalidate_unread_notifications,
+    invalidate_unread_announcements,
+)
+from .realtime_service import (
+    get_broker,
+    user_channels,
+    publish_to_user,
+    publish_to_role,
+    announcement_event,
+    on_notifications_created,
+)
+from .outbox_service import (
+    outbox_handler,
+    enqueue_event,
+    create_notifications,
+)
@@ -0,0 +1,159 @@
+import heapq
+
+from django.db.models import Q, prefetch_related_objects
+
+from apps.notifications.models import Notification, Announcement, AnnouncementRead
+from .unread_counter import (
+    decrement_unread_announcements,
+    decrement_unread_notifications,
+    reset_unread_count,
+)
+from .realtime_service import publish_to_user
+
+# رویداد خواندن تا تب‌های دیگر کاربر هم شمارنده را بروز کنند
+READ_EVENT = {'type': 'read'}
+
+# ====== Feed Settings ====== #
+FEED_PAGE_SIZE = 20
+
+# ترتیب نوع آیتم‌ها برای شکستن تساوی زمان ایجاد در کرسر
+KIND_NOTIFICATION = 'notification'
+KIND_ANNOUNCEMENT = 'announcement'
+KIND_RANK = {KIND_ANNOUNCEMENT: 0, KIND_NOTIFICATION: 1}
+
+
+def item_kind(item):
+    return KIND_ANNOUNCEMENT if isinstance(item, Announcement) else KIND_NOTIFICATION
+
+
+def feed_position(item):
+    """موقعیت یکتای هر آیتم در فید: (زمان ایجاد، نوع، شناسه)"""
+    return (item.created_at, KIND_RANK[item_kind(item)], item.pk)
+
+
+# ====== User Feed ====== #
+def get_user_notifications(user):
+    """اعلان‌های مستقیم کاربر (تکی)"""
+    return Notification.objects.filter(recipient=user)
+
+
+def get_user_announcements(user):
+    """پیام‌های گروهی مربوط به نقش کاربر به همراه وضعیت خوانده شدن"""
+    return Announcement.objects.for_user(user).with_read_state(user)
+
+
+def _beyond(queryset, kind, position, reverse):
+    """
+    فیلتر keyset: آیتم‌های بعد از position (یا قبل از آن در جهت reverse)
+    با ترتیب نزولی (created_at, نوع, id).
+    """
+    created_at, rank, pk = position
+    lookup = 'gt' if reverse else 'lt'
+    condition = Q(**{f'created_at__{lookup}': created_at})
+
+    own_rank = KIND_RANK[kind]
+    if own_rank == rank:
+        condition |= Q(created_at=created_at, **{f'pk__{lookup}': pk})
+    elif (own_rank > rank) == reverse:
+        condition |= Q(created_at=created_at)
+
+    return queryset.filter(condition)
+
+
+def get_user_feed_page(user, position=None, reverse=False, page_size=FEED_PAGE_SIZE):
+    """
+    یک صفحه از فید کاربر با صفحه‌بندی کرسری.
+
+    از هر منبع (اعلان‌های مستقیم و پیام‌های گروهی) حداکثر page_size + 1
+    آیتم بعد از position خوانده و با هم merge می‌شوند؛ پس هزینه‌ی هر صفحه
+    مستقل از تعداد کل اعلان‌های کاربر است.
+    مقصد اعلان‌های مستقیم (GenericForeignKey) برای کل صفحه یکجا واکشی می‌شود.
+
+    خروجی: (آیتم‌ها به ترتیب جدیدترین، آیا آیتم بیشتری در این جهت هست)
+    """
+    direction = '' if reverse else '-'
+    ordering = (f'{direction}created_at', f'{direction}pk')
+
+    notifications = get_user_notifications(user).select_related('content_type')
+    announcements = get_user_announcements(user)
+    if position is not None:
+        notifications = _beyond(notifications, KIND_NOTIFICATION, position, reverse)
+        announcements = _beyond(announcements, KIND_ANNOUNCEMENT, position, reverse)
+
+    notifications = list(notifications.order_by(*ordering)[:page_size + 1])
+    announcements = list(announcements.order_by(*ordering)[:page_size + 1])
+
+    merged = list(heapq.merge(notifications, announcements, key=feed_position, reverse=not reverse))
+    has_more = len(merged) > page_size
+    items = merged[:page_size]
+    if reverse:
+        items.reverse()
+
+    prefetch_related_objects(
+        [item for item in items if isinstance(item, Notification)],
+        'content_object',
+    )
+
+    return items, has_more
+
+
+def get_user_feed(user):
+    """
+    کل فید کاربر (بدون صفحه‌بندی) به ترتیب جدیدترین.
+    خروجی شامل آبجکت‌های Notification و Announcement است.
+    """
+    notifications = get_user_notifications(user).order_by('-created_at', '-pk')
+    announcements = get_user_announcements(user).order_by('-created_at', '-pk')
+    return list(heapq.merge(notifications, announcements, key=feed_position, reverse=True))
+
+
+def get_read_count(user):
+    """تعداد اعلان‌های خوانده شده (مستقیم + گروهی) با دو کوئری COUNT"""
+    read_notifications = get_user_notifications(user).filter(is_read=True).count()
+    read_announcements = Announcement.objects.for_user(user).filter(reads__user=user).count()
+    return read_notifications + read_announcements
+
+
+# ====== Mark As Read ====== #
+def mark_notification_as_read(user, notification):
+    """
+    خواندن اعلان مستقیم و کم کردن شمارنده‌ی خوانده نشده‌ها.
+    UPDATE شرطی است تا دو درخواست همزمان شمارنده را دو بار کم نکنند.
+    """
+    if notification.is_read:
+        return
+    updated = Notification.objects.filter(pk=notification.pk, is_read=False).update(is_read=True)
+    notification.is_read = True
+    if updated:
+        decrement_unread_notifications(user.pk)
+        publish_to_user(user.pk, READ_EVENT)
+
+
+def mark_announcement_as_read(user, announcement):
+    """ثبت رسید خواندن پیام گروهی (در صورت تکرار کاری انجام نمی‌شود)"""
+    _, created = AnnouncementRead.objects.get_or_create(announcement=announcement, user=user)
+    if created:
+        decrement_unread_announcements(user.pk)
+        publish_to_user(user.pk, READ_EVENT)
+
+
+def mark_all_as_read(user):
+    """
+    خواندن همه‌ی اعلان‌ها: یک UPDATE برای اعلان‌های مستقیم و یک
+    INSERT گروهی برای رسید پیام‌های گروهی خوانده نشده.
+    خروجی: تعداد آیتم‌هایی که خوانده شدند.
+    """
+    updated = get_user_notifications(user).filter(is_read=False).update(is_read=True)
+
+    # bulk_create با ignore_conflicts همه‌ی آبجکت‌ها را برمی‌گرداند، حتی آن‌هایی که درج نشدند
+    unread_ids = list(
+        Announcement.objects.for_user(user).exclude(reads__user=user).values_list('pk', flat=True)
+    )
+    AnnouncementRead.objects.bulk_create(
+        [AnnouncementRead(announcement_id=pk, user=user) for pk in unread_ids],
+        ignore_conflicts=True,
+    )
+
+    reset_unread_count(user.pk)
+    publish_to_user(user.pk, READ_EVENT)
+    return updated + len(unread_ids)
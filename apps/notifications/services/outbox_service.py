@@ -0,0 +1,123 @@
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.notifications.models import Notification, NotificationOutbox
+from .realtime_service import on_notifications_created
+
+logger = logging.getLogger(__name__)
+
+# ====== Outbox Settings ====== #
+OUTBOX_MAX_ATTEMPTS = 5
+
+# نگاشت نوع رویداد به تابع پردازش‌کننده؛ هر اپ هندلرهای خودش را ثبت می‌کند
+OUTBOX_HANDLERS = {}
+
+
+def outbox_handler(event_type):
+    """
+    ثبت پردازش‌کننده‌ی یک نوع رویداد.
+
+    مثال:
+        @outbox_handler('question_created')
+        def handle_question_created(payload):
+            ...
+    """
+    def decorator(func):
+        OUTBOX_HANDLERS[event_type] = func
+        return func
+    return decorator
+
+
+# ====== Enqueue ====== #
+def enqueue_event(event_type, payload, idempotency_key):
+    """
+    ثبت رویداد در همان تراکنش درخواست و زمان‌بندی پردازش بعد از commit.
+    رویداد تکراری (با همان کلید) نادیده گرفته می‌شود.
+    """
+    event, created = NotificationOutbox.objects.get_or_create(
+        idempotency_key=idempotency_key,
+        defaults={'event_type': event_type, 'payload': payload},
+    )
+    if created:
+        transaction.on_commit(lambda: _schedule(event.pk))
+    return event
+
+
+def _schedule(event_id):
+    from apps.notifications.tasks import process_outbox_event
+
+    try:
+        process_outbox_event.delay(event_id)
+    except Exception as e:
+        # رویداد در صف می‌ماند و تسک دوره‌ای آن را پردازش می‌کند
+        logger.error(f"Could not schedule outbox event {event_id}: {e}")
+
+
+# ====== Processing ====== #
+def process_event(event_id):
+    """
+    پردازش یک رویداد در یک تراکنش. رویداد قفل می‌شود تا دو worker
+    همزمان آن را پردازش نکنند. خروجی: True در صورت پردازش.
+    """
+    with transaction.atomic():
+        event = NotificationOutbox.objects.select_for_update(skip_locked=True).filter(
+            pk=event_id, status=NotificationOutbox.STATUS_PENDING
+        ).first()
+        if event is None:
+            return False
+
+        try:
+            with transaction.atomic():
+                OUTBOX_HANDLERS[event.event_type](event.payload)
+        except Exception as e:
+            logger.error(f"Outbox event {event.pk} ({event.event_type}) failed: {e}", exc_info=True)
+            event.attempts += 1
+            event.last_error = str(e)
+            if event.attempts >= OUTBOX_MAX_ATTEMPTS:
+                event.status = NotificationOutbox.STATUS_FAILED
+            event.save(update_fields=['attempts', 'last_error', 'status'])
+            return False
+
+        event.status = NotificationOutbox.STATUS_PROCESSED
+        event.processed_at = timezone.now()
+        event.save(update_fields=['status', 'processed_at'])
+        return True
+
+
+def pending_event_ids(older_than, limit=500):
+    return list(
+        NotificationOutbox.objects.filter(
+            status=NotificationOutbox.STATUS_PENDING,
+            created_at__lt=older_than,
+        ).order_by('pk').values_list('pk', flat=True)[:limit]
+    )
+
+
+# ====== Notification Creation ====== #
+def create_notifications(notifications):
+    """
+    ساخت گروهی اعلان‌ها با idempotency_key؛ اعلان‌هایی که کلیدشان از قبل
+    وجود دارد ساخته نمی‌شوند. شمارنده‌ها و رویدادهای لحظه‌ای بعد از commit.
+    خروجی: اعلان‌های ساخته شده (خوانده شده از دیتابیس، با pk).
+    """
+    keys = [notification.idempotency_key for notification in notifications]
+    existing = set(
+        Notification.objects.filter(idempotency_key__in=keys).values_list('idempotency_key', flat=True)
+    )
+    new_notifications = [n for n in notifications if n.idempotency_key not in existing]
+    if not new_notifications:
+        return []
+
+    Notification.objects.bulk_create(new_notifications, ignore_conflicts=True)
+    # ignore_conflicts روی MySQL pk برنمی‌گرداند و ردیف‌های رد شده را هم در لیست نگه می‌دارد؛
+    # پس ردیف‌های درج شده دوباره با کلیدشان خوانده می‌شوند
+    created = list(
+        Notification.objects.filter(
+            idempotency_key__in=[notification.idempotency_key for notification in new_notifications]
+        )
+    )
+    # bulk_create سیگنال post_save ندارد
+    transaction.on_commit(lambda: on_notifications_created(created))
+    return created
@@ -0,0 +1,206 @@
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+
+from .unread_counter import increment_unread_notifications
+
+logger = logging.getLogger(__name__)
+
+# ====== Channels ====== #
+CHANNEL_PREFIX = 'notifications:events'
+
+
+def user_channel(user_id):
+    return f'{CHANNEL_PREFIX}:user:{user_id}'
+
+
+def role_channel(role):
+    return f'{CHANNEL_PREFIX}:role:{role}'
+
+
+def user_channels(user_id, role):
+    """کانال‌هایی که کاربر به آن‌ها گوش می‌دهد: کانال شخصی و کانال پیام‌های گروهی نقشش"""
+    channels = [user_channel(user_id)]
+    if role and role != 'admin':
+        channels += [role_channel('all'), role_channel(role)]
+    return channels
+
+
+# ====== In-Memory Broker ====== #
+class InMemoryBroker:
+    """
+    بروکر داخل پروسه برای تست‌ها و محیط توسعه.
+    انتشار و اشتراک فقط در یک پروسه به هم می‌رسند.
+    """
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, message)
+
+    def subscribe(self, channels):
+        """async context manager اشتراک؛ get(timeout) پیام بعدی یا None برمی‌گرداند"""
+        return _QueueSubscription(self, channels)
+
+    def _add(self, channels, entry):
+        with self._lock:
+            for channel in channels:
+                self._subscribers[channel].add(entry)
+
+    def _remove(self, channels, entry):
+        with self._lock:
+            for channel in channels:
+                self._subscribers[channel].discard(entry)
+
+
+class _QueueSubscription:
+    def __init__(self, broker, channels):
+        self._broker = broker
+        self._channels = channels
+
+    async def __aenter__(self):
+        self._queue = asyncio.Queue()
+        self._entry = (asyncio.get_running_loop(), self._queue)
+        self._broker._add(self._channels, self._entry)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._broker._remove(self._channels, self._entry)
+
+    async def get(self, timeout):
+        """پیام بعدی یا None بعد از timeout ثانیه"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+# ====== Redis Broker ====== #
+class RedisBroker:
+    """
+    بروکر Redis pub/sub برای ارسال رویدادها بین workerها و پروسه‌های ASGI.
+    انتشار همگام (از سیگنال‌ها و تسک‌ها) و اشتراک ناهمگام (از view استریم) است.
+    """
+    def __init__(self):
+        self.url = settings.NOTIFICATIONS_REDIS_URL
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import redis
+
+            self._client = redis.Redis.from_url(self.url)
+        return self._client
+
+    def publish(self, channel, message):
+        self.client.publish(channel, json.dumps(message))
+
+    def subscribe(self, channels):
+        return _RedisSubscription(self.url, channels)
+
+
+class _RedisSubscription:
+    def __init__(self, url, channels):
+        self._url = url
+        self._channels = channels
+
+    async def __aenter__(self):
+        import redis.asyncio
+
+        self._client = redis.asyncio.Redis.from_url(self._url)
+        self._pubsub = self._client.pubsub()
+        await self._pubsub.subscribe(*self._channels)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        try:
+            await self._pubsub.unsubscribe()
+            await self._pubsub.aclose()
+        finally:
+            await self._client.aclose()
+
+    async def get(self, timeout):
+        message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None:
+            return None
+        return json.loads(message['data'])
+
+
+NOTIFICATION_BROKERS = {
+    'redis': RedisBroker,
+    'memory': InMemoryBroker,
+}
+
+_broker = None
+
+
+def get_broker():
+    """بروکر رویدادها بر اساس NOTIFICATIONS_BROKER در تنظیمات (یک نمونه در هر پروسه)"""
+    global _broker
+    if _broker is None:
+        backend = getattr(settings, 'NOTIFICATIONS_BROKER', 'redis')
+        _broker = NOTIFICATION_BROKERS[backend]()
+    return _broker
+
+
+# ====== Publishing ====== #
+def _publish(channel, message):
+    """خطای بروکر نباید ساخت اعلان را خراب کند؛ کلاینت‌ها در بدترین حالت polling می‌کنند"""
+    try:
+        get_broker().publish(channel, message)
+    except Exception as e:
+        logger.error(f"Notification event publish failed on {channel}: {e}")
+
+
+def publish_to_user(user_id, message):
+    _publish(user_channel(user_id), message)
+
+
+def publish_to_role(role, message):
+    _publish(role_channel(role), message)
+
+
+def notification_event(notification):
+    """هدر اعلان جدید برای نمایش فوری در کلاینت"""
+    return {
+        'type': 'notification',
+        'item': {
+            'kind': 'notification',
+            'id': notification.pk,
+            'title': notification.title,
+            'created_at_jalali': notification.shamsi_created_at,
+        },
+    }
+
+
+def announcement_event(announcement):
+    return {
+        'type': 'announcement',
+        'item': {
+            'kind': 'announcement',
+            'id': announcement.pk,
+            'title': announcement.title,
+            'created_at_jalali': announcement.shamsi_created_at,
+        },
+    }
+
+
+# ====== Hooks ====== #
+def on_notifications_created(notifications):
+    """
+    بعد از commit ساخت اعلان‌ها: افزایش شمارنده‌ی خوانده نشده‌ها و
+    ارسال رویداد به کاربر. برای مسیر bulk_create (که سیگنال ندارد) هم
+    باید مستقیماً صدا زده شود.
+    """
+    increment_unread_notifications([notification.recipient_id for notification in notifications])
+    for notification in notifications:
+        publish_to_user(notification.recipient_id, notification_event(notification))
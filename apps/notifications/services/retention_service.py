@@ -0,0 +1,115 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.notifications.models import Notification, NotificationArchive
+
+logger = logging.getLogger(__name__)
+
+# ====== Retention Settings ====== #
+ARCHIVE_BATCH_SIZE = 1000
+
+
+def retention_cutoff(days=None):
+    """اعلان‌های خوانده شده‌ی قدیمی‌تر از این زمان بایگانی می‌شوند"""
+    days = days if days is not None else settings.NOTIFICATIONS_RETENTION_DAYS
+    return timezone.now() - timedelta(days=days)
+
+
+def archivable_notifications(days=None):
+    return Notification.objects.filter(is_read=True, created_at__lt=retention_cutoff(days))
+
+
+# ====== Archival ====== #
+def archive_read_notifications(days=None, batch_size=ARCHIVE_BATCH_SIZE, max_batches=None):
+    """
+    انتقال اعلان‌های خوانده شده‌ی قدیمی به NotificationArchive به صورت بسته‌ای.
+    هر بسته در یک تراکنش کپی و حذف می‌شود، پس قطع شدن کار وسط راه
+    داده‌ای را گم یا تکراری نمی‌کند (original_id یکتا است).
+    خروجی: تعداد اعلان‌های بایگانی شده.
+    """
+    cutoff = retention_cutoff(days)
+    archived = 0
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            rows = list(
+                Notification.objects.filter(is_read=True, created_at__lt=cutoff)
+                .order_by('pk')
+                .values('pk', 'recipient_id', 'title', 'message', 'content_type_id', 'object_id', 'created_at')[:batch_size]
+            )
+            if not rows:
+                break
+
+            NotificationArchive.objects.bulk_create(
+                [
+                    NotificationArchive(
+                        original_id=row['pk'],
+                        recipient_id=row['recipient_id'],
+                        title=row['title'],
+                        message=row['message'],
+                        content_type_id=row['content_type_id'],
+                        object_id=row['object_id'],
+                        created_at=row['created_at'],
+                    )
+                    for row in rows
+                ],
+                ignore_conflicts=True,
+            )
+            Notification.objects.filter(pk__in=[row['pk'] for row in rows]).delete()
+
+        archived += len(rows)
+        batches += 1
+
+    if archived:
+        logger.info(f"Archived {archived} read notifications older than {cutoff:%Y-%m-%d}")
+    return archived
+
+
+# ====== Table Report / Compaction ====== #
+def table_report(days=None):
+    """آمار جدول اعلان‌ها و بایگانی به همراه حجم روی دیسک (در صورت پشتیبانی دیتابیس)"""
+    report = {
+        'notifications': Notification.objects.count(),
+        'unread': Notification.objects.filter(is_read=False).count(),
+        'archivable': archivable_notifications(days).count(),
+        'archived': NotificationArchive.objects.count(),
+    }
+    report.update(_table_storage(Notification._meta.db_table))
+    return report
+
+
+def _table_storage(table):
+    """حجم داده، ایندکس و فضای آزاد (bloat) جدول در MySQL؛ در بقیه‌ی دیتابیس‌ها خالی"""
+    if connection.vendor != 'mysql':
+        return {}
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT data_length, index_length, data_free FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = %s",
+            [table],
+        )
+        row = cursor.fetchone()
+    if row is None:
+        return {}
+    return {'data_bytes': row[0], 'index_bytes': row[1], 'free_bytes': row[2]}
+
+
+def compact_table():
+    """بازپس‌گیری فضای آزاد شده بعد از بایگانی (OPTIMIZE در MySQL و VACUUM در SQLite)"""
+    table = connection.ops.quote_name(Notification._meta.db_table)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'mysql':
+            cursor.execute(f"OPTIMIZE TABLE {table}")
+        elif connection.vendor == 'sqlite':
+            cursor.execute("VACUUM")
+        elif connection.vendor == 'postgresql':
+            cursor.execute(f"VACUUM ANALYZE {table}")
+        else:
+            return False
+    return True
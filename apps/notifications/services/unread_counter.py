@@ -0,0 +1,93 @@
+from django.core.cache import cache
+
+from apps.notifications.models import Notification, Announcement
+
+# ====== Unread Counter Settings ====== #
+UNREAD_CACHE_PREFIX = 'notifications:unread'
+UNREAD_CACHE_TIMEOUT = 24 * 60 * 60
+# با هر انتشار/حذف پیام گروهی عوض می‌شود و شمارنده‌ی گروهی همه‌ی کاربران را باطل می‌کند
+ANNOUNCEMENTS_VERSION_KEY = f'{UNREAD_CACHE_PREFIX}:announcements_version'
+
+
+def _direct_key(user_id):
+    return f'{UNREAD_CACHE_PREFIX}:direct:{user_id}'
+
+
+def _announcements_key(user_id, version):
+    return f'{UNREAD_CACHE_PREFIX}:announcements:{user_id}:{version}'
+
+
+def _announcements_version():
+    version = cache.get(ANNOUNCEMENTS_VERSION_KEY)
+    if version is None:
+        cache.add(ANNOUNCEMENTS_VERSION_KEY, 1, None)
+        version = cache.get(ANNOUNCEMENTS_VERSION_KEY, 1)
+    return version
+
+
+# ====== Unread Count ====== #
+def get_unread_count(user):
+    """
+    تعداد اعلان‌های خوانده نشده (مستقیم + گروهی) از کش.
+    شمارنده‌ی اعلان‌های مستقیم با ایجاد/خواندن اعلان کم و زیاد می‌شود و
+    شمارنده‌ی پیام‌های گروهی با تغییر نسخه‌ی پیام‌ها دوباره محاسبه می‌شود؛
+    پس در حالت عادی این تابع فقط از کش می‌خواند.
+    """
+    direct_key = _direct_key(user.pk)
+    announcements_key = _announcements_key(user.pk, _announcements_version())
+    cached = cache.get_many([direct_key, announcements_key])
+
+    direct = cached.get(direct_key)
+    if direct is None or direct < 0:
+        direct = Notification.objects.filter(recipient=user, is_read=False).count()
+        cache.set(direct_key, direct, UNREAD_CACHE_TIMEOUT)
+
+    announcements = cached.get(announcements_key)
+    if announcements is None or announcements < 0:
+        announcements = Announcement.objects.for_user(user).exclude(reads__user=user).count()
+        cache.set(announcements_key, announcements, UNREAD_CACHE_TIMEOUT)
+
+    return direct + announcements
+
+
+# ====== Counter Updates ====== #
+def _change(key, delta):
+    """تغییر شمارنده فقط در صورت وجود در کش؛ در غیر این صورت دفعه‌ی بعد محاسبه می‌شود"""
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        pass
+
+
+def increment_unread_notifications(user_ids, delta=1):
+    for user_id in user_ids:
+        _change(_direct_key(user_id), delta)
+
+
+def decrement_unread_notifications(user_id, delta=1):
+    _change(_direct_key(user_id), -delta)
+
+
+def decrement_unread_announcements(user_id, delta=1):
+    _change(_announcements_key(user_id, _announcements_version()), -delta)
+
+
+def reset_unread_count(user_id):
+    """بعد از «خواندن همه» هر دو شمارنده صفر می‌شوند"""
+    cache.set_many({
+        _direct_key(user_id): 0,
+        _announcements_key(user_id, _announcements_version()): 0,
+    }, UNREAD_CACHE_TIMEOUT)
+
+
+def invalidate_unread_notifications(user_id):
+    cache.delete(_direct_key(user_id))
+
+
+def invalidate_unread_announcements():
+    """باطل کردن شمارنده‌ی پیام‌های گروهی همه‌ی کاربران با یک عملیات"""
+    _announcements_version()
+    try:
+        cache.incr(ANNOUNCEMENTS_VERSION_KEY)
+    except ValueError:
+        cache.set(ANNOUNCEMENTS_VERSION_KEY, 1, None)
@@ -0,0 +1,40 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.notifications.models import Notification, Announcement
+from apps.notifications.services import (
+    invalidate_unread_notifications,
+    invalidate_unread_announcements,
+    on_notifications_created,
+    publish_to_role,
+    announcement_event,
+)
+
+
+# ====== Unread Counter Updates ====== #
+@receiver(post_save, sender=Notification)
+def increment_on_notification_created(sender, instance, created, **kwargs):
+    """اعلان جدید خوانده نشده، شمارنده‌ی گیرنده را زیاد و رویداد لحظه‌ای ارسال می‌کند"""
+    if created and not instance.is_read:
+        transaction.on_commit(lambda: on_notifications_created([instance]))
+
+
+@receiver(post_delete, sender=Notification)
+def invalidate_on_notification_deleted(sender, instance, **kwargs):
+    recipient_id = instance.recipient_id
+    transaction.on_commit(lambda: invalidate_unread_notifications(recipient_id))
+
+
+@receiver(post_save, sender=Announcement)
+@receiver(post_delete, sender=Announcement)
+def invalidate_on_announcement_change(sender, **kwargs):
+    """انتشار یا حذف پیام گروهی شمارنده‌ی گروهی همه‌ی کاربران را باطل می‌کند"""
+    transaction.on_commit(invalidate_unread_announcements)
+
+
+@receiver(post_save, sender=Announcement)
+def publish_on_announcement_sent(sender, instance, update_fields=None, **kwargs):
+    """با انتشار پیام گروهی، کاربران نقش هدف رویداد لحظه‌ای دریافت می‌کنند"""
+    if instance.is_sent and update_fields and 'is_sent' in update_fields:
+        transaction.on_commit(lambda: publish_to_role(instance.target_role, announcement_event(instance)))
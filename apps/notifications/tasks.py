@@ -0,0 +1,237 @@
+# apps/notifications/tasks.py
+
+import logging
+import time
+from datetime import timedelta
+
+from celery import shared_task
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+logger = logging.getLogger(__name__)
+
+# ====== Delivery Settings ====== #
+# تعداد گیرندگان هر بسته؛ هر بسته یک درخواست پیامک و یک اتصال ایمیل است
+ANNOUNCEMENT_CHUNK_SIZE = 500
+# بعد از این مدت بسته‌ی تازه‌ای شروع نمی‌شود و تسک خودش را دوباره در صف می‌گذارد؛
+# با فاصله از soft_time_limit تا آخرین بسته (ایمیل‌ها تک به تک) تمام شود
+ANNOUNCEMENT_RUN_SECONDS = 150
+ANNOUNCEMENT_LOCK_SECONDS = 5 * 60
+# ارسال‌هایی که این مدت پیشرفتی نداشته‌اند، متوقف شده فرض می‌شوند
+ANNOUNCEMENT_STALL_SECONDS = 10 * 60
+
+
+def _delivery_lock_key(announcement_id):
+    return f'notifications:announcement_delivery:{announcement_id}'
+
+
+# ====== Channel Senders ====== #
+def _send_sms_chunk(announcement, mobiles):
+    from apps.accounts.services import AmootSMSService
+
+    text = f"{announcement.title}\n{strip_tags(announcement.message)}"
+    if mobiles and not AmootSMSService().send_bulk_message(mobiles, text):
+        raise RuntimeError(f"SMS chunk failed for announcement {announcement.pk}")
+
+
+def _send_email_chunk(announcement, recipients):
+    """
+    ارسال ایمیل‌های یک بسته با یک اتصال SMTP، تک به تک.
+    recipients: لیست (profile_id, email)؛ بعد از هر ارسال profile_id برگردانده (yield) می‌شود
+    تا پیشرفت با خطای وسط بسته از دست نرود.
+    """
+    body = strip_tags(announcement.message)
+    with get_connection() as connection:
+        for profile_id, email in recipients:
+            if email:
+                connection.send_messages([
+                    EmailMessage(announcement.title, body, settings.DEFAULT_FROM_EMAIL, [email])
+                ])
+            yield profile_id
+
+
+# ====== Announcement Delivery ====== #
+@shared_task(
+    bind=True,
+    max_retries=5,
+    default_retry_delay=60,
+    time_limit=300,
+    soft_time_limit=240
+)
+def deliver_announcement(self, announcement_id):
+    """
+    ارسال پیام گروهی از طریق پیامک/ایمیل به صورت بسته‌ای.
+
+    گیرندگان بر اساس بازه‌ی کلید اصلی صفحه‌بندی می‌شوند و پیشرفت هر کانال
+    (last_sms_recipient_id و last_email_recipient_id) بلافاصله بعد از ارسال
+    همان کانال ذخیره می‌شود؛ پس خطای ایمیل پیامک‌های فرستاده شده را دوباره
+    نمی‌فرستد و اجرای دوباره از آخرین گیرنده‌ی هر کانال ادامه پیدا می‌کند.
+    هر اجرا حداکثر ANNOUNCEMENT_RUN_SECONDS کار می‌کند و بعد (یا با رسیدن به
+    soft time limit) خودش را دوباره در صف می‌گذارد، بدون مصرف retry.
+    """
+    from apps.notifications.models import Announcement
+
+    if not cache.add(_delivery_lock_key(announcement_id), True, ANNOUNCEMENT_LOCK_SECONDS):
+        logger.info(f"Announcement {announcement_id} is already being delivered")
+        return "Locked"
+
+    try:
+        try:
+            announcement = Announcement.objects.get(pk=announcement_id)
+        except Announcement.DoesNotExist:
+            return "Not found"
+
+        if announcement.delivery_status == Announcement.DELIVERY_COMPLETED:
+            return "Already delivered"
+
+        Announcement.objects.filter(pk=announcement.pk).update(
+            delivery_status=Announcement.DELIVERY_IN_PROGRESS,
+            delivery_updated_at=timezone.now(),
+        )
+
+        if _deliver_chunks(announcement, time.monotonic() + ANNOUNCEMENT_RUN_SECONDS):
+            Announcement.objects.filter(pk=announcement.pk).update(
+                delivery_status=Announcement.DELIVERY_COMPLETED,
+                delivery_updated_at=timezone.now(),
+            )
+            logger.info(f"Announcement {announcement_id} delivered")
+            return "Completed"
+    except SoftTimeLimitExceeded:
+        # پیشرفت هر کانال ذخیره شده است؛ ادامه در اجرای تازه، نه retry
+        logger.warning(f"Announcement {announcement_id} hit the soft time limit, re-queuing")
+    except Exception as e:
+        logger.error(f"Announcement {announcement_id} delivery error: {e}", exc_info=True)
+        if self.request.retries >= self.max_retries:
+            Announcement.objects.filter(pk=announcement_id).update(
+                delivery_status=Announcement.DELIVERY_FAILED,
+                delivery_updated_at=timezone.now(),
+            )
+            return "Failed"
+        raise self.retry(exc=e)
+    finally:
+        cache.delete(_delivery_lock_key(announcement_id))
+
+    # هنوز گیرنده باقی مانده؛ ادامه در اجرای بعدی
+    deliver_announcement.delay(announcement_id)
+    return "Continued"
+
+
+def _deliver_chunks(announcement, deadline):
+    """
+    ارسال بسته‌ها تا تمام شدن گیرندگان یا رسیدن به deadline.
+    خروجی: True اگر گیرنده‌ای باقی نمانده باشد.
+    """
+    from apps.notifications.models import Announcement
+
+    recipients = announcement.get_recipients().order_by('pk')
+    cursors = {}
+    if announcement.send_sms:
+        cursors['last_sms_recipient_id'] = announcement.last_sms_recipient_id
+    if announcement.send_email:
+        cursors['last_email_recipient_id'] = announcement.last_email_recipient_id
+    delivered = announcement.last_recipient_id
+    if not cursors:
+        return True
+
+    def save_progress():
+        nonlocal delivered
+        done = min(cursors.values())
+        newly_delivered = recipients.filter(pk__gt=delivered, pk__lte=done).count() if done > delivered else 0
+        Announcement.objects.filter(pk=announcement.pk).update(
+            **cursors,
+            last_recipient_id=done,
+            delivered_count=F('delivered_count') + newly_delivered,
+            delivery_updated_at=timezone.now(),
+        )
+        delivered = done
+
+    while time.monotonic() < deadline:
+        chunk = list(
+            recipients.filter(pk__gt=min(cursors.values())).values_list(
+                'pk', 'user__phone_number', 'user__email'
+            )[:ANNOUNCEMENT_CHUNK_SIZE]
+        )
+        if not chunk:
+            return True
+
+        last_id = chunk[-1][0]
+        if 'last_sms_recipient_id' in cursors and cursors['last_sms_recipient_id'] < last_id:
+            sms_cursor = cursors['last_sms_recipient_id']
+            _send_sms_chunk(announcement, [phone for pk, phone, _ in chunk if pk > sms_cursor and phone])
+            cursors['last_sms_recipient_id'] = last_id
+            save_progress()
+
+        if 'last_email_recipient_id' in cursors:
+            email_cursor = cursors['last_email_recipient_id']
+            try:
+                for profile_id in _send_email_chunk(
+                    announcement, [(pk, email) for pk, _, email in chunk if pk > email_cursor]
+                ):
+                    cursors['last_email_recipient_id'] = profile_id
+                    if time.monotonic() >= deadline:
+                        break
+            finally:
+                save_progress()
+
+    return False
+
+
+@shared_task(ignore_result=True)
+def resume_stalled_announcement_deliveries():
+    """
+    ادامه‌ی ارسال پیام‌هایی که تسکشان (مثلاً با خاموش شدن worker) متوقف شده است.
+    """
+    from apps.notifications.models import Announcement
+
+    stalled_before = timezone.now() - timedelta(seconds=ANNOUNCEMENT_STALL_SECONDS)
+    stalled_ids = Announcement.objects.filter(
+        is_sent=True,
+        delivery_status__in=[Announcement.DELIVERY_PENDING, Announcement.DELIVERY_IN_PROGRESS],
+        delivery_updated_at__lt=stalled_before,
+    ).values_list('pk', flat=True)
+
+    for announcement_id in stalled_ids:
+        logger.warning(f"Resuming stalled delivery of announcement {announcement_id}")
+        deliver_announcement.delay(announcement_id)
+
+
+# ====== Retention ====== #
+# سقف بسته‌ها در هر اجرا؛ باقی‌مانده در اجرای بعدی بایگانی می‌شود
+ARCHIVE_MAX_BATCHES_PER_RUN = 200
+
+
+@shared_task(ignore_result=True, time_limit=30 * 60, soft_time_limit=25 * 60)
+def archive_read_notifications():
+    """بایگانی روزانه‌ی اعلان‌های خوانده شده‌ی قدیمی"""
+    from apps.notifications.services.retention_service import archive_read_notifications as archive
+
+    archived = archive(max_batches=ARCHIVE_MAX_BATCHES_PER_RUN)
+    return f"Archived: {archived}"
+
+
+# ====== Outbox ====== #
+# رویدادهایی که این مدت در صف مانده‌اند توسط تسک دوره‌ای پردازش می‌شوند
+OUTBOX_SWEEP_DELAY_SECONDS = 60
+
+
+@shared_task(ignore_result=True, max_retries=0, time_limit=120, soft_time_limit=100)
+def process_outbox_event(event_id):
+    """ساخت اعلان‌های یک رویداد outbox"""
+    from apps.notifications.services.outbox_service import process_event
+
+    process_event(event_id)
+
+
+@shared_task(ignore_result=True, time_limit=10 * 60, soft_time_limit=9 * 60)
+def process_pending_outbox_events():
+    """پردازش رویدادهایی که زمان‌بندی‌شان ناموفق بوده یا خطا داشته‌اند"""
+    from apps.notifications.services.outbox_service import pending_event_ids, process_event
+
+    older_than = timezone.now() - timedelta(seconds=OUTBOX_SWEEP_DELAY_SECONDS)
+    for event_id in pending_event_ids(older_than):
+        process_event(event_id)
@@ -1,3 +1,56 @@
-from django.test import TestCase
+import asyncio
+import json
+from unittest.mock import patch
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from apps.api.v1.notifications.views import stream_views
+from apps.notifications.services.realtime_service import InMemoryBroker, user_channels
+
+
+class InMemoryBrokerTests(SimpleTestCase):
+
+    def test_published_message_reaches_only_subscribed_channels(self):
+        broker = InMemoryBroker()
+
+        async def run():
+            async with broker.subscribe(['a']) as subscription:
+                broker.publish('b', {'type': 'other'})
+                broker.publish('a', {'type': 'read'})
+                first = await subscription.get(timeout=1)
+                second = await subscription.get(timeout=0.05)
+            return first, second
+
+        self.assertEqual(asyncio.run(run()), ({'type': 'read'}, None))
+
+    def test_admin_does_not_listen_to_announcement_channels(self):
+        self.assertEqual(len(user_channels(1, 'admin')), 1)
+        self.assertEqual(len(user_channels(1, 'premium')), 3)
+
+
+class NotificationStreamTests(SimpleTestCase):
+
+    def test_stream_pushes_unread_count_and_item_on_event(self):
+        broker = InMemoryBroker()
+        item = {'kind': 'notification', 'id': 7, 'title': 'test'}
+
+        async def run():
+            stream = stream_views._event_stream(user=None, channels=['user'])
+            chunks = [await anext(stream), await anext(stream)]
+
+            pending = asyncio.ensure_future(anext(stream))
+            # صبر تا استریم در کانال مشترک شود
+            for _ in range(5):
+                await asyncio.sleep(0)
+            broker.publish('user', {'type': 'notification', 'item': item})
+            chunks.append(await pending)
+            await stream.aclose()
+            return chunks
+
+        with patch.object(stream_views, 'get_broker', return_value=broker), \
+                patch.object(stream_views, 'get_unread_count', side_effect=[2, 3]):
+            retry, initial, pushed = asyncio.run(run())
+
+        self.assertTrue(retry.startswith('retry:'))
+        self.assertEqual(json.loads(initial.split('data: ')[1]), {'unread_count': 2})
+        self.assertEqual(json.loads(pushed.split('data: ')[1]), {'unread_count': 3, 'item': item})
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from apps.ordering.services import find_duplicate_conditions, merge_duplicate_conditions
+
+
+class Command(BaseCommand):
+    """
+    ادغام شرط‌های تکراری (متن یکسان بعد از یکسان‌سازی فاصله‌ها، ی/ک عربی و اعداد).
+    اتصال آیتم‌ها به شرط‌های تکراری به قدیمی‌ترین شرط هر گروه منتقل می‌شود.
+
+    مثال:
+        python manage.py merge_conditions --dry-run
+        python manage.py merge_conditions
+    """
+    help = 'Merges duplicate conditions and repoints their item links.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report duplicate groups.')
+
+    def handle(self, *args, **options):
+        duplicates = find_duplicate_conditions()
+        for keeper, dups in duplicates.items():
+            self.stdout.write(f'Condition {keeper} ← {", ".join(map(str, dups))}')
+
+        if options['dry_run']:
+            total = sum(len(dups) for dups in duplicates.values())
+            self.stdout.write(self.style.WARNING(f'{total} شرط تکراری پیدا شد.'))
+            return
+
+        merged = merge_duplicate_conditions()
+        self.stdout.write(self.style.SUCCESS(f'{merged} شرط تکراری ادغام شد.'))
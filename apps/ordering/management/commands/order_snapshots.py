@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+
+from apps.ordering.models import Order
+from apps.ordering.services import (
+    find_inconsistent_snapshots,
+    rebuild_sections_snapshot,
+    rebuild_stale_snapshots,
+)
+
+
+class Command(BaseCommand):
+    """
+    ساخت دوباره و بررسی سازگاری snapshot سکشن‌های اوردرها.
+
+    مثال:
+        python manage.py order_snapshots              # ساخت snapshotهای کهنه
+        python manage.py order_snapshots --all        # ساخت دوباره‌ی همه
+        python manage.py order_snapshots --check      # گزارش snapshotهای ناسازگار
+        python manage.py order_snapshots --check --fix
+    """
+    help = 'Rebuilds and verifies the precompiled sections snapshot of orders.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--order', type=int, action='append', dest='orders', help='Limit to this order id (repeatable).')
+        parser.add_argument('--all', action='store_true', help='Rebuild every snapshot, not only stale ones.')
+        parser.add_argument('--check', action='store_true', help='Compare stored snapshots with a fresh build.')
+        parser.add_argument('--fix', action='store_true', help='With --check, rebuild inconsistent snapshots.')
+
+    def handle(self, *args, **options):
+        order_ids = options['orders']
+
+        if options['check']:
+            self._check(order_ids, options['fix'])
+            return
+
+        if options['all']:
+            ids = order_ids or list(Order.objects.values_list('pk', flat=True))
+            for order_id in ids:
+                rebuild_sections_snapshot(order_id)
+            rebuilt = len(ids)
+        else:
+            rebuilt = rebuild_stale_snapshots(order_ids)
+
+        self.stdout.write(self.style.SUCCESS(f'{rebuilt} snapshot ساخته شد.'))
+
+    def _check(self, order_ids, fix):
+        problems = find_inconsistent_snapshots(order_ids)
+        if not problems:
+            self.stdout.write(self.style.SUCCESS('همه‌ی snapshotها سازگار هستند.'))
+            return
+
+        for order_id, reason in problems:
+            self.stdout.write(self.style.WARNING(f'Order {order_id}: {reason}'))
+
+        if fix:
+            for order_id, _ in problems:
+                rebuild_sections_snapshot(order_id)
+            self.stdout.write(self.style.SUCCESS(f'{len(problems)} snapshot ساخته شد.'))
+        else:
+            self.stdout.write(self.style.ERROR(f'{len(problems)} snapshot ناسازگار است.'))
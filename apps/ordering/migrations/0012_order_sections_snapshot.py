@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ordering', '0011_alter_ordersection_notes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='sections_snapshot',
+            field=models.JSONField(blank=True, editable=False, null=True, verbose_name='snapshot سکشن\u200cها'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='sections_snapshot_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='hash snapshot سکشن\u200cها'),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:20
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+from apps.ordering.models.section import condition_text_hash
+
+
+def merge_and_fill_text_hashes(apps, schema_editor):
+    """
+    hash شرط‌های موجود. شرط‌های تکراری همین‌جا در قدیمی‌ترین شرط هر گروه ادغام
+    می‌شوند (همان کار merge_duplicate_conditions با مدل‌های تاریخی) تا هیچ شرطی
+    بدون hash نماند و ذخیره‌ی آن روی hash یکتا خطا ندهد. snapshot اوردرهای درگیر
+    کهنه علامت می‌خورد و در اولین درخواست ساخته می‌شود.
+    """
+    Condition = apps.get_model('ordering', 'Condition')
+    Order = apps.get_model('ordering', 'Order')
+
+    keeper_by_hash, keeper_of = {}, {}
+    for pk, text in Condition.objects.order_by('pk').values_list('pk', 'text'):
+        digest = condition_text_hash(text)
+        if digest in keeper_by_hash:
+            keeper_of[pk] = keeper_by_hash[digest]
+        else:
+            keeper_by_hash[digest] = pk
+
+    if keeper_of:
+        affected_orders = set()
+        for model_name in ('SectionItem', 'DrugSectionItem'):
+            model = apps.get_model('ordering', model_name)
+            through = model.conditions.through
+            item_column = f'{model.conditions.field.m2m_field_name()}_id'
+
+            affected_orders.update(
+                model.objects.filter(conditions__in=list(keeper_of)).values_list('section__order_id', flat=True)
+            )
+            linked = set(
+                through.objects.filter(condition_id__in=set(keeper_of.values())).values_list(item_column, 'condition_id')
+            )
+            to_delete, to_repoint = [], defaultdict(list)
+            for pk, item_id, condition_id in through.objects.filter(
+                condition_id__in=list(keeper_of)
+            ).order_by('pk').values_list('pk', item_column, 'condition_id'):
+                link = (item_id, keeper_of[condition_id])
+                if link in linked:
+                    to_delete.append(pk)
+                else:
+                    linked.add(link)
+                    to_repoint[link[1]].append(pk)
+
+            through.objects.filter(pk__in=to_delete).delete()
+            for keeper, pks in to_repoint.items():
+                through.objects.filter(pk__in=pks).update(condition_id=keeper)
+
+        Condition.objects.filter(pk__in=list(keeper_of)).delete()
+        Order.objects.filter(pk__in=affected_orders).update(sections_snapshot=None, sections_snapshot_hash='')
+
+    for digest, pk in keeper_by_hash.items():
+        Condition.objects.filter(pk=pk).update(text_hash=digest)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ordering', '0012_order_sections_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='condition',
+            name='text_hash',
+            field=models.CharField(editable=False, max_length=64, null=True, unique=True, verbose_name='hash متن شرط'),
+        ),
+        migrations.RunPython(merge_and_fill_text_hashes, migrations.RunPython.noop),
+    ]
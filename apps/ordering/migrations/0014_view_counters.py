@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ordering', '0013_condition_text_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='popularity',
+            field=models.FloatField(db_index=True, default=0, editable=False, verbose_name='امتیاز محبوبیت'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='unique_view_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='بازدیدکنندگان یکتا'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='تعداد بازدید'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ordering', '0014_view_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='sections_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='نسخه\u200cی درخت سکشن\u200cها'),
+        ),
+    ]
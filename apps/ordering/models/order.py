@@ -135,6 +135,35 @@ class Order(models.Model):
         help_text="رنگ نمایشی این Order در رابط کاربری",
     )
 
+    # ─────────────────────────── snapshot سکشن‌ها ─────────────────────────
+    # خروجی نهایی اندپوینت sections (شماره‌گذاری و all_conditions) که بعد از
+    # هر تغییر درخت سکشن‌ها دوباره ساخته می‌شود؛ hash خالی یعنی snapshot کهنه است
+    sections_snapshot = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="snapshot سکشن‌ها",
+    )
+    sections_snapshot_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        verbose_name="hash snapshot سکشن‌ها",
+    )
+    # با هر کهنه شدن یک واحد زیاد می‌شود تا ساختی که از درخت قدیمی شروع شده
+    # نتواند snapshot را روی تغییر جدیدتر بنویسد
+    sections_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="نسخه‌ی درخت سکشن‌ها",
+    )
+
+    # ─────────────────────────── بازدیدها ────────────────────────────────
+    # از شمارنده‌های Redis به صورت دوره‌ای و یکجا به‌روز می‌شوند
+    view_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="تعداد بازدید")
+    unique_view_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="بازدیدکنندگان یکتا")
+    popularity = models.FloatField(default=0, editable=False, db_index=True, verbose_name="امتیاز محبوبیت")
+
     # ─────────────────────────── زمان‌بندی ───────────────────────────────
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="زمان ساخت")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="زمان بروزرسانی")
@@ -1,8 +1,13 @@
+import hashlib
+
 import jdatetime
 from django_ckeditor_5.fields import CKEditor5Field
 
+from django.core.exceptions import ValidationError
 from django.db import models
 
+from core.text import normalize_persian_text
+
 from .order import Order
 from .colors import TailwindColor
 
@@ -147,14 +152,34 @@ class ItemRelationshipGroup(models.Model):
 
 # ─────────────────────────────────────────────────────────────────────────────
 
+def normalize_condition_text(text):
+    """
+    شکل استاندارد متن شرط برای تشخیص تکراری‌ها؛ متن‌هایی که فقط در فاصله‌ها،
+    نیم‌فاصله، ی/ک عربی یا اعداد فارسی تفاوت دارند یک شرط هستند.
+    """
+    return normalize_persian_text(text)
+
+
+def condition_text_hash(text):
+    return hashlib.sha256(normalize_condition_text(text).encode('utf-8')).hexdigest()
+
+
 class Condition(models.Model):
     """
     شرط‌های مشترک که می‌توانند روی چندین آیتم اعمال شوند.
+    text_hash (sha256 متن استاندارد شده) یکتا است و جستجوی شرط با آن انجام می‌شود.
     """
     text = models.TextField(
         verbose_name="متن شرط",
         help_text='مثال: "if SBP≥90, PR≥60"، "در صورت تهوع"'
     )
+    text_hash = models.CharField(
+        max_length=64,
+        unique=True,
+        null=True,
+        editable=False,
+        verbose_name="hash متن شرط",
+    )
     order_index = models.PositiveIntegerField(
         default=0,
         verbose_name="ترتیب نمایش"
@@ -169,6 +194,20 @@ class Condition(models.Model):
     def __str__(self):
         return f"شرط: {self.text[:80]}"
 
+    def clean(self):
+        duplicate = Condition.objects.filter(text_hash=condition_text_hash(self.text))
+        if self.pk:
+            duplicate = duplicate.exclude(pk=self.pk)
+        if duplicate.exists():
+            raise ValidationError({'text': 'شرطی با همین متن از قبل وجود دارد.'})
+
+    def save(self, *args, **kwargs):
+        self.text_hash = condition_text_hash(self.text)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'text_hash'}
+        super().save(*args, **kwargs)
+
 
 class SectionItem(models.Model):
     section = models.ForeignKey(
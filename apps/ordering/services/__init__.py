@@ -0,0 +1,18 @@
+from .sections_snapshot import (
+    sections_tree_queryset,
+    get_sections_snapshot,
+    rebuild_sections_snapshot,
+    rebuild_stale_snapshots,
+    invalidate_sections_snapshots,
+    find_inconsistent_snapshots,
+    sections_invalidated,
+)
+from .node_tree import (
+    build_node_tree,
+    children_by_parent,
+    dynamic_field_tree_prefetch,
+    emergency_tree_prefetch,
+)
+from .order_copy import copy_order
+from .order_editor import sync_relationship_groups, sync_item_conditions
+from .conditions import resolve_condition_ids, find_duplicate_conditions, merge_duplicate_conditions
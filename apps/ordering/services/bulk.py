@@ -0,0 +1,21 @@
+from django.db import connection
+
+BULK_BATCH_SIZE = 500
+
+
+def bulk_create_with_pks(model, objs, **scope):
+    """
+    bulk_create به همراه مقداردهی pk اشیاء.
+    دیتابیس‌هایی مثل MySQL شناسه‌ی ردیف‌های bulk_create را برنمی‌گردانند؛
+    scope باید دقیقاً ردیف‌های تازه درج شده را برگرداند (مثلاً ردیف‌های زیر
+    والدی که همین حالا ساخته شده) تا با ترتیب pk، ترتیب درج به دست بیاید.
+    """
+    if not objs:
+        return objs
+
+    model.objects.bulk_create(objs, batch_size=BULK_BATCH_SIZE)
+    if not connection.features.can_return_rows_from_bulk_insert:
+        new_pks = list(model.objects.filter(**scope).order_by('pk').values_list('pk', flat=True))
+        for obj, pk in zip(objs, new_pks):
+            obj.pk = pk
+    return objs
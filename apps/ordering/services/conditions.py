@@ -0,0 +1,105 @@
+from collections import defaultdict
+
+from django.db import transaction
+
+from apps.ordering.models import Condition, DrugSectionItem, SectionItem
+from apps.ordering.models.section import condition_text_hash, normalize_condition_text
+from .bulk import BULK_BATCH_SIZE
+from .sections_snapshot import invalidate_sections_snapshots, order_ids_for_conditions
+
+
+# ====== Bulk Resolution ====== #
+def resolve_condition_ids(texts):
+    """
+    نگاشت متن شرط‌ها به شناسه با یک کوئری روی text_hash؛ شرط‌های جدید
+    یکجا درج می‌شوند. متن‌هایی که فقط در فاصله یا ی/ک عربی تفاوت دارند
+    به یک شرط نگاشت می‌شوند.
+    خروجی: dict متن ← شناسه‌ی شرط
+    """
+    hashes = {text: condition_text_hash(text) for text in set(texts) if normalize_condition_text(text)}
+    if not hashes:
+        return {}
+
+    ids_by_hash = dict(
+        Condition.objects.filter(text_hash__in=set(hashes.values())).values_list('text_hash', 'pk')
+    )
+
+    missing = {}
+    for text, digest in hashes.items():
+        if digest not in ids_by_hash:
+            missing.setdefault(digest, text.strip())
+
+    if missing:
+        # ignore_conflicts: اگر درخواست همزمانی همین شرط را ساخته باشد خطا نمی‌دهد
+        Condition.objects.bulk_create(
+            [Condition(text=text, text_hash=digest) for digest, text in missing.items()],
+            batch_size=BULK_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        ids_by_hash.update(
+            Condition.objects.filter(text_hash__in=missing.keys()).values_list('text_hash', 'pk')
+        )
+
+    return {text: ids_by_hash[digest] for text, digest in hashes.items()}
+
+
+# ====== Duplicate Merge ====== #
+def find_duplicate_conditions():
+    """
+    گروه‌های شرط تکراری بر اساس متن استاندارد شده.
+    خروجی: dict شناسه‌ی شرط اصلی (قدیمی‌ترین) ← لیست شناسه‌های تکراری
+    """
+    keeper_by_hash = {}
+    duplicates = defaultdict(list)
+    for pk, text in Condition.objects.order_by('pk').values_list('pk', 'text'):
+        digest = condition_text_hash(text)
+        if digest in keeper_by_hash:
+            duplicates[keeper_by_hash[digest]].append(pk)
+        else:
+            keeper_by_hash[digest] = pk
+    return dict(duplicates)
+
+
+@transaction.atomic
+def merge_duplicate_conditions():
+    """
+    ادغام شرط‌های تکراری در قدیمی‌ترین شرط هر گروه: ردیف‌های جدول واسط
+    آیتم‌ها به شرط اصلی منتقل (یا اگر آیتم از قبل به آن وصل است حذف) می‌شوند
+    و سپس شرط‌های تکراری حذف و hash همه‌ی شرط‌ها کامل می‌شود.
+    خروجی: تعداد شرط‌های حذف شده
+    """
+    duplicates = find_duplicate_conditions()
+    keeper_of = {dup: keeper for keeper, dups in duplicates.items() for dup in dups}
+
+    if keeper_of:
+        affected_orders = order_ids_for_conditions(list(keeper_of))
+
+        for model in (SectionItem, DrugSectionItem):
+            through = model.conditions.through
+            item_column = f'{model.conditions.field.m2m_field_name()}_id'
+
+            linked = set(
+                through.objects.filter(condition_id__in=duplicates.keys()).values_list(item_column, 'condition_id')
+            )
+            to_delete, to_repoint = [], defaultdict(list)
+            for pk, item_id, condition_id in through.objects.filter(
+                condition_id__in=keeper_of.keys()
+            ).order_by('pk').values_list('pk', item_column, 'condition_id'):
+                link = (item_id, keeper_of[condition_id])
+                if link in linked:
+                    to_delete.append(pk)
+                else:
+                    linked.add(link)
+                    to_repoint[link[1]].append(pk)
+
+            through.objects.filter(pk__in=to_delete).delete()
+            for keeper, pks in to_repoint.items():
+                through.objects.filter(pk__in=pks).update(condition_id=keeper)
+
+        Condition.objects.filter(pk__in=keeper_of.keys()).delete()
+        invalidate_sections_snapshots(affected_orders)
+
+    for condition in Condition.objects.filter(text_hash__isnull=True).only('pk', 'text'):
+        Condition.objects.filter(pk=condition.pk).update(text_hash=condition_text_hash(condition.text))
+
+    return len(keeper_of)
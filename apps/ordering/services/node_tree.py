@@ -0,0 +1,64 @@
+from collections import defaultdict
+
+from django.db.models import Prefetch
+
+from apps.ordering.models import DynamicFieldGroup, DynamicFieldNode, EmergencyNode
+
+
+# ====== Loaders ====== #
+def dynamic_field_tree_prefetch():
+    """
+    Prefetch گروه‌های فیلد پویای Order به همراه تمام گره‌هایشان (همه‌ی سطوح)؛
+    مشترک بین API و ویرایشگر داشبورد. فقط دو کوئری: گروه‌ها و گره‌ها.
+    """
+    return Prefetch(
+        'dynamic_field_groups',
+        queryset=DynamicFieldGroup.objects.order_by('order_index', 'pk').prefetch_related(
+            Prefetch('nodes', queryset=DynamicFieldNode.objects.order_by('order_index', 'pk'))
+        ),
+    )
+
+
+def emergency_tree_prefetch(lookup='nodes'):
+    """Prefetch تمام گره‌های تعیین تکلیف (همه‌ی سطوح) با یک کوئری"""
+    return Prefetch(lookup, queryset=EmergencyNode.objects.order_by('order_index', 'pk'))
+
+
+def children_by_parent(nodes):
+    """
+    گروه‌بندی گره‌های یک درخت بر اساس والد، به ترتیب order_index.
+    خروجی: dict شناسه‌ی والد ← لیست فرزندان (کلید None: گره‌های ریشه)
+    """
+    children = defaultdict(list)
+    for node in sorted(nodes, key=lambda node: (node.order_index, node.pk)):
+        children[node.parent_id].append(node)
+    return children
+
+
+# ====== Serialization ====== #
+def build_node_tree(nodes, serialize_many):
+    """
+    ساخت درخت گره‌ها (EmergencyNode / DynamicFieldNode) در حافظه از یک لیست تخت.
+
+    همه‌ی گره‌های یک تعیین تکلیف/گروه با یک کوئری واکشی می‌شوند و این تابع
+    بدون بازگشت و بدون کوئری اضافه، فرزندان هر گره را به ترتیب order_index
+    زیر آن قرار می‌دهد؛ پس تعداد کوئری‌ها به عمق درخت بستگی ندارد.
+
+    serialize_many: تابعی که لیست گره‌ها را گرفته و لیست dictها را به همان ترتیب برمی‌گرداند.
+    خروجی: لیست گره‌های ریشه که هر کدام کلید children دارد.
+    """
+    nodes = sorted(nodes, key=lambda node: (node.order_index, node.pk))
+    rows = serialize_many(nodes)
+
+    rows_by_id = {}
+    for node, row in zip(nodes, rows):
+        row['children'] = []
+        rows_by_id[node.pk] = row
+
+    roots = []
+    for node, row in zip(nodes, rows):
+        if node.parent_id is None:
+            roots.append(row)
+        elif node.parent_id in rows_by_id:
+            rows_by_id[node.parent_id]['children'].append(row)
+    return roots
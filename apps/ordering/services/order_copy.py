@@ -0,0 +1,132 @@
+from django.db import transaction
+
+from apps.prescriptions.services import invalidate_drug_usage
+
+from apps.ordering.models import (
+    OrderSection, SectionItem, DrugSectionItem, ItemRelationshipGroup,
+    DynamicFieldGroup, DynamicFieldNode, EmergencyDisposition, EmergencyNode,
+)
+from .bulk import BULK_BATCH_SIZE, bulk_create_with_pks
+from .sections_snapshot import invalidate_sections_snapshots
+
+
+# ====== Helpers ====== #
+def _clone(obj, **overrides):
+    """نمونه‌ی جدید (ذخیره نشده) با مقادیر فیلدهای obj به جز کلید اصلی"""
+    values = {
+        field.attname: getattr(obj, field.attname)
+        for field in obj._meta.concrete_fields
+        if not field.primary_key
+    }
+    values.update(overrides)
+    return type(obj)(**values)
+
+
+def _copy_nodes(model, nodes, **parent_fk):
+    """کپی گره‌های درختی: درج یکجا بدون والد و سپس اتصال والدها با یک bulk_update"""
+    new_nodes = [_clone(node, parent_id=None, **parent_fk) for node in nodes]
+    bulk_create_with_pks(model, new_nodes, **parent_fk)
+
+    node_map = {node.pk: new_node for node, new_node in zip(nodes, new_nodes)}
+    relinked = []
+    for node, new_node in zip(nodes, new_nodes):
+        if node.parent_id in node_map:
+            new_node.parent_id = node_map[node.parent_id].pk
+            relinked.append(new_node)
+    model.objects.bulk_update(relinked, ['parent'], batch_size=BULK_BATCH_SIZE)
+
+
+# ====== Deep Copy ====== #
+@transaction.atomic
+def copy_order(order, name=None):
+    """
+    کپی کامل یک Order: سکشن‌ها، گروه‌های ارتباطی، آیتم‌ها و داروها (به همراه
+    شرط‌ها)، گروه‌ها و گره‌های فیلد پویا و تعیین تکلیف اورژانس.
+
+    کل گراف با چند کوئری خوانده می‌شود، شناسه‌ها در حافظه نگاشت می‌شوند و هر
+    سطح با bulk_create ذخیره می‌شود؛ تعداد کوئری‌ها به اندازه‌ی اوردر بستگی ندارد.
+    شرط‌ها بین اوردرها مشترک هستند و کپی نمی‌شوند، فقط اتصالشان کپی می‌شود.
+
+    خروجی: Order جدید. اگر نام جدید تکراری باشد ValidationError بالا می‌رود.
+    """
+    new_order = _clone(
+        order,
+        name=name or f"{order.name} (کپی)",
+        slug=None,
+        sections_snapshot=None,
+        sections_snapshot_hash='',
+        view_count=0,
+        unique_view_count=0,
+        popularity=0,
+    )
+    new_order.save()
+
+    # ── سکشن‌ها ──
+    sections = list(OrderSection.objects.filter(order=order).order_by('pk'))
+    new_sections = [_clone(section, order_id=new_order.pk) for section in sections]
+    bulk_create_with_pks(OrderSection, new_sections, order=new_order)
+    section_map = {section.pk: new.pk for section, new in zip(sections, new_sections)}
+
+    # ── گروه‌های ارتباطی ──
+    groups = list(ItemRelationshipGroup.objects.filter(section__order=order).order_by('pk'))
+    new_groups = [_clone(group, section_id=section_map[group.section_id]) for group in groups]
+    bulk_create_with_pks(ItemRelationshipGroup, new_groups, section__order=new_order)
+    group_map = {group.pk: new.pk for group, new in zip(groups, new_groups)}
+
+    # ── آیتم‌های متنی و دارویی به همراه شرط‌ها ──
+    for model in (SectionItem, DrugSectionItem):
+        items = list(model.objects.filter(section__order=order).order_by('pk'))
+        new_items = [
+            _clone(
+                item,
+                section_id=section_map[item.section_id],
+                relationship_group_id=group_map.get(item.relationship_group_id),
+            )
+            for item in items
+        ]
+        bulk_create_with_pks(model, new_items, section__order=new_order)
+        item_map = {item.pk: new.pk for item, new in zip(items, new_items)}
+
+        through = model.conditions.through
+        item_field = model.conditions.field.m2m_field_name()
+        links = through.objects.filter(**{f'{item_field}__section__order': order}).values_list(
+            f'{item_field}_id', 'condition_id'
+        )
+        through.objects.bulk_create(
+            [
+                through(**{f'{item_field}_id': item_map[item_id], 'condition_id': condition_id})
+                for item_id, condition_id in links
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+    # ── فیلدهای پویا ──
+    dynamic_groups = list(DynamicFieldGroup.objects.filter(order=order).order_by('pk'))
+    new_dynamic_groups = [_clone(group, order_id=new_order.pk) for group in dynamic_groups]
+    bulk_create_with_pks(DynamicFieldGroup, new_dynamic_groups, order=new_order)
+    nodes = list(DynamicFieldNode.objects.filter(group__order=order).order_by('pk'))
+    dynamic_group_map = {group.pk: new.pk for group, new in zip(dynamic_groups, new_dynamic_groups)}
+    for group_id, new_group_id in dynamic_group_map.items():
+        _copy_nodes(
+            DynamicFieldNode,
+            [node for node in nodes if node.group_id == group_id],
+            group_id=new_group_id,
+        )
+
+    # ── تعیین تکلیف اورژانس ──
+    disposition = EmergencyDisposition.objects.filter(order=order).first()
+    if disposition is not None:
+        new_disposition = _clone(disposition, order_id=new_order.pk)
+        new_disposition.save()
+        _copy_nodes(
+            EmergencyNode,
+            list(EmergencyNode.objects.filter(disposition=disposition).order_by('pk')),
+            disposition_id=new_disposition.pk,
+        )
+
+    # bulk_create سیگنال ندارد؛ snapshot سکشن‌ها و ایندکس داروها بعد از commit ساخته می‌شوند
+    invalidate_sections_snapshots([new_order.pk])
+    invalidate_drug_usage(
+        DrugSectionItem.objects.filter(section__order=new_order).values_list('drug_id', flat=True)
+    )
+    return new_order
@@ -0,0 +1,131 @@
+from collections import defaultdict
+
+from django.db.models import Max
+
+from apps.ordering.models import DrugSectionItem, ItemRelationshipGroup, SectionItem
+from .bulk import BULK_BATCH_SIZE, bulk_create_with_pks
+from .conditions import resolve_condition_ids
+
+ITEM_MODELS = (SectionItem, DrugSectionItem)
+
+
+def _item_key(item):
+    return (type(item), item.pk)
+
+
+# ====== Relationship Groups ====== #
+def sync_relationship_groups(section, groups):
+    """
+    اعمال گروه‌های ارتباطی ارسال شده از ویرایشگر روی یک سکشن با کمترین تغییر.
+
+    groups: لیست (order_index, operator, items) که items آیتم‌های ذخیره شده‌ی
+    متنی/دارویی هستند. گروه‌های فعلی تا جای ممکن دوباره استفاده می‌شوند (اول
+    گروه با همان اعضا، بعد گروه‌های بی‌استفاده)، فقط گروه‌ها و آیتم‌هایی که
+    واقعاً تغییر کرده‌اند به‌روزرسانی می‌شوند و گروه‌های اضافه حذف می‌شوند.
+    """
+    existing = list(ItemRelationshipGroup.objects.filter(section=section).order_by('order_index', 'pk'))
+
+    current_group = {}
+    for model in ITEM_MODELS:
+        for pk, group_id in model.objects.filter(section=section).values_list('pk', 'relationship_group_id'):
+            current_group[(model, pk)] = group_id
+
+    existing_members = defaultdict(set)
+    for key, group_id in current_group.items():
+        if group_id:
+            existing_members[group_id].add(key)
+
+    # ── تطبیق گروه‌های ارسالی با گروه‌های فعلی ──
+    desired = [(order_index, operator, [_item_key(item) for item in items]) for order_index, operator, items in groups]
+    matched = [None] * len(desired)
+    unused = list(existing)
+
+    for i, (_, _, members) in enumerate(desired):
+        for group in unused:
+            if existing_members[group.pk] == set(members):
+                matched[i] = group
+                unused.remove(group)
+                break
+
+    to_create, to_update = [], []
+    for i, (order_index, operator, _) in enumerate(desired):
+        group = matched[i]
+        if group is None and unused:
+            group = matched[i] = unused.pop(0)
+        if group is None:
+            group = matched[i] = ItemRelationshipGroup(section=section, operator=operator, order_index=order_index)
+            to_create.append(group)
+        elif group.operator != operator or group.order_index != order_index:
+            group.operator = operator
+            group.order_index = order_index
+            to_update.append(group)
+
+    if unused:
+        ItemRelationshipGroup.objects.filter(pk__in=[group.pk for group in unused]).delete()
+    if to_update:
+        ItemRelationshipGroup.objects.bulk_update(to_update, ['operator', 'order_index'])
+    if to_create:
+        max_pk = ItemRelationshipGroup.objects.aggregate(max_pk=Max('pk'))['max_pk'] or 0
+        bulk_create_with_pks(ItemRelationshipGroup, to_create, section=section, pk__gt=max_pk)
+
+    # ── اتصال آیتم‌ها؛ هر آیتم در آخرین گروهی که آمده قرار می‌گیرد ──
+    target_group = {key: None for key in current_group}
+    for (_, _, members), group in zip(desired, matched):
+        for key in members:
+            target_group[key] = group.pk
+
+    changes = defaultdict(list)
+    for (model, pk), group_id in target_group.items():
+        if current_group.get((model, pk)) != group_id:
+            changes[(model, group_id)].append(pk)
+
+    for (model, group_id), pks in changes.items():
+        model.objects.filter(pk__in=pks).update(relationship_group_id=group_id)
+
+
+# ====== Conditions ====== #
+def sync_item_conditions(items, links):
+    """
+    اعمال شرط‌های آیتم‌ها با مقایسه‌ی ردیف‌های جدول واسط؛ فقط اتصال‌های
+    جدید درج و اتصال‌های حذف شده پاک می‌شوند.
+
+    items: تمام آیتم‌های ذخیره شده‌ی ویرایشگر (شرط آیتمی که در links نیست پاک می‌شود)
+    links: لیست (item, متن شرط)
+    """
+    condition_ids = resolve_condition_ids(text for _, text in links)
+
+    desired = {_item_key(item): set() for item in items}
+    for item, text in links:
+        if text in condition_ids:
+            desired.setdefault(_item_key(item), set()).add(condition_ids[text])
+
+    for model in ITEM_MODELS:
+        item_ids = [pk for (item_model, pk) in desired if item_model is model]
+        if not item_ids:
+            continue
+
+        through = model.conditions.through
+        item_column = f'{model.conditions.field.m2m_field_name()}_id'
+        current = {
+            (item_id, condition_id): pk
+            for pk, item_id, condition_id in through.objects.filter(
+                **{f'{item_column}__in': item_ids}
+            ).values_list('pk', item_column, 'condition_id')
+        }
+        wanted = {
+            (item_id, condition_id)
+            for item_id in item_ids
+            for condition_id in desired[(model, item_id)]
+        }
+
+        stale = [pk for link, pk in current.items() if link not in wanted]
+        if stale:
+            through.objects.filter(pk__in=stale).delete()
+
+        through.objects.bulk_create(
+            [
+                through(**{item_column: item_id, 'condition_id': condition_id})
+                for item_id, condition_id in wanted - current.keys()
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
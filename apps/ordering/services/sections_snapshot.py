@@ -0,0 +1,176 @@
+import hashlib
+import json
+import logging
+
+from django.db import transaction
+from django.db.models import F, Prefetch, Q
+from django.dispatch import Signal
+
+from apps.ordering.models import (
+    Order, OrderSection, SectionItem, DrugSectionItem, ItemRelationshipGroup,
+)
+from apps.ordering.serializers import OrderSectionsSerializer
+
+logger = logging.getLogger(__name__)
+
+# بعد از هر تغییر درخت سکشن‌ها (حتی مسیرهای bulk بدون سیگنال مدل) با order_ids فرستاده می‌شود
+sections_invalidated = Signal()
+
+
+# ====== Tree Loading ====== #
+def sections_tree_queryset():
+    """
+    Order به همراه کل درخت سکشن‌ها (سکشن ← آیتم‌ها/داروها ← شرط‌ها و
+    گروه‌های ارتباطی ← آیتم‌ها/داروها ← شرط‌ها) برای ساخت snapshot.
+    """
+    return Order.objects.prefetch_related(
+        Prefetch(
+            'sections',
+            queryset=OrderSection.objects.prefetch_related(
+                Prefetch(
+                    'items',
+                    queryset=SectionItem.objects.prefetch_related('conditions')
+                ),
+                Prefetch(
+                    'drug_items',
+                    queryset=DrugSectionItem.objects.select_related('drug').prefetch_related('conditions')
+                ),
+                Prefetch(
+                    'relationship_groups',
+                    queryset=ItemRelationshipGroup.objects.prefetch_related(
+                        Prefetch(
+                            'text_items',
+                            queryset=SectionItem.objects.prefetch_related('conditions')
+                        ),
+                        Prefetch(
+                            'drug_items',
+                            queryset=DrugSectionItem.objects.select_related('drug').prefetch_related('conditions')
+                        )
+                    )
+                )
+            )
+        )
+    )
+
+
+# ====== Build ====== #
+def compute_snapshot(order):
+    """
+    ساخت خروجی sections از روی درخت prefetch شده.
+    خروجی: (sections, hash) که hash برابر sha256 همان JSON است.
+    """
+    # اندپوینت API هم از همین سریالایزر استفاده می‌کند؛ snapshot دقیقاً همان خروجی است
+    sections = json.loads(json.dumps(OrderSectionsSerializer(order).data['sections']))
+    return sections, snapshot_hash(sections)
+
+
+def snapshot_hash(sections):
+    payload = json.dumps(sections, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def rebuild_sections_snapshot(order_id):
+    """
+    ساخت و ذخیره‌ی snapshot یک Order. اگر درخت در حین ساخت دوباره کهنه شده باشد
+    (sections_version عوض شده) چیزی ذخیره نمی‌شود و ساخت بعدی آن را می‌نویسد.
+    خروجی: (sections, hash) یا None اگر Order وجود نداشته باشد
+    """
+    # ردیف Order (و sections_version) قبل از درخت خوانده می‌شود
+    order = sections_tree_queryset().filter(pk=order_id).first()
+    if order is None:
+        return None
+
+    sections, digest = compute_snapshot(order)
+    # update مستقیم؛ save مدل slug و full_clean و updated_at را درگیر می‌کند
+    Order.objects.filter(pk=order_id, sections_version=order.sections_version).update(
+        sections_snapshot=sections,
+        sections_snapshot_hash=digest,
+    )
+    return sections, digest
+
+
+def get_sections_snapshot(order):
+    """
+    snapshot ذخیره شده‌ی Order؛ اگر کهنه باشد همین‌جا ساخته و ذخیره می‌شود.
+    خروجی: (sections, hash)
+    """
+    if order.sections_snapshot_hash and order.sections_snapshot is not None:
+        return order.sections_snapshot, order.sections_snapshot_hash
+    return rebuild_sections_snapshot(order.pk)
+
+
+# ====== Invalidation ====== #
+def invalidate_sections_snapshots(order_ids):
+    """
+    کهنه علامت زدن snapshot و ساخت دوباره بعد از commit.
+    ذخیره‌ی یک اوردر ده‌ها سیگنال می‌فرستد؛ ساخت دوباره فقط برای
+    اوردرهایی انجام می‌شود که هنوز کهنه‌اند، پس هر اوردر یک بار ساخته می‌شود.
+    """
+    order_ids = {order_id for order_id in order_ids if order_id}
+    if not order_ids:
+        return
+
+    # نسخه حتی برای اوردرهای از قبل کهنه زیاد می‌شود؛ ممکن است ساختشان در جریان باشد
+    Order.objects.filter(pk__in=order_ids).update(
+        sections_snapshot=None,
+        sections_snapshot_hash='',
+        sections_version=F('sections_version') + 1,
+    )
+    transaction.on_commit(lambda: rebuild_stale_snapshots(order_ids))
+    sections_invalidated.send(sender=Order, order_ids=order_ids)
+
+
+def rebuild_stale_snapshots(order_ids=None):
+    """ساخت snapshot اوردرهای کهنه. خروجی: تعداد snapshotهای ساخته شده"""
+    stale = Order.objects.filter(sections_snapshot_hash='')
+    if order_ids is not None:
+        stale = stale.filter(pk__in=order_ids)
+
+    rebuilt = 0
+    for order_id in stale.values_list('pk', flat=True):
+        try:
+            rebuild_sections_snapshot(order_id)
+            rebuilt += 1
+        except Exception as e:
+            # snapshot کهنه می‌ماند و در اولین درخواست ساخته می‌شود
+            logger.error(f"Could not rebuild sections snapshot of order {order_id}: {e}", exc_info=True)
+    return rebuilt
+
+
+def order_ids_for_conditions(condition_ids):
+    return set(
+        Order.objects.filter(
+            Q(sections__items__conditions__in=condition_ids)
+            | Q(sections__drug_items__conditions__in=condition_ids)
+        ).values_list('pk', flat=True)
+    )
+
+
+def order_ids_for_drug(drug_id):
+    return set(
+        OrderSection.objects.filter(drug_items__drug_id=drug_id).values_list('order_id', flat=True)
+    )
+
+
+# ====== Consistency Check ====== #
+def find_inconsistent_snapshots(order_ids=None):
+    """
+    مقایسه‌ی snapshot ذخیره شده با خروجی تازه‌ی درخت.
+    خروجی: لیست (order_id, علت) برای snapshotهای کهنه، دستکاری شده یا ناهماهنگ.
+    """
+    orders = sections_tree_queryset()
+    if order_ids is not None:
+        orders = orders.filter(pk__in=order_ids)
+
+    problems = []
+    for order in orders.iterator(chunk_size=100):
+        if not order.sections_snapshot_hash or order.sections_snapshot is None:
+            problems.append((order.pk, 'stale'))
+            continue
+        if snapshot_hash(order.sections_snapshot) != order.sections_snapshot_hash:
+            problems.append((order.pk, 'hash mismatch'))
+            continue
+        _, digest = compute_snapshot(order)
+        if digest != order.sections_snapshot_hash:
+            problems.append((order.pk, 'out of date'))
+    return problems
@@ -0,0 +1,70 @@
+from django.db.models.signals import pre_save, post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from apps.ordering.models import (
+    OrderSection, SectionItem, DrugSectionItem, ItemRelationshipGroup, Condition,
+)
+from apps.ordering.services.sections_snapshot import (
+    invalidate_sections_snapshots,
+    order_ids_for_conditions,
+    order_ids_for_drug,
+)
+from apps.prescriptions.models import Drug
+from apps.prescriptions.signals import remember_previous_drug, invalidate_usage_on_item_change
+
+
+# ====== Sections Snapshot Invalidation ====== #
+@receiver(post_save, sender=OrderSection)
+@receiver(post_delete, sender=OrderSection)
+def invalidate_on_section_change(sender, instance, **kwargs):
+    invalidate_sections_snapshots([instance.order_id])
+
+
+@receiver(post_save, sender=SectionItem)
+@receiver(post_delete, sender=SectionItem)
+@receiver(post_save, sender=DrugSectionItem)
+@receiver(post_delete, sender=DrugSectionItem)
+@receiver(post_save, sender=ItemRelationshipGroup)
+@receiver(post_delete, sender=ItemRelationshipGroup)
+def invalidate_on_section_child_change(sender, instance, **kwargs):
+    order_id = OrderSection.objects.filter(pk=instance.section_id).values_list('order_id', flat=True).first()
+    invalidate_sections_snapshots([order_id])
+
+
+@receiver(m2m_changed, sender=SectionItem.conditions.through)
+@receiver(m2m_changed, sender=DrugSectionItem.conditions.through)
+def invalidate_on_item_conditions_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if reverse:
+        # instance یک Condition است؛ post_clear از سمت شرط pk_set ندارد
+        invalidate_sections_snapshots(order_ids_for_conditions([instance.pk]))
+    else:
+        order_id = OrderSection.objects.filter(pk=instance.section_id).values_list('order_id', flat=True).first()
+        invalidate_sections_snapshots([order_id])
+
+
+@receiver(post_save, sender=Condition)
+def invalidate_on_condition_change(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_sections_snapshots(order_ids_for_conditions([instance.pk]))
+
+
+@receiver(pre_delete, sender=Condition)
+def invalidate_on_condition_delete(sender, instance, **kwargs):
+    # بعد از حذف، ردیف‌های واسط هم حذف شده‌اند؛ اوردرها قبل از حذف پیدا می‌شوند
+    invalidate_sections_snapshots(order_ids_for_conditions([instance.pk]))
+
+
+@receiver(post_save, sender=Drug)
+def invalidate_on_drug_change(sender, instance, created, **kwargs):
+    """عنوان و کد دارو داخل snapshot اوردرهایی که از آن استفاده می‌کنند ذخیره شده است"""
+    if not created:
+        invalidate_sections_snapshots(order_ids_for_drug(instance.pk))
+
+
+# ====== Drug Usage Index ====== #
+pre_save.connect(remember_previous_drug, sender=DrugSectionItem)
+post_save.connect(invalidate_usage_on_item_change, sender=DrugSectionItem)
+post_delete.connect(invalidate_usage_on_item_change, sender=DrugSectionItem)
@@ -0,0 +1,10 @@
+from .counters import (
+    get_view_counter,
+    record_view,
+    viewer_id,
+)
+from .popularity import (
+    VIEW_COUNTED_MODELS,
+    decayed_score,
+    flush_view_counts,
+)
@@ -0,0 +1,141 @@
+import logging
+import threading
+import uuid
+from collections import Counter, defaultdict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# ====== Keys ====== #
+COUNTER_PREFIX = 'views'
+
+
+def pending_key(kind):
+    """hash شناسه ← تعداد بازدیدهایی که هنوز در دیتابیس ثبت نشده‌اند"""
+    return f'{COUNTER_PREFIX}:pending:{kind}'
+
+
+def viewers_key(kind, object_id):
+    """HyperLogLog بازدیدکنندگان یک محتوا؛ پاک نمی‌شود تا تعداد یکتای کل را نگه دارد"""
+    return f'{COUNTER_PREFIX}:viewers:{kind}:{object_id}'
+
+
+# ====== In-Memory Counter ====== #
+class InMemoryViewCounter:
+    """
+    شمارنده‌ی داخل پروسه برای تست‌ها و محیط توسعه.
+    بازدیدکنندگان یکتا به صورت دقیق با set شمرده می‌شوند.
+    """
+    def __init__(self):
+        self._pending = defaultdict(Counter)
+        self._viewers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def record(self, kind, object_id, viewer):
+        with self._lock:
+            self._pending[kind][object_id] += 1
+            self._viewers[(kind, object_id)].add(viewer)
+
+    def drain(self, kind):
+        with self._lock:
+            counts = dict(self._pending.pop(kind, {}))
+        return counts
+
+    def restore(self, kind, counts):
+        with self._lock:
+            self._pending[kind].update(counts)
+
+    def unique_counts(self, kind, object_ids):
+        with self._lock:
+            return {object_id: len(self._viewers.get((kind, object_id), ())) for object_id in object_ids}
+
+
+# ====== Redis Counter ====== #
+class RedisViewCounter:
+    """
+    شمارنده‌های Redis مشترک بین همه‌ی workerها: یک HINCRBY و یک PFADD
+    در یک رفت و برگشت برای هر بازدید. drain کلید شمارنده‌ها را با RENAME
+    اتمیک جدا می‌کند تا بازدیدهای همزمان در کلید تازه جمع شوند.
+    """
+    def __init__(self):
+        self.url = settings.VIEW_COUNTER_REDIS_URL
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import redis
+
+            self._client = redis.Redis.from_url(self.url)
+        return self._client
+
+    def record(self, kind, object_id, viewer):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hincrby(pending_key(kind), object_id, 1)
+        pipe.pfadd(viewers_key(kind, object_id), viewer)
+        pipe.execute()
+
+    def drain(self, kind):
+        import redis
+
+        draining = f'{pending_key(kind)}:draining:{uuid.uuid4().hex}'
+        try:
+            self.client.rename(pending_key(kind), draining)
+        except redis.ResponseError:
+            # کلید وجود ندارد؛ بازدید تازه‌ای ثبت نشده است
+            return {}
+
+        counts = self.client.hgetall(draining)
+        self.client.delete(draining)
+        return {int(object_id): int(views) for object_id, views in counts.items()}
+
+    def restore(self, kind, counts):
+        pipe = self.client.pipeline(transaction=False)
+        for object_id, views in counts.items():
+            pipe.hincrby(pending_key(kind), object_id, views)
+        pipe.execute()
+
+    def unique_counts(self, kind, object_ids):
+        object_ids = list(object_ids)
+        pipe = self.client.pipeline(transaction=False)
+        for object_id in object_ids:
+            pipe.pfcount(viewers_key(kind, object_id))
+        return dict(zip(object_ids, pipe.execute()))
+
+
+VIEW_COUNTERS = {
+    'redis': RedisViewCounter,
+    'memory': InMemoryViewCounter,
+}
+
+_counter = None
+
+
+def get_view_counter():
+    """شمارنده‌ی بازدید بر اساس VIEW_COUNTER_BACKEND در تنظیمات (یک نمونه در هر پروسه)"""
+    global _counter
+    if _counter is None:
+        backend = getattr(settings, 'VIEW_COUNTER_BACKEND', 'redis')
+        _counter = VIEW_COUNTERS[backend]()
+    return _counter
+
+
+# ====== Recording ====== #
+def viewer_id(request):
+    """شناسه‌ی بازدیدکننده برای شمارش یکتا: کاربر یا IP مهمان"""
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        return f"ip:{x_forwarded_for.split(',')[0].strip()}"
+    return f"ip:{request.META.get('REMOTE_ADDR')}"
+
+
+def record_view(kind, object_id, request):
+    """خطای شمارنده نباید پاسخ صفحه را خراب کند؛ در بدترین حالت یک بازدید شمرده نمی‌شود"""
+    try:
+        get_view_counter().record(kind, object_id, viewer_id(request))
+    except Exception as e:
+        logger.error(f"View counter failed for {kind} {object_id}: {e}")
@@ -0,0 +1,78 @@
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.ordering.models import Order
+from apps.prescriptions.models import Prescription
+from .counters import get_view_counter
+
+# محتواهایی که بازدیدشان شمرده می‌شود؛ کلید همان kind شمارنده‌هاست
+VIEW_COUNTED_MODELS = {
+    'prescription': Prescription,
+    'order': Order,
+}
+VIEW_FIELDS = ['view_count', 'unique_view_count', 'popularity']
+
+# مبدأ زمانی امتیاز؛ فقط باید ثابت بماند
+POPULARITY_EPOCH = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+
+
+# ====== Decayed Score ====== #
+def _log2_add(a, b):
+    """log2(2^a + 2^b) بدون سرریز"""
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def decayed_score(current, views, now=None):
+    """
+    امتیاز محبوبیت با نیمه‌عمر POPULARITY_HALF_LIFE_DAYS.
+
+    به جای کم کردن امتیاز همه‌ی ردیف‌ها با گذشت زمان، هر بازدید با وزن
+    2^(t / نیمه‌عمر) نسبت به مبدأ ثابت اضافه می‌شود؛ ترتیب امتیازها همان ترتیب
+    امتیاز کاهش یافته است و فقط ردیف‌های بازدید شده به‌روز می‌شوند. امتیاز به
+    صورت log2 ذخیره می‌شود تا سرریز نکند و صفر یعنی بدون بازدید.
+    """
+    if views <= 0:
+        return current
+    now = now or timezone.now()
+    half_lives = (now - POPULARITY_EPOCH).total_seconds() / (settings.POPULARITY_HALF_LIFE_DAYS * 24 * 60 * 60)
+    added = half_lives + math.log2(views)
+    return added if not current else _log2_add(current, added)
+
+
+# ====== Flush ====== #
+def flush_view_counts():
+    """
+    انتقال شمارنده‌های بازدید به ستون‌های view_count، unique_view_count و
+    popularity با یک bulk_update برای هر مدل. اگر ذخیره شکست بخورد
+    شمارنده‌ها برمی‌گردند تا در اجرای بعدی ثبت شوند.
+    خروجی: dict kind ← تعداد ردیف‌های به‌روز شده
+    """
+    counter = get_view_counter()
+    now = timezone.now()
+    flushed = {}
+
+    for kind, model in VIEW_COUNTED_MODELS.items():
+        counts = counter.drain(kind)
+        if not counts:
+            flushed[kind] = 0
+            continue
+
+        try:
+            uniques = counter.unique_counts(kind, counts)
+            objects = list(model.objects.filter(pk__in=counts).only('pk', *VIEW_FIELDS))
+            for obj in objects:
+                obj.view_count += counts[obj.pk]
+                obj.unique_view_count = max(obj.unique_view_count, uniques.get(obj.pk, 0))
+                obj.popularity = decayed_score(obj.popularity, counts[obj.pk], now)
+            # bulk_update سیگنال و auto_now ندارد؛ بازدید تغییر محتوا حساب نمی‌شود
+            model.objects.bulk_update(objects, VIEW_FIELDS, batch_size=500)
+        except Exception:
+            counter.restore(kind, counts)
+            raise
+
+        flushed[kind] = len(objects)
+    return flushed
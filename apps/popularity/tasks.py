@@ -0,0 +1,20 @@
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+# ====== View Counters ====== #
+@shared_task
+def flush_view_counters():
+    """انتقال دوره‌ای شمارنده‌های بازدید از Redis به دیتابیس"""
+    from apps.home.services import refresh_home_feed
+    from apps.popularity.services import flush_view_counts
+
+    flushed = flush_view_counts()
+    if flushed.get('prescription'):
+        # bulk_update سیگنال ندارد؛ لیست پربازدیدهای صفحه‌ی اصلی همین‌جا تازه می‌شود
+        refresh_home_feed()
+    logger.info(f"Flushed view counters: {flushed}")
+    return flushed
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+
+from apps.prescriptions.services import (
+    find_inconsistent_drug_usage,
+    rebuild_drug_usage,
+    rebuild_stale_drug_usage,
+)
+
+
+class Command(BaseCommand):
+    """
+    ساخت دوباره و بررسی ایندکس استفاده‌ی داروها در نسخه‌ها و اوردرها.
+
+    مثال:
+        python manage.py drug_usage              # ساخت ایندکس‌های کهنه یا ساخته نشده
+        python manage.py drug_usage --all        # ساخت دوباره‌ی همه
+        python manage.py drug_usage --check      # گزارش ایندکس‌های ناسازگار
+        python manage.py drug_usage --check --fix
+    """
+    help = 'Rebuilds and verifies the per-drug usage index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--drug', type=int, action='append', dest='drugs', help='Limit to this drug id (repeatable).')
+        parser.add_argument('--all', action='store_true', help='Rebuild every index row, not only stale ones.')
+        parser.add_argument('--check', action='store_true', help='Compare stored rows with a fresh computation.')
+        parser.add_argument('--fix', action='store_true', help='With --check, rebuild inconsistent rows.')
+
+    def handle(self, *args, **options):
+        drug_ids = options['drugs']
+
+        if options['check']:
+            self._check(drug_ids, options['fix'])
+            return
+
+        if options['all']:
+            rebuilt = rebuild_drug_usage(drug_ids)
+        else:
+            rebuilt = rebuild_stale_drug_usage(drug_ids)
+
+        self.stdout.write(self.style.SUCCESS(f'ایندکس {rebuilt} دارو ساخته شد.'))
+
+    def _check(self, drug_ids, fix):
+        problems = find_inconsistent_drug_usage(drug_ids)
+        if not problems:
+            self.stdout.write(self.style.SUCCESS('ایندکس همه‌ی داروها سازگار است.'))
+            return
+
+        for drug_id, reason in problems:
+            self.stdout.write(self.style.WARNING(f'Drug {drug_id}: {reason}'))
+
+        if fix:
+            rebuilt = rebuild_drug_usage([drug_id for drug_id, _ in problems])
+            self.stdout.write(self.style.SUCCESS(f'ایندکس {rebuilt} دارو ساخته شد.'))
+        else:
+            self.stdout.write(self.style.ERROR(f'ایندکس {len(problems)} دارو ناسازگار است.'))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from apps.prescriptions.services import rebuild_related_prescriptions, rebuild_stale_related_prescriptions
+
+
+class Command(BaseCommand):
+    """
+    ساخت جدول نسخه‌های مشابه.
+
+    مثال:
+        python manage.py related_prescriptions          # ساخت ردیف‌های کهنه یا ساخته نشده
+        python manage.py related_prescriptions --all    # ساخت دوباره‌ی همه
+    """
+    help = 'Builds the related-prescriptions table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Rebuild every row, not only stale ones.')
+
+    def handle(self, *args, **options):
+        if options['all']:
+            rebuilt = rebuild_related_prescriptions()
+        else:
+            rebuilt = rebuild_stale_related_prescriptions()
+
+        self.stdout.write(self.style.SUCCESS(f'نسخه‌های مشابه {rebuilt} نسخه ساخته شد.'))
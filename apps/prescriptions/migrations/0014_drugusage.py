@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:35
+
+import django.db.models.deletion
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def build_drug_usage(apps, schema_editor):
+    """ایندکس استفاده‌ی داروهای موجود"""
+    Drug = apps.get_model('prescriptions', 'Drug')
+    DrugUsage = apps.get_model('prescriptions', 'DrugUsage')
+    PrescriptionDrug = apps.get_model('prescriptions', 'PrescriptionDrug')
+    DrugSectionItem = apps.get_model('ordering', 'DrugSectionItem')
+
+    prescriptions, orders = defaultdict(set), defaultdict(set)
+    for drug_id, prescription_id in PrescriptionDrug.objects.values_list('drug_id', 'prescription_id'):
+        prescriptions[drug_id].add(prescription_id)
+    for drug_id, order_id in DrugSectionItem.objects.values_list('drug_id', 'section__order_id'):
+        orders[drug_id].add(order_id)
+
+    DrugUsage.objects.bulk_create(
+        [
+            DrugUsage(
+                drug_id=drug_id,
+                prescription_count=len(prescriptions[drug_id]),
+                order_count=len(orders[drug_id]),
+                prescription_ids=sorted(prescriptions[drug_id]),
+                order_ids=sorted(orders[drug_id]),
+            )
+            for drug_id in Drug.objects.values_list('pk', flat=True)
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prescriptions', '0013_drug_is_for_order'),
+        ('ordering', '0013_condition_text_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DrugUsage',
+            fields=[
+                ('drug', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='usage', serialize=False, to='prescriptions.drug', verbose_name='دارو')),
+                ('prescription_count', models.PositiveIntegerField(default=0, verbose_name='تعداد نسخه\u200cها')),
+                ('order_count', models.PositiveIntegerField(default=0, verbose_name='تعداد اوردرها')),
+                ('prescription_ids', models.JSONField(default=list, verbose_name='شناسه\u200cی نسخه\u200cها')),
+                ('order_ids', models.JSONField(default=list, verbose_name='شناسه\u200cی اوردرها')),
+                ('is_stale', models.BooleanField(default=False, verbose_name='کهنه')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='زمان بروزرسانی')),
+            ],
+            options={
+                'verbose_name': 'موارد استفاده\u200cی دارو',
+                'verbose_name_plural': 'موارد استفاده\u200cی داروها',
+            },
+        ),
+        migrations.RunPython(build_drug_usage, migrations.RunPython.noop),
+    ]
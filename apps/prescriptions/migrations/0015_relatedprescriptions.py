@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prescriptions', '0014_drugusage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedPrescriptions',
+            fields=[
+                ('prescription', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='related_index', serialize=False, to='prescriptions.prescription', verbose_name='نسخه')),
+                ('related_ids', models.JSONField(default=list, verbose_name='شناسه\u200cی نسخه\u200cهای مشابه')),
+                ('scores', models.JSONField(default=list, verbose_name='امتیاز شباهت')),
+                ('is_stale', models.BooleanField(default=False, verbose_name='کهنه')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='زمان بروزرسانی')),
+            ],
+            options={
+                'verbose_name': 'نسخه\u200cهای مشابه',
+                'verbose_name_plural': 'نسخه\u200cهای مشابه',
+            },
+        ),
+    ]
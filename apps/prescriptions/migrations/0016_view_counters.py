@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prescriptions', '0015_relatedprescriptions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='prescription',
+            name='popularity',
+            field=models.FloatField(db_index=True, default=0, editable=False, verbose_name='امتیاز محبوبیت'),
+        ),
+        migrations.AddField(
+            model_name='prescription',
+            name='unique_view_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='بازدیدکنندگان یکتا'),
+        ),
+        migrations.AddField(
+            model_name='prescription',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='تعداد بازدید'),
+        ),
+    ]
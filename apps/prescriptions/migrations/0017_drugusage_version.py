@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prescriptions', '0016_view_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='drugusage',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='نسخه'),
+        ),
+    ]
@@ -2,4 +2,6 @@ from .category import PrescriptionCategory
 from .prescription import Prescription, PrescriptionAlias, AccessChoices
 from .drug import Drug, PrescriptionDrug
 from .prescription_image import PrescriptionImage
-from .prescription_video import PrescriptionVideo
\ No newline at end of file
+from .prescription_video import PrescriptionVideo
+from .drug_usage import DrugUsage
+from .related_prescriptions import RelatedPrescriptions
@@ -0,0 +1,37 @@
+from django.db import models
+
+from .drug import Drug
+
+
+class DrugUsage(models.Model):
+    """
+    ایندکس معکوس استفاده‌ی هر دارو در نسخه‌ها و اوردرها.
+    با ذخیره و حذف PrescriptionDrug و DrugSectionItem کهنه علامت می‌خورد و
+    بعد از commit فقط برای همان داروها دوباره ساخته می‌شود.
+    """
+    drug = models.OneToOneField(
+        Drug,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='usage',
+        verbose_name="دارو"
+    )
+    prescription_count = models.PositiveIntegerField(default=0, verbose_name="تعداد نسخه‌ها")
+    order_count = models.PositiveIntegerField(default=0, verbose_name="تعداد اوردرها")
+    prescription_ids = models.JSONField(default=list, verbose_name="شناسه‌ی نسخه‌ها")
+    order_ids = models.JSONField(default=list, verbose_name="شناسه‌ی اوردرها")
+    is_stale = models.BooleanField(default=False, verbose_name="کهنه")
+    # با هر کهنه شدن یک واحد زیاد می‌شود تا ساختی که قبل از تغییر شروع شده آن را بازنویسی نکند
+    version = models.PositiveIntegerField(default=0, editable=False, verbose_name="نسخه")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='زمان بروزرسانی')
+
+    class Meta:
+        verbose_name = "موارد استفاده‌ی دارو"
+        verbose_name_plural = "موارد استفاده‌ی داروها"
+
+    def __str__(self):
+        return f"{self.drug_id}: {self.prescription_count} نسخه، {self.order_count} اوردر"
+
+    @property
+    def is_used(self):
+        return bool(self.prescription_count or self.order_count)
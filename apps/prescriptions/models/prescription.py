@@ -89,6 +89,10 @@ class Prescription(models.Model):
         help_text='نسخه‌های غیرفعال نمایش داده نمی‌شوند'
     )
     detailed_description = CKEditor5Field('Text', config_name='extends', blank=True, null=True)
+    # از شمارنده‌های Redis به صورت دوره‌ای و یکجا به‌روز می‌شوند
+    view_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="تعداد بازدید")
+    unique_view_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="بازدیدکنندگان یکتا")
+    popularity = models.FloatField(default=0, editable=False, db_index=True, verbose_name="امتیاز محبوبیت")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="تاریخ ایجاد")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="تاریخ بروزرسانی")
     class Meta:
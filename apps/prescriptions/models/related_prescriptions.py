@@ -0,0 +1,31 @@
+from django.db import models
+
+from .prescription import Prescription
+
+
+class RelatedPrescriptions(models.Model):
+    """
+    نسخه‌های مشابه هر نسخه بر اساس داروهای مشترک، دسته‌بندی و کلمات نام‌ها.
+    با تغییر داروها، نام‌ها یا خود نسخه کهنه علامت می‌خورد و تسک پس‌زمینه
+    فقط همان نسخه و همسایه‌هایش را دوباره می‌سازد؛ ساخت شبانه همه را تازه می‌کند.
+    """
+    prescription = models.OneToOneField(
+        Prescription,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='related_index',
+        verbose_name="نسخه"
+    )
+    related_ids = models.JSONField(default=list, verbose_name="شناسه‌ی نسخه‌های مشابه")
+    scores = models.JSONField(default=list, verbose_name="امتیاز شباهت")
+    is_stale = models.BooleanField(default=False, verbose_name="کهنه")
+    # با هر کهنه شدن یک واحد زیاد می‌شود تا ساختی که قبل از تغییر شروع شده آن را بازنویسی نکند
+    version = models.PositiveIntegerField(default=0, editable=False, verbose_name="نسخه")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='زمان بروزرسانی')
+
+    class Meta:
+        verbose_name = "نسخه‌های مشابه"
+        verbose_name_plural = "نسخه‌های مشابه"
+
+    def __str__(self):
+        return f"{self.prescription_id}: {len(self.related_ids)} نسخه‌ی مشابه"
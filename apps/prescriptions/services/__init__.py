@@ -0,0 +1,29 @@
+from .drug_search import (
+    DRUG_SEARCH_LIMIT,
+    DrugIndex,
+    drug_result,
+    search_drugs,
+    get_drug_index,
+    bump_drug_index_version,
+    normalize_drug_text,
+)
+from .drug_usage import (
+    compute_drug_usage,
+    rebuild_drug_usage,
+    rebuild_stale_drug_usage,
+    get_drug_usage,
+    invalidate_drug_usage,
+    drug_ids_for_orders,
+    find_inconsistent_drug_usage,
+)
+from .related_prescriptions import (
+    RELATED_LIMIT,
+    SimilarityIndex,
+    build_similarity_index,
+    prescription_features,
+    rebuild_related_prescriptions,
+    rebuild_stale_related_prescriptions,
+    refresh_related_prescriptions,
+    get_related_prescriptions,
+    invalidate_related_prescriptions,
+)
@@ -0,0 +1,127 @@
+import bisect
+import threading
+import uuid
+
+from django.core.cache import cache
+
+from apps.prescriptions.models import Drug
+from core.text import normalize_persian_text
+
+DRUG_INDEX_VERSION_KEY = 'prescriptions:drug_index_version'
+DRUG_SEARCH_LIMIT = 20
+
+# رتبه‌ی تطابق؛ عدد کمتر یعنی نتیجه‌ی بهتر
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_WORD_PREFIX = 2
+RANK_INFIX = 3
+
+
+def normalize_drug_text(text):
+    return normalize_persian_text(text).casefold()
+
+
+# ====== Index ====== #
+class DrugIndex:
+    """
+    ایندکس پیشوندی داروها در حافظه‌ی پروسه.
+    کلیدهای عنوان کامل، کد و هر کلمه‌ی عنوان به صورت مرتب نگه داشته می‌شوند
+    تا تطابق پیشوندی با جستجوی دودویی پیدا شود؛ تطابق میانی فقط وقتی
+    نتایج کافی نباشد با پیمایش عنوان‌ها انجام می‌شود.
+    """
+
+    def __init__(self, drugs):
+        # drugs: لیست dict با کلیدهای id، title، code و is_for_order
+        self.drugs = sorted(drugs, key=lambda drug: (len(drug['title']), drug['title']))
+        self.titles = [normalize_drug_text(drug['title']) for drug in self.drugs]
+        self.codes = [normalize_drug_text(drug['code']) for drug in self.drugs]
+
+        keys = []
+        for position, (title, code) in enumerate(zip(self.titles, self.codes)):
+            keys.append((title, RANK_PREFIX, position))
+            if code:
+                keys.append((code, RANK_PREFIX, position))
+            for word in title.split()[1:]:
+                keys.append((word, RANK_WORD_PREFIX, position))
+        keys.sort()
+        self.keys = keys
+
+    def search(self, query, limit=DRUG_SEARCH_LIMIT, for_order=None):
+        """
+        داروهای منطبق به ترتیب: تطابق کامل عنوان/کد، پیشوند عنوان/کد،
+        پیشوند یکی از کلمات عنوان و در آخر تطابق میانی.
+        for_order: اگر True باشد فقط داروهای اوردر برگردانده می‌شوند.
+        """
+        query = normalize_drug_text(query)
+        if not query:
+            return []
+
+        def allowed(position):
+            return for_order is None or self.drugs[position]['is_for_order'] == for_order
+
+        best = {}
+        start = bisect.bisect_left(self.keys, (query,))
+        for key, rank, position in self.keys[start:]:
+            if not key.startswith(query):
+                break
+            if key == query and rank == RANK_PREFIX:
+                rank = RANK_EXACT
+            if allowed(position) and rank < best.get(position, RANK_INFIX + 1):
+                best[position] = rank
+
+        if len(best) < limit:
+            for position, (title, code) in enumerate(zip(self.titles, self.codes)):
+                if position not in best and allowed(position) and (query in title or query in code):
+                    best[position] = RANK_INFIX
+                    if len(best) >= limit:
+                        break
+
+        # position خودش ترتیب طول و الفبای عنوان است
+        ranked = sorted(best, key=lambda position: (best[position], position))[:limit]
+        return [drug_result(self.drugs[position]) for position in ranked]
+
+
+def drug_result(drug):
+    """خروجی مشترک جستجو و ایجاد سریع دارو؛ drug یک Drug یا dict است"""
+    if isinstance(drug, Drug):
+        drug = {'id': drug.id, 'title': drug.title, 'code': drug.code}
+    return {
+        'id': drug['id'],
+        'title': drug['title'],
+        'code': drug['code'],
+        'text': f"{drug['title']} (کد: {drug['code']})" if drug['code'] else drug['title'],
+    }
+
+
+# ====== Versioned In-Process Cache ====== #
+_index = None
+_index_version = None
+_index_lock = threading.Lock()
+
+
+def bump_drug_index_version():
+    """بعد از تغییر داروها؛ ایندکس همه‌ی پروسه‌ها در جستجوی بعدی دوباره ساخته می‌شود"""
+    cache.set(DRUG_INDEX_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def get_drug_index():
+    """ایندکس پروسه؛ فقط وقتی کلید نسخه در کش عوض شده باشد دوباره ساخته می‌شود"""
+    global _index, _index_version
+
+    version = cache.get(DRUG_INDEX_VERSION_KEY)
+    if version is None:
+        cache.add(DRUG_INDEX_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(DRUG_INDEX_VERSION_KEY)
+
+    if _index is not None and version == _index_version:
+        return _index
+
+    with _index_lock:
+        if _index is None or version != _index_version:
+            drugs = list(Drug.objects.values('id', 'title', 'code', 'is_for_order'))
+            _index, _index_version = DrugIndex(drugs), version
+    return _index
+
+
+def search_drugs(query, limit=DRUG_SEARCH_LIMIT, for_order=None):
+    return get_drug_index().search(query, limit=limit, for_order=for_order)
@@ -0,0 +1,157 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+
+from apps.ordering.models import DrugSectionItem
+from apps.prescriptions.models import Drug, DrugUsage, PrescriptionDrug
+
+
+# ====== Build ====== #
+def compute_drug_usage(drug_ids=None):
+    """
+    نسخه‌ها و اوردرهای هر دارو با دو کوئری.
+    خروجی: dict شناسه‌ی دارو ← (لیست شناسه‌ی نسخه‌ها، لیست شناسه‌ی اوردرها)
+    """
+    prescriptions = PrescriptionDrug.objects.all()
+    orders = DrugSectionItem.objects.all()
+    if drug_ids is not None:
+        prescriptions = prescriptions.filter(drug_id__in=drug_ids)
+        orders = orders.filter(drug_id__in=drug_ids)
+
+    usage = defaultdict(lambda: (set(), set()))
+    for drug_id, prescription_id in prescriptions.values_list('drug_id', 'prescription_id').distinct():
+        usage[drug_id][0].add(prescription_id)
+    for drug_id, order_id in orders.values_list('drug_id', 'section__order_id').distinct():
+        usage[drug_id][1].add(order_id)
+
+    return {drug_id: (sorted(p_ids), sorted(o_ids)) for drug_id, (p_ids, o_ids) in usage.items()}
+
+
+def _usage_versions(drug_ids):
+    return dict(DrugUsage.objects.filter(drug_id__in=drug_ids).values_list('drug_id', 'version'))
+
+
+def rebuild_drug_usage(drug_ids=None):
+    """
+    ساخت و ذخیره‌ی ایندکس داروها (همه در صورت None).
+    نسخه‌ی ردیف‌ها قبل از محاسبه خوانده می‌شود و فقط ردیف‌هایی جایگزین می‌شوند
+    که در این فاصله کهنه نشده‌اند؛ بقیه کهنه می‌مانند تا ساخت بعدی.
+    خروجی: تعداد ردیف‌های ساخته شده
+    """
+    existing = Drug.objects.all()
+    if drug_ids is not None:
+        existing = existing.filter(pk__in=drug_ids)
+    # داروی حذف شده ردیفی ندارد که ساخته شود
+    existing_ids = list(existing.values_list('pk', flat=True))
+    if not existing_ids:
+        return 0
+
+    versions = _usage_versions(existing_ids)
+    usage = compute_drug_usage(None if drug_ids is None else existing_ids)
+
+    # حذف و درج دوباره در یک تراکنش؛ upsert با unique_fields روی MySQL پشتیبانی نمی‌شود
+    with transaction.atomic():
+        # قفل ردیف‌ها تا invalidation همزمان بین مقایسه و درج نیاید
+        current = dict(
+            DrugUsage.objects.select_for_update()
+            .filter(drug_id__in=existing_ids)
+            .values_list('drug_id', 'version')
+        )
+        unchanged = [drug_id for drug_id in existing_ids if current.get(drug_id) == versions.get(drug_id)]
+
+        rows = []
+        for drug_id in unchanged:
+            prescription_ids, order_ids = usage.get(drug_id, ([], []))
+            rows.append(DrugUsage(
+                drug_id=drug_id,
+                prescription_count=len(prescription_ids),
+                order_count=len(order_ids),
+                prescription_ids=prescription_ids,
+                order_ids=order_ids,
+                is_stale=False,
+                version=current.get(drug_id, 0),
+            ))
+
+        DrugUsage.objects.filter(drug_id__in=unchanged).delete()
+        DrugUsage.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+    return len(rows)
+
+
+def get_drug_usage(drug_id):
+    """ایندکس یک دارو؛ اگر کهنه یا ساخته نشده باشد همین‌جا ساخته می‌شود"""
+    usage = DrugUsage.objects.filter(drug_id=drug_id).first()
+    if usage is None or usage.is_stale:
+        rebuild_drug_usage([drug_id])
+        usage = DrugUsage.objects.filter(drug_id=drug_id).first()
+    return usage
+
+
+# ====== Invalidation ====== #
+def invalidate_drug_usage(drug_ids):
+    """
+    کهنه علامت زدن ایندکس و ساخت دوباره بعد از commit.
+    ذخیره‌ی یک نسخه یا اوردر برای هر دارو سیگنال می‌فرستد؛ ساخت دوباره
+    فقط برای داروهایی انجام می‌شود که هنوز کهنه‌اند.
+    """
+    drug_ids = {drug_id for drug_id in drug_ids if drug_id}
+    if not drug_ids:
+        return
+
+    # نسخه حتی برای ردیف‌های از قبل کهنه زیاد می‌شود؛ ممکن است ساختشان در جریان باشد
+    DrugUsage.objects.filter(drug_id__in=drug_ids).update(is_stale=True, version=F('version') + 1)
+    # داروی بدون ردیف هم یک ردیف کهنه می‌گیرد تا ساخت همزمان نتواند ردیف تازه‌ی اشتباه درج کند
+    missing = Drug.objects.filter(pk__in=drug_ids, usage__isnull=True).values_list('pk', flat=True)
+    DrugUsage.objects.bulk_create(
+        [DrugUsage(drug_id=drug_id, is_stale=True) for drug_id in missing],
+        ignore_conflicts=True,
+    )
+    transaction.on_commit(lambda: rebuild_stale_drug_usage(drug_ids))
+
+
+def rebuild_stale_drug_usage(drug_ids=None):
+    """ساخت ایندکس داروهای کهنه یا بدون ایندکس. خروجی: تعداد ردیف‌های ساخته شده"""
+    if drug_ids is None:
+        stale = set(DrugUsage.objects.filter(is_stale=True).values_list('drug_id', flat=True))
+        stale |= set(Drug.objects.filter(usage__isnull=True).values_list('pk', flat=True))
+    else:
+        # ردیف تازه فقط از ساختی می‌آید که بعد از آخرین invalidation شروع شده؛
+        # ساخت قدیمی‌تر با مقایسه‌ی version در rebuild_drug_usage رد می‌شود
+        fresh = set(DrugUsage.objects.filter(drug_id__in=drug_ids, is_stale=False).values_list('drug_id', flat=True))
+        stale = set(drug_ids) - fresh
+
+    if not stale:
+        return 0
+    return rebuild_drug_usage(stale)
+
+
+def drug_ids_for_orders(order_ids):
+    return set(
+        DrugSectionItem.objects.filter(section__order_id__in=order_ids).values_list('drug_id', flat=True)
+    )
+
+
+# ====== Consistency Check ====== #
+def find_inconsistent_drug_usage(drug_ids=None):
+    """
+    مقایسه‌ی ایندکس ذخیره شده با محاسبه‌ی تازه.
+    خروجی: لیست (drug_id, علت) برای داروهای بدون ایندکس، کهنه یا ناهماهنگ.
+    """
+    drugs = Drug.objects.all()
+    if drug_ids is not None:
+        drugs = drugs.filter(pk__in=drug_ids)
+    drug_ids = list(drugs.values_list('pk', flat=True))
+
+    stored = DrugUsage.objects.in_bulk(drug_ids)
+    usage = compute_drug_usage(drug_ids)
+
+    problems = []
+    for drug_id in drug_ids:
+        row = stored.get(drug_id)
+        if row is None:
+            problems.append((drug_id, 'missing'))
+        elif row.is_stale:
+            problems.append((drug_id, 'stale'))
+        elif (row.prescription_ids, row.order_ids) != tuple(usage.get(drug_id, ([], []))):
+            problems.append((drug_id, 'out of date'))
+    return problems
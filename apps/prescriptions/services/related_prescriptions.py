@@ -0,0 +1,290 @@
+import logging
+import math
+import re
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+
+from apps.prescriptions.models import Prescription, PrescriptionAlias, PrescriptionDrug, RelatedPrescriptions
+from core.text import normalize_persian_text
+
+logger = logging.getLogger(__name__)
+
+RELATED_LIMIT = 6
+
+# وزن هر نوع ویژگی؛ داروی مشترک مهم‌ترین نشانه‌ی شباهت دو نسخه است
+FEATURE_WEIGHTS = {'drug': 1.0, 'category': 0.4, 'token': 0.3}
+# ویژگی‌ای که در بیش از این تعداد نسخه آمده تمایزی ایجاد نمی‌کند و کنار گذاشته می‌شود
+MAX_FEATURE_POSTINGS = 1000
+
+_TOKEN_RE = re.compile(r'\w{2,}')
+
+
+# ====== Features ====== #
+def name_tokens(text):
+    return set(_TOKEN_RE.findall(normalize_persian_text(text).casefold()))
+
+
+def prescription_features(prescription_ids=None):
+    """
+    ویژگی‌های نسخه‌های فعال با سه کوئری: داروها، دسته‌بندی و کلمات عنوان و نام‌های جایگزین.
+    خروجی: dict شناسه‌ی نسخه ← set از (نوع، مقدار)
+    """
+    prescriptions = Prescription.objects.filter(is_active=True)
+    if prescription_ids is not None:
+        prescriptions = prescriptions.filter(pk__in=prescription_ids)
+
+    features = {}
+    for pk, category_id, title in prescriptions.values_list('pk', 'category_id', 'title'):
+        features[pk] = {('token', token) for token in name_tokens(title)}
+        if category_id:
+            features[pk].add(('category', category_id))
+
+    drugs = PrescriptionDrug.objects.filter(prescription__is_active=True)
+    aliases = PrescriptionAlias.objects.filter(prescription__is_active=True)
+    if prescription_ids is not None:
+        drugs = drugs.filter(prescription_id__in=prescription_ids)
+        aliases = aliases.filter(prescription_id__in=prescription_ids)
+
+    for prescription_id, drug_id in drugs.values_list('prescription_id', 'drug_id'):
+        features[prescription_id].add(('drug', drug_id))
+    for prescription_id, name in aliases.values_list('prescription_id', 'name'):
+        features[prescription_id].update(('token', token) for token in name_tokens(name))
+
+    return features
+
+
+# ====== Index ====== #
+class SimilarityIndex:
+    """
+    بردارهای تنک وزن‌دار (وزن نوع ویژگی × idf) و ایندکس معکوس ویژگی ← نسخه‌ها.
+    شباهت کسینوسی فقط با نسخه‌هایی حساب می‌شود که حداقل یک ویژگی مشترک دارند،
+    پس هزینه‌ی هر نسخه به اندازه‌ی لیست‌های ویژگی‌هایش بستگی دارد نه کل نسخه‌ها.
+    """
+
+    def __init__(self, features):
+        postings = defaultdict(list)
+        for prescription_id, prescription_features in features.items():
+            for feature in prescription_features:
+                postings[feature].append(prescription_id)
+
+        total = len(features) or 1
+        self.postings = {
+            feature: ids for feature, ids in postings.items()
+            if len(ids) <= MAX_FEATURE_POSTINGS
+        }
+        self.weights = {
+            feature: FEATURE_WEIGHTS[feature[0]] * math.log(1 + total / len(ids))
+            for feature, ids in self.postings.items()
+        }
+        self.vectors = {
+            prescription_id: {
+                feature: self.weights[feature]
+                for feature in prescription_features if feature in self.weights
+            }
+            for prescription_id, prescription_features in features.items()
+        }
+        self.norms = {
+            prescription_id: math.sqrt(sum(weight * weight for weight in vector.values()))
+            for prescription_id, vector in self.vectors.items()
+        }
+
+    def __contains__(self, prescription_id):
+        return prescription_id in self.vectors
+
+    def candidates(self, prescription_id, kinds=None):
+        """نسخه‌هایی که ویژگی مشترک (از نوع‌های kinds یا همه) دارند؛ شباهت آن‌ها با این نسخه به آن وابسته است"""
+        return {
+            other
+            for feature in self.vectors.get(prescription_id, ())
+            if kinds is None or feature[0] in kinds
+            for other in self.postings[feature]
+            if other != prescription_id
+        }
+
+    def top_related(self, prescription_id, limit=RELATED_LIMIT):
+        """خروجی: لیست (شناسه، امتیاز) مرتب بر اساس امتیاز نزولی"""
+        vector = self.vectors.get(prescription_id)
+        if not vector or not self.norms[prescription_id]:
+            return []
+
+        dots = defaultdict(float)
+        for feature, weight in vector.items():
+            for other in self.postings[feature]:
+                if other != prescription_id:
+                    dots[other] += weight * self.weights[feature]
+
+        norm = self.norms[prescription_id]
+        scores = [(other, dot / (norm * self.norms[other])) for other, dot in dots.items()]
+        scores.sort(key=lambda item: (-item[1], item[0]))
+        return [(other, round(score, 4)) for other, score in scores[:limit]]
+
+
+# ====== Build ====== #
+def build_similarity_index():
+    return SimilarityIndex(prescription_features())
+
+
+def _related_versions(prescription_ids=None):
+    rows = RelatedPrescriptions.objects.all()
+    if prescription_ids is not None:
+        rows = rows.filter(prescription_id__in=prescription_ids)
+    return dict(rows.values_list('prescription_id', 'version'))
+
+
+def rebuild_related_prescriptions(prescription_ids=None, index=None, versions=None):
+    """
+    ساخت و ذخیره‌ی نسخه‌های مشابه (همه‌ی نسخه‌های فعال در صورت None).
+    ردیف نسخه‌های غیرفعال حذف می‌شود. versions نسخه‌ی ردیف‌ها پیش از ساخت index است؛
+    ردیفی که بعد از آن کهنه شده جایگزین نمی‌شود و کهنه می‌ماند تا ساخت بعدی.
+    خروجی: تعداد ردیف‌های ساخته شده
+    """
+    if index is None:
+        versions = _related_versions(prescription_ids)
+        index = build_similarity_index()
+    elif versions is None:
+        raise ValueError("versions must be read before building the index")
+
+    if prescription_ids is None:
+        RelatedPrescriptions.objects.exclude(prescription__is_active=True).delete()
+        prescription_ids = list(index.vectors)
+    else:
+        inactive = [pk for pk in prescription_ids if pk not in index]
+        if inactive:
+            RelatedPrescriptions.objects.filter(prescription_id__in=inactive).delete()
+
+    active_ids = [pk for pk in prescription_ids if pk in index]
+
+    # حذف و درج دوباره در یک تراکنش؛ upsert با unique_fields روی MySQL پشتیبانی نمی‌شود
+    with transaction.atomic():
+        # قفل ردیف‌ها تا invalidation همزمان بین مقایسه و درج نیاید
+        current = dict(
+            RelatedPrescriptions.objects.select_for_update()
+            .filter(prescription_id__in=active_ids)
+            .values_list('prescription_id', 'version')
+        )
+        unchanged = [pk for pk in active_ids if current.get(pk) == versions.get(pk)]
+
+        rows = []
+        for prescription_id in unchanged:
+            related = index.top_related(prescription_id)
+            rows.append(RelatedPrescriptions(
+                prescription_id=prescription_id,
+                related_ids=[other for other, _ in related],
+                scores=[score for _, score in related],
+                is_stale=False,
+                version=current.get(prescription_id, 0),
+            ))
+
+        RelatedPrescriptions.objects.filter(prescription_id__in=unchanged).delete()
+        RelatedPrescriptions.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+    return len(rows)
+
+
+def get_related_prescriptions(prescription):
+    """
+    نسخه‌های فعال مشابه به ترتیب امتیاز. ساخت فقط در تسک پس‌زمینه انجام می‌شود؛
+    ردیف کهنه یا ساخته نشده لیست خالی برمی‌گرداند.
+    خروجی: لیست Prescription به همراه category
+    """
+    row = RelatedPrescriptions.objects.filter(prescription_id=prescription.pk, is_stale=False).first()
+    if row is None or not row.related_ids:
+        return []
+
+    related = Prescription.objects.filter(
+        pk__in=row.related_ids, is_active=True
+    ).select_related('category').in_bulk()
+    return [related[pk] for pk in row.related_ids if pk in related]
+
+
+# ====== Invalidation ====== #
+def invalidate_related_prescriptions(prescription_ids):
+    """
+    کهنه علامت زدن نسخه‌های مشابه و صف کردن تسک ساخت دوباره بعد از commit.
+    ذخیره‌ی یک نسخه برای هر دارو و نام سیگنال می‌فرستد؛ تسک فقط نسخه‌هایی را
+    می‌سازد که هنوز کهنه‌اند، پس تسک‌های بعدی همان تراکنش کاری انجام نمی‌دهند.
+    """
+    prescription_ids = sorted({pk for pk in prescription_ids if pk})
+    if not prescription_ids:
+        return
+
+    # نسخه حتی برای ردیف‌های از قبل کهنه زیاد می‌شود؛ ممکن است ساختشان در جریان باشد
+    RelatedPrescriptions.objects.filter(prescription_id__in=prescription_ids).update(
+        is_stale=True, version=F('version') + 1
+    )
+    # نسخه‌ی بدون ردیف هم یک ردیف کهنه می‌گیرد تا ساخت همزمان نتواند ردیف تازه‌ی اشتباه درج کند
+    missing = Prescription.objects.filter(
+        pk__in=prescription_ids, related_index__isnull=True
+    ).values_list('pk', flat=True)
+    RelatedPrescriptions.objects.bulk_create(
+        [RelatedPrescriptions(prescription_id=pk, is_stale=True) for pk in missing],
+        ignore_conflicts=True,
+    )
+    transaction.on_commit(lambda: _schedule_refresh(prescription_ids))
+
+
+def _schedule_refresh(prescription_ids):
+    from apps.prescriptions.tasks import refresh_stale_related_prescriptions
+
+    try:
+        refresh_stale_related_prescriptions.delay(prescription_ids)
+    except Exception as e:
+        # ردیف‌ها کهنه می‌مانند و ساخت شبانه آن‌ها را می‌سازد
+        logger.error(f"Could not schedule related prescriptions refresh {prescription_ids}: {e}")
+
+
+def refresh_related_prescriptions(prescription_ids):
+    """
+    به‌روزرسانی افزایشی (در تسک پس‌زمینه): نسخه‌های کهنه، نسخه‌هایی که با آن‌ها
+    داروی مشترک دارند و نسخه‌هایی که آن‌ها را در لیست مشابه‌ها دارند دوباره ساخته
+    می‌شوند. همسایه‌هایی که فقط دسته‌بندی یا کلمه‌ی مشترک دارند در ساخت شبانه
+    به‌روز می‌شوند. نسخه‌ی حذف یا غیرفعال شده از لیست همسایه‌هایش پاک می‌شود.
+    خروجی: تعداد ردیف‌های ساخته شده
+    """
+    prescription_ids = set(prescription_ids)
+    # ردیف تازه فقط از ساختی می‌آید که بعد از آخرین invalidation شروع شده؛
+    # ساخت قدیمی‌تر با مقایسه‌ی version در rebuild_related_prescriptions رد می‌شود
+    fresh = set(
+        RelatedPrescriptions.objects.filter(
+            prescription_id__in=prescription_ids, is_stale=False
+        ).values_list('prescription_id', flat=True)
+    )
+    active = set(
+        Prescription.objects.filter(pk__in=prescription_ids, is_active=True).values_list('pk', flat=True)
+    )
+    stale = active - fresh
+    gone = prescription_ids - active
+    if not stale and not gone:
+        return 0
+
+    if gone:
+        RelatedPrescriptions.objects.filter(prescription_id__in=gone).delete()
+    changed = stale | gone
+    versions = {}
+    listing = set()
+    for pk, version, related_ids in RelatedPrescriptions.objects.values_list(
+        'prescription_id', 'version', 'related_ids'
+    ):
+        versions[pk] = version
+        if changed.intersection(related_ids):
+            listing.add(pk)
+    if not stale and not listing:
+        return 0
+
+    index = build_similarity_index()
+    affected = stale | listing
+    for prescription_id in stale:
+        affected |= index.candidates(prescription_id, kinds=('drug',))
+    return rebuild_related_prescriptions(affected, index, versions)
+
+
+def rebuild_stale_related_prescriptions():
+    """ساخت نسخه‌های مشابه کهنه یا ساخته نشده. خروجی: تعداد ردیف‌های ساخته شده"""
+    stale = set(RelatedPrescriptions.objects.filter(is_stale=True).values_list('prescription_id', flat=True))
+    stale |= set(
+        Prescription.objects.filter(is_active=True, related_index__isnull=True).values_list('pk', flat=True)
+    )
+    if not stale:
+        return 0
+    return refresh_related_prescriptions(stale)
@@ -0,0 +1,52 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from apps.prescriptions.models import Drug, Prescription, PrescriptionAlias, PrescriptionDrug
+from apps.prescriptions.services import (
+    bump_drug_index_version,
+    invalidate_drug_usage,
+    invalidate_related_prescriptions,
+)
+
+
+# ====== Drug Search Index ====== #
+@receiver(post_save, sender=Drug)
+@receiver(post_delete, sender=Drug)
+def refresh_drug_index(sender, instance, **kwargs):
+    # بعد از commit تا پروسه‌ی دیگری ایندکس را با داده‌ی قبلی و نسخه‌ی جدید نسازد
+    transaction.on_commit(bump_drug_index_version)
+
+
+# ====== Drug Usage Index ====== #
+def remember_previous_drug(sender, instance, **kwargs):
+    """داروی قبلی آیتم؛ اگر دارو عوض شود ایندکس هر دو دارو کهنه می‌شود"""
+    instance._previous_drug_id = (
+        sender.objects.filter(pk=instance.pk).values_list('drug_id', flat=True).first()
+        if instance.pk else None
+    )
+
+
+def invalidate_usage_on_item_change(sender, instance, **kwargs):
+    invalidate_drug_usage([instance.drug_id, getattr(instance, '_previous_drug_id', None)])
+
+
+pre_save.connect(remember_previous_drug, sender=PrescriptionDrug)
+post_save.connect(invalidate_usage_on_item_change, sender=PrescriptionDrug)
+post_delete.connect(invalidate_usage_on_item_change, sender=PrescriptionDrug)
+
+
+# ====== Related Prescriptions ====== #
+@receiver(post_save, sender=Prescription)
+@receiver(post_delete, sender=Prescription)
+def invalidate_related_on_prescription_change(sender, instance, **kwargs):
+    # عنوان، دسته‌بندی یا وضعیت فعال بودن در شباهت اثر دارد
+    invalidate_related_prescriptions([instance.pk])
+
+
+@receiver(post_save, sender=PrescriptionDrug)
+@receiver(post_delete, sender=PrescriptionDrug)
+@receiver(post_save, sender=PrescriptionAlias)
+@receiver(post_delete, sender=PrescriptionAlias)
+def invalidate_related_on_child_change(sender, instance, **kwargs):
+    invalidate_related_prescriptions([instance.prescription_id])
@@ -7,6 +7,7 @@ import os
 import gc
 
 logger = logging.getLogger('image_compression')
+related_logger = logging.getLogger(__name__)
 Image.MAX_IMAGE_PIXELS = None
 
 
@@ -274,3 +275,27 @@ def standard_compress(image_path, image_id):
             except:
                 pass
         gc.collect()
+
+
+# ====== Related Prescriptions ====== #
+@shared_task
+def refresh_stale_related_prescriptions(prescription_ids):
+    """ساخت افزایشی نسخه‌های مشابه بعد از تغییر نسخه‌ها، داروها یا نام‌هایشان"""
+    from apps.prescriptions.services import refresh_related_prescriptions
+
+    rebuilt = refresh_related_prescriptions(prescription_ids)
+    related_logger.info(f"Refreshed related prescriptions of {rebuilt} prescriptions")
+    return rebuilt
+
+
+@shared_task
+def rebuild_all_related_prescriptions():
+    """
+    ساخت دوباره‌ی شبانه‌ی همه‌ی نسخه‌های مشابه؛ ردیف‌های ساخته نشده را هم پر
+    می‌کند و وزن ویژگی‌ها (idf) و همسایه‌های غیر دارویی را تازه می‌کند.
+    """
+    from apps.prescriptions.services import rebuild_related_prescriptions
+
+    rebuilt = rebuild_related_prescriptions()
+    related_logger.info(f"Rebuilt related prescriptions of {rebuilt} prescriptions")
+    return rebuilt
@@ -5,6 +5,7 @@ from django.contrib.auth import get_user_model
 
 from ..models import Question
 from apps.notifications.models import Notification
+from apps.notifications.services import outbox_handler, enqueue_event, create_notifications
 
 User = get_user_model()
 
@@ -15,54 +16,70 @@ def create_question_notification(sender, instance, created, **kwargs):
     اساس کار اینگونه است که اگر کاربر ویژه سوال را ارسال کرد، یک اعلان به سمت
     ادمین ارسال می شود و اگر که ادمین یک پاسخ به سوال داد، یک اعلان و همچنین یک 
     ایمیل باید به سمت کاربرارسال شود که به سوال او پاسخ داده شد.
+
+    ساخت اعلان‌ها در پس‌زمینه (outbox) انجام می‌شود و این سیگنال فقط رویداد را
+    در همان تراکنش ثبت می‌کند.
     """
     
     if created:
-        admin_users = User.objects.filter(profile__role="admin", is_active=True)
-
-        if not admin_users.exists():
-            return None
-        
-        question_user = instance.user.full_name
-        message = f"سؤال جدیدی از طرف {question_user} ثبت گردید."
-        
-        content_type = ContentType.objects.get_for_model(Question)
-        
-        notifications_to_create = [
-             Notification(
-                recipient=admin_user,
-                message=message,
-                content_type=content_type,
-                object_id=instance.pk,
-                is_read=False
-            )
-            for admin_user in admin_users
-        ]
+        enqueue_event(
+            'question_created',
+            {'question_id': instance.pk},
+            idempotency_key=f'question:{instance.pk}:created',
+        )
         
-        Notification.objects.bulk_create(notifications_to_create)
-        
-    elif not created and instance.is_answered and instance.answered_by:
+    elif instance.is_answered and instance.answered_by:
         # اگر سوال پرسیده شده بود و ادمین پساخ رو ثبت کرد
-        
-        content_type = ContentType.objects.get_for_model(instance)
-        
-        existing_notification = Notification.objects.filter(
-            recipient=instance.user,
+        enqueue_event(
+            'question_answered',
+            {'question_id': instance.pk},
+            idempotency_key=f'question:{instance.pk}:answered',
+        )
+
+
+# ====== Outbox Handlers ====== #
+@outbox_handler('question_created')
+def notify_admins_of_question(payload):
+    instance = Question.objects.select_related('user').filter(pk=payload['question_id']).first()
+    if instance is None:
+        return
+
+    admin_ids = User.objects.filter(profile__role="admin", is_active=True).values_list('pk', flat=True)
+    
+    question_user = instance.user.full_name
+    message = f"سؤال جدیدی از طرف {question_user} ثبت گردید."
+    
+    content_type = ContentType.objects.get_for_model(Question)
+    
+    create_notifications([
+        Notification(
+            recipient_id=admin_id,
+            message=message,
             content_type=content_type,
             object_id=instance.pk,
-            message__contains="پاسخ سوال شما داده شد",
-            is_read=False
-        ).exists()
-        
-        if not existing_notification:
-            prescription_title = instance.prescription.title
-            message = f"پاسخ سوال شما در مورد نسخه «{prescription_title}» داده شد."
-            
-            Notification.objects.create(
-                recipient=instance.user,
-                message=message,
-                content_type=content_type,
-                object_id=instance.pk,
-                is_read=False
-            )
-        
\ No newline at end of file
+            is_read=False,
+            idempotency_key=f'question:{instance.pk}:created:admin:{admin_id}',
+        )
+        for admin_id in admin_ids
+    ])
+
+
+@outbox_handler('question_answered')
+def notify_user_of_answer(payload):
+    instance = Question.objects.select_related('prescription').filter(pk=payload['question_id']).first()
+    if instance is None:
+        return
+
+    prescription_title = instance.prescription.title
+    message = f"پاسخ سوال شما در مورد نسخه «{prescription_title}» داده شد."
+    
+    create_notifications([
+        Notification(
+            recipient_id=instance.user_id,
+            message=message,
+            content_type=ContentType.objects.get_for_model(Question),
+            object_id=instance.pk,
+            is_read=False,
+            idempotency_key=f'question:{instance.pk}:answered',
+        )
+    ])
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:29
+
+from django.db import migrations, models
+
+# ترتیب درج ردیف‌ها؛ همگام‌سازی اولیه به همین ترتیب محتوا را می‌فرستد
+BACKFILL = [
+    ('category', 'prescriptions', 'PrescriptionCategory'),
+    ('drug', 'prescriptions', 'Drug'),
+    ('prescription', 'prescriptions', 'Prescription'),
+    ('prescription_drug', 'prescriptions', 'PrescriptionDrug'),
+    ('order', 'ordering', 'Order'),
+]
+
+
+def backfill_changes(apps, schema_editor):
+    """یک ردیف برای هر شیء موجود تا همگام‌سازی از ابتدای لاگ کل محتوا را برگرداند"""
+    ContentChange = apps.get_model('sync', 'ContentChange')
+    for entity, app_label, model_name in BACKFILL:
+        model = apps.get_model(app_label, model_name)
+        ContentChange.objects.bulk_create(
+            [
+                ContentChange(entity=entity, object_id=pk)
+                for pk in model.objects.order_by('pk').values_list('pk', flat=True)
+            ],
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('prescriptions', '0013_drug_is_for_order'),
+        ('ordering', '0013_condition_text_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(choices=[('category', 'دسته\u200cبندی'), ('drug', 'دارو'), ('prescription', 'نسخه'), ('prescription_drug', 'داروی نسخه'), ('order', 'اوردر')], max_length=30, verbose_name='نوع محتوا')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='شناسه')),
+                ('is_deleted', models.BooleanField(default=False, verbose_name='حذف شده')),
+                ('changed_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='زمان تغییر')),
+            ],
+            options={
+                'verbose_name': 'تغییر محتوا',
+                'verbose_name_plural': 'لاگ تغییرات محتوا',
+                'constraints': [models.UniqueConstraint(fields=('entity', 'object_id'), name='sync_change_unique_object')],
+            },
+        ),
+        migrations.RunPython(backfill_changes, migrations.RunPython.noop),
+    ]
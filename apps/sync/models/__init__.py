@@ -0,0 +1 @@
+from .content_change import ContentChange
@@ -0,0 +1,42 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+# ===== Content Change Model ===== #
+class ContentChange(models.Model):
+    """
+    لاگ تغییرات محتوا برای همگام‌سازی آفلاین.
+    برای هر شیء فقط یک ردیف نگه داشته می‌شود: هر تغییر ردیف قبلی را حذف و
+    ردیف تازه‌ای با شناسه‌ی بزرگ‌تر درج می‌کند، پس شناسه همان cursor است و
+    کلاینت با خواندن ردیف‌های بعد از cursor آخرین وضعیت هر شیء را می‌گیرد.
+    ردیف‌های is_deleted همان tombstone حذف‌ها هستند.
+    """
+    ENTITY_CATEGORY = 'category'
+    ENTITY_DRUG = 'drug'
+    ENTITY_PRESCRIPTION = 'prescription'
+    ENTITY_PRESCRIPTION_DRUG = 'prescription_drug'
+    ENTITY_ORDER = 'order'
+
+    ENTITIES = [
+        (ENTITY_CATEGORY, 'دسته‌بندی'),
+        (ENTITY_DRUG, 'دارو'),
+        (ENTITY_PRESCRIPTION, 'نسخه'),
+        (ENTITY_PRESCRIPTION_DRUG, 'داروی نسخه'),
+        (ENTITY_ORDER, 'اوردر'),
+    ]
+
+    entity = models.CharField(max_length=30, choices=ENTITIES, verbose_name=_("نوع محتوا"))
+    object_id = models.PositiveBigIntegerField(verbose_name=_("شناسه"))
+    is_deleted = models.BooleanField(default=False, verbose_name=_("حذف شده"))
+    changed_at = models.DateTimeField(auto_now_add=True, db_index=True, verbose_name=_("زمان تغییر"))
+
+    class Meta:
+        verbose_name = _("تغییر محتوا")
+        verbose_name_plural = _("لاگ تغییرات محتوا")
+        constraints = [
+            models.UniqueConstraint(fields=['entity', 'object_id'], name='sync_change_unique_object'),
+        ]
+
+    def __str__(self):
+        action = 'delete' if self.is_deleted else 'upsert'
+        return f"{self.entity}:{self.object_id} ({action})"
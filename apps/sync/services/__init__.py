@@ -0,0 +1,18 @@
+from .change_log import (
+    record_change,
+    record_changes,
+    prune_tombstones,
+)
+from .entitlements import (
+    content_access_levels,
+    access_fingerprint,
+)
+from .feed import (
+    SYNC_PAGE_SIZE,
+    SYNC_MAX_PAGE_SIZE,
+    ChangePage,
+    InvalidCursor,
+    read_changes,
+    encode_cursor,
+    decode_cursor,
+)
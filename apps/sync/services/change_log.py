@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.sync.models import ContentChange
+
+
+# ====== Recording ====== #
+def record_changes(entity, object_ids, deleted=False):
+    """
+    ثبت تغییر (یا tombstone حذف) چند شیء در لاگ همگام‌سازی.
+    ردیف قبلی هر شیء حذف و ردیف تازه درج می‌شود تا شناسه‌ی آن بعد از
+    cursor کلاینت‌ها قرار بگیرد؛ داخل همان تراکنش تغییر اصلی اجرا می‌شود.
+    """
+    object_ids = {int(object_id) for object_id in object_ids if object_id}
+    if not object_ids:
+        return
+
+    ContentChange.objects.filter(entity=entity, object_id__in=object_ids).delete()
+    # ignore_conflicts: اگر تراکنش همزمانی همین شیء را ثبت کرده باشد خطا نمی‌دهد
+    ContentChange.objects.bulk_create(
+        [
+            ContentChange(entity=entity, object_id=object_id, is_deleted=deleted)
+            for object_id in sorted(object_ids)
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def record_change(entity, object_id, deleted=False):
+    record_changes(entity, [object_id], deleted=deleted)
+
+
+# ====== Retention ====== #
+def tombstone_cutoff():
+    return timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+
+def prune_tombstones():
+    """حذف tombstoneهای قدیمی. خروجی: تعداد ردیف‌های حذف شده"""
+    deleted, _ = ContentChange.objects.filter(is_deleted=True, changed_at__lt=tombstone_cutoff()).delete()
+    return deleted
@@ -0,0 +1,35 @@
+from apps.accounts.models import AuthStatusChoices
+
+FREE = 'FREE'
+PREMIUM = 'PREMIUM'
+
+
+# ====== Access Levels ====== #
+def content_access_levels(user):
+    """
+    سطح‌های دسترسی قابل مشاهده برای کاربر، هم‌راستا با IsPrescriptionAccessible
+    و IsOrderAccessible.
+    خروجی: dict با کلیدهای 'prescription' و 'order' و مقدار tuple سطح‌ها
+    """
+    if user.is_authenticated and (user.is_staff or user.is_superuser):
+        return {'prescription': (FREE, PREMIUM), 'order': (FREE, PREMIUM)}
+
+    profile = getattr(user, 'profile', None) if user.is_authenticated else None
+    if profile is None or profile.auth_status != AuthStatusChoices.APPROVED.value:
+        # نسخه‌های رایگان برای همه آزاد است ولی اوردرها کاربر تایید شده می‌خواهند
+        return {'prescription': (FREE,), 'order': ()}
+
+    if profile.role == "admin":
+        return {'prescription': (FREE, PREMIUM), 'order': (FREE, PREMIUM)}
+
+    if profile.role in ("regular", "visitor") or not user.has_active_membership():
+        return {'prescription': (FREE,), 'order': (FREE,)}
+
+    from apps.subscriptions.models import FeatureType
+    order_levels = (FREE, PREMIUM) if user.has_feature_access(FeatureType.ORDERING) else (FREE,)
+    return {'prescription': (FREE, PREMIUM), 'order': order_levels}
+
+
+def access_fingerprint(levels):
+    """رشته‌ی کوتاه از سطح‌های دسترسی؛ با تغییر آن کلاینت باید از اول همگام شود"""
+    return ';'.join(f"{key}={','.join(sorted(value))}" for key, value in sorted(levels.items()))
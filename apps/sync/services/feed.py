@@ -0,0 +1,122 @@
+import base64
+import json
+from collections import defaultdict, namedtuple
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.ordering.models import Order
+from apps.prescriptions.models import Drug, Prescription, PrescriptionCategory, PrescriptionDrug
+from apps.sync.models import ContentChange
+from .change_log import tombstone_cutoff
+from .entitlements import access_fingerprint, content_access_levels
+
+SYNC_PAGE_SIZE = 100
+SYNC_MAX_PAGE_SIZE = 500
+
+# changes: لیست (entity, object_id, obj) که obj برای حذف‌ها None است
+ChangePage = namedtuple('ChangePage', ['changes', 'cursor', 'has_more', 'reset'])
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# ====== Cursor ====== #
+def encode_cursor(position, fingerprint):
+    payload = {'p': position, 't': int(timezone.now().timestamp()), 'a': fingerprint}
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """خروجی: (position, issued_at, fingerprint)؛ برای cursor خراب InvalidCursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        return (
+            int(payload['p']),
+            datetime.fromtimestamp(int(payload['t']), tz=dt_timezone.utc),
+            str(payload['a']),
+        )
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursor("cursor نامعتبر است") from e
+
+
+# ====== Visible Content ====== #
+def visible_querysets(levels):
+    """کوئری محتوای قابل مشاهده‌ی هر نوع با توجه به سطح دسترسی کاربر"""
+    return {
+        ContentChange.ENTITY_CATEGORY: PrescriptionCategory.objects.all(),
+        ContentChange.ENTITY_DRUG: Drug.objects.all(),
+        ContentChange.ENTITY_PRESCRIPTION: Prescription.objects.filter(
+            is_active=True, access_level__in=levels['prescription'],
+        ).prefetch_related('aliases', 'images', 'videos'),
+        ContentChange.ENTITY_PRESCRIPTION_DRUG: PrescriptionDrug.objects.filter(
+            prescription__is_active=True, prescription__access_level__in=levels['prescription'],
+        ),
+        ContentChange.ENTITY_ORDER: Order.objects.filter(
+            access_level__in=levels['order'],
+        ).select_related('category'),
+    }
+
+
+# ====== Change Feed ====== #
+def read_changes(user, cursor=None, limit=SYNC_PAGE_SIZE):
+    """
+    یک صفحه از تغییرات محتوا بعد از cursor.
+    - بدون cursor (یا cursor منقضی/با دسترسی متفاوت) همگام‌سازی از اول است؛
+      چون لاگ برای هر شیء موجود یک ردیف دارد، همان خواندن از ابتدای لاگ کل
+      محتوا را می‌دهد و tombstoneها لازم نیستند (reset=True یعنی کلاینت
+      داده‌ی محلی را پاک کند).
+    - شیئی که تغییر کرده ولی دیگر قابل مشاهده نیست (غیرفعال، ویژه بدون
+      اشتراک یا حذف شده) به صورت حذف برگردانده می‌شود.
+    - تغییرات جوان‌تر از SYNC_SETTLE_SECONDS ارسال نمی‌شوند تا تراکنشی با
+      شناسه‌ی کمتر که هنوز commit نشده جا نماند.
+    """
+    levels = content_access_levels(user)
+    fingerprint = access_fingerprint(levels)
+    limit = max(1, min(int(limit), SYNC_MAX_PAGE_SIZE))
+
+    position, reset = 0, True
+    if cursor:
+        position, issued_at, cursor_fingerprint = decode_cursor(cursor)
+        if cursor_fingerprint == fingerprint and issued_at >= tombstone_cutoff():
+            reset = False
+        else:
+            position = 0
+    bootstrap = position == 0
+
+    settled_before = timezone.now() - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+    rows = ContentChange.objects.filter(pk__gt=position, changed_at__lte=settled_before)
+    if bootstrap:
+        rows = rows.filter(is_deleted=False)
+    rows = list(rows.order_by('pk').values_list('pk', 'entity', 'object_id', 'is_deleted')[:limit + 1])
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if rows:
+        position = rows[-1][0]
+
+    wanted = defaultdict(set)
+    for _, entity, object_id, is_deleted in rows:
+        if not is_deleted:
+            wanted[entity].add(object_id)
+
+    querysets = visible_querysets(levels)
+    objects = {
+        entity: querysets[entity].in_bulk(object_ids)
+        for entity, object_ids in wanted.items()
+        if entity in querysets
+    }
+
+    changes = []
+    for _, entity, object_id, _ in rows:
+        obj = objects.get(entity, {}).get(object_id)
+        if obj is None and bootstrap:
+            # کلاینت در شروع چیزی ندارد که حذف شود
+            continue
+        changes.append((entity, object_id, obj))
+
+    return ChangePage(changes, encode_cursor(position, fingerprint), has_more, reset)
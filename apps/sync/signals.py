@@ -0,0 +1,116 @@
+from django.db.models.signals import pre_save, post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from apps.ordering.models import (
+    Order, OrderAlias, OrderImage, OrderVideo,
+    DynamicFieldGroup, DynamicFieldNode, EmergencyDisposition, EmergencyNode,
+)
+from apps.ordering.services import sections_invalidated
+from apps.prescriptions.models import (
+    PrescriptionCategory, Drug, Prescription, PrescriptionAlias,
+    PrescriptionDrug, PrescriptionImage, PrescriptionVideo,
+)
+from apps.sync.models import ContentChange
+from apps.sync.services import record_change, record_changes
+
+
+# ====== Prescriptions ====== #
+@receiver(post_save, sender=PrescriptionCategory)
+def record_category_save(sender, instance, created, **kwargs):
+    record_change(ContentChange.ENTITY_CATEGORY, instance.pk)
+    if not created:
+        # دسته‌بندی داخل خروجی base اوردرها هم آمده است
+        record_changes(ContentChange.ENTITY_ORDER, instance.orders.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=PrescriptionCategory)
+def record_category_delete(sender, instance, **kwargs):
+    # SET_NULL نسخه‌ها با update انجام می‌شود و سیگنال ندارد
+    record_changes(ContentChange.ENTITY_PRESCRIPTION, instance.prescriptions.values_list('pk', flat=True))
+    record_change(ContentChange.ENTITY_CATEGORY, instance.pk, deleted=True)
+
+
+@receiver(post_save, sender=Drug)
+@receiver(post_delete, sender=Drug)
+def record_drug_change(sender, instance, **kwargs):
+    record_change(ContentChange.ENTITY_DRUG, instance.pk, deleted=kwargs['signal'] is post_delete)
+
+
+@receiver(pre_save, sender=Prescription)
+def remember_prescription_visibility(sender, instance, **kwargs):
+    """فعال بودن و سطح دسترسی قبلی نسخه؛ با تغییرشان داروهای نسخه دوباره ثبت می‌شوند"""
+    instance._previous_visibility = (
+        sender.objects.filter(pk=instance.pk).values_list('is_active', 'access_level').first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Prescription)
+@receiver(post_delete, sender=Prescription)
+def record_prescription_change(sender, instance, **kwargs):
+    record_change(ContentChange.ENTITY_PRESCRIPTION, instance.pk, deleted=kwargs['signal'] is post_delete)
+
+    previous = getattr(instance, '_previous_visibility', None)
+    if kwargs['signal'] is post_save and previous and previous != (instance.is_active, instance.access_level):
+        # ردیف‌های داروی نسخه‌ی پنهان به کاربر نرسیده‌اند؛ با دیده شدن نسخه باید دوباره ارسال شوند
+        record_changes(
+            ContentChange.ENTITY_PRESCRIPTION_DRUG,
+            instance.prescriptiondrug_set.values_list('pk', flat=True),
+        )
+
+
+@receiver(post_save, sender=PrescriptionDrug)
+@receiver(post_delete, sender=PrescriptionDrug)
+def record_prescription_drug_change(sender, instance, **kwargs):
+    record_change(ContentChange.ENTITY_PRESCRIPTION_DRUG, instance.pk, deleted=kwargs['signal'] is post_delete)
+
+
+@receiver(post_save, sender=PrescriptionAlias)
+@receiver(post_delete, sender=PrescriptionAlias)
+@receiver(post_save, sender=PrescriptionImage)
+@receiver(post_delete, sender=PrescriptionImage)
+@receiver(post_save, sender=PrescriptionVideo)
+@receiver(post_delete, sender=PrescriptionVideo)
+def record_prescription_child_change(sender, instance, **kwargs):
+    record_change(ContentChange.ENTITY_PRESCRIPTION, instance.prescription_id)
+
+
+# ====== Orders ====== #
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def record_order_change(sender, instance, **kwargs):
+    record_change(ContentChange.ENTITY_ORDER, instance.pk, deleted=kwargs['signal'] is post_delete)
+
+
+@receiver(post_save, sender=OrderAlias)
+@receiver(post_delete, sender=OrderAlias)
+@receiver(post_save, sender=OrderImage)
+@receiver(post_delete, sender=OrderImage)
+@receiver(post_save, sender=OrderVideo)
+@receiver(post_delete, sender=OrderVideo)
+@receiver(post_save, sender=DynamicFieldGroup)
+@receiver(post_delete, sender=DynamicFieldGroup)
+@receiver(post_save, sender=EmergencyDisposition)
+@receiver(post_delete, sender=EmergencyDisposition)
+def record_order_child_change(sender, instance, **kwargs):
+    record_change(ContentChange.ENTITY_ORDER, instance.order_id)
+
+
+@receiver(post_save, sender=DynamicFieldNode)
+@receiver(post_delete, sender=DynamicFieldNode)
+def record_dynamic_node_change(sender, instance, **kwargs):
+    order_id = DynamicFieldGroup.objects.filter(pk=instance.group_id).values_list('order_id', flat=True).first()
+    record_change(ContentChange.ENTITY_ORDER, order_id)
+
+
+@receiver(post_save, sender=EmergencyNode)
+@receiver(post_delete, sender=EmergencyNode)
+def record_emergency_node_change(sender, instance, **kwargs):
+    order_id = EmergencyDisposition.objects.filter(pk=instance.disposition_id).values_list('order_id', flat=True).first()
+    record_change(ContentChange.ENTITY_ORDER, order_id)
+
+
+@receiver(sections_invalidated)
+def record_sections_change(sender, order_ids, **kwargs):
+    """درخت سکشن‌ها؛ مسیرهای bulk ویرایشگر و کپی هم از همین‌جا ثبت می‌شوند"""
+    record_changes(ContentChange.ENTITY_ORDER, order_ids)
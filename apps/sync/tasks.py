@@ -0,0 +1,16 @@
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+# ====== Tombstone Retention ====== #
+@shared_task
+def prune_sync_tombstones():
+    """حذف روزانه‌ی tombstoneهای قدیمی‌تر از SYNC_TOMBSTONE_RETENTION_DAYS"""
+    from apps.sync.services import prune_tombstones
+
+    deleted = prune_tombstones()
+    logger.info(f"Pruned {deleted} sync tombstones")
+    return deleted
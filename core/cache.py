@@ -0,0 +1,85 @@
+import functools
+import logging
+import time
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+# ====== Stale-While-Revalidate Cache ====== #
+def stale_while_revalidate(key, fresh_for, stale_for=None, lock_timeout=30, wait_timeout=2.0):
+    """
+    دکوریتور کش با الگوی stale-while-revalidate و قفل تک‌پروازی (single-flight).
+
+    - تا fresh_for ثانیه مقدار کش شده مستقیماً برگردانده می‌شود.
+    - بعد از آن و تا stale_for ثانیه، فقط یک درخواست (برنده‌ی قفل) مقدار را
+      دوباره محاسبه می‌کند و بقیه همان مقدار کهنه را می‌گیرند.
+    - اگر هیچ مقداری در کش نباشد، بقیه‌ی درخواست‌ها تا wait_timeout ثانیه
+      منتظر نتیجه‌ی برنده‌ی قفل می‌مانند تا از هجوم (stampede) جلوگیری شود.
+
+    آرگومان‌های تابع (در صورت وجود) به انتهای کلید اضافه می‌شوند.
+    تابع دکوریت شده متد invalidate(*args) برای پاک کردن کش و refresh(*args)
+    برای محاسبه و جایگزینی مقدار بدون خالی کردن کش دارد.
+
+    مثال:
+        @stale_while_revalidate('admin_dashboard_stats', fresh_for=60)
+        def _calculate_dashboard_stats():
+            ...
+    """
+    stale_for = stale_for if stale_for is not None else fresh_for * 10
+
+    def decorator(func):
+        def build_key(*args):
+            return ':'.join([key, *map(str, args)])
+
+        def compute(cache_key, args):
+            value = func(*args)
+            cache.set(
+                cache_key,
+                {'value': value, 'fresh_until': time.time() + fresh_for},
+                fresh_for + stale_for,
+            )
+            return value
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            cache_key = build_key(*args)
+            lock_key = f'{cache_key}:lock'
+
+            entry = cache.get(cache_key)
+            if entry is not None and entry['fresh_until'] > time.time():
+                return entry['value']
+
+            if cache.add(lock_key, True, lock_timeout):
+                try:
+                    return compute(cache_key, args)
+                finally:
+                    cache.delete(lock_key)
+
+            # مقدار در حال محاسبه توسط درخواست دیگری است
+            if entry is not None:
+                return entry['value']
+
+            deadline = time.time() + wait_timeout
+            while time.time() < deadline:
+                time.sleep(0.05)
+                entry = cache.get(cache_key)
+                if entry is not None:
+                    return entry['value']
+
+            logger.warning(f"Cache lock wait timed out for {cache_key}, computing directly")
+            return compute(cache_key, args)
+
+        def invalidate(*args):
+            cache.delete(build_key(*args))
+
+        def refresh(*args):
+            # تا پایان محاسبه مقدار قبلی سرو می‌شود
+            return compute(build_key(*args), args)
+
+        wrapper.invalidate = invalidate
+        wrapper.refresh = refresh
+        return wrapper
+
+    return decorator
@@ -61,6 +61,8 @@ INSTALLED_APPS = [
     "apps.questions",
     "apps.subscriptions",
     "apps.ordering",
+    "apps.sync",
+    "apps.popularity",
 ]
 
 MIDDLEWARE = [
@@ -417,3 +419,63 @@ PARSPAL_CONFIG = {
     'CALLBACK_URL': env('PARSPAL_CALLBACK_URL', default='https://drcode-med.ir/api/v1/payment/parspal/callback/'),
     'SANDBOX': env.bool('PARSPAL_SANDBOX', default=False),
 }
+
+# ========= Google Analytics Settings ========= #
+# 'google' برای API واقعی و 'fake' برای تست‌ها و تست بار
+GA4_BACKEND = env('GA4_BACKEND', default='google')
+
+# ========= Notification Events ========= #
+# 'redis' برای pub/sub بین پروسه‌ها و 'memory' برای تست‌ها و توسعه
+NOTIFICATIONS_BROKER = env('NOTIFICATIONS_BROKER', default='redis')
+NOTIFICATIONS_REDIS_URL = env('NOTIFICATIONS_REDIS_URL', default='redis://127.0.0.1:6379/3')
+# اعلان‌های خوانده شده‌ی قدیمی‌تر از این تعداد روز بایگانی می‌شوند
+NOTIFICATIONS_RETENTION_DAYS = env.int('NOTIFICATIONS_RETENTION_DAYS', default=90)
+
+# ========= Offline Sync ========= #
+# tombstoneهای قدیمی‌تر از این تعداد روز پاک می‌شوند؛ کلاینتی که cursor قدیمی‌تری دارد از اول همگام می‌شود
+SYNC_TOMBSTONE_RETENTION_DAYS = env.int('SYNC_TOMBSTONE_RETENTION_DAYS', default=30)
+# تغییرات جوان‌تر از این چند ثانیه هنوز ارسال نمی‌شوند تا تراکنش‌های همزمان با شناسه‌ی کمتر commit شوند
+SYNC_SETTLE_SECONDS = env.int('SYNC_SETTLE_SECONDS', default=10)
+
+# ========= View Counters ========= #
+# 'redis' برای شمارنده‌های مشترک بین پروسه‌ها و 'memory' برای تست‌ها و توسعه
+VIEW_COUNTER_BACKEND = env('VIEW_COUNTER_BACKEND', default='redis')
+VIEW_COUNTER_REDIS_URL = env('VIEW_COUNTER_REDIS_URL', default='redis://127.0.0.1:6379/4')
+# امتیاز محبوبیت هر بازدید بعد از این تعداد روز نصف می‌شود
+POPULARITY_HALF_LIFE_DAYS = env.float('POPULARITY_HALF_LIFE_DAYS', default=7)
+
+# ========= Home Feed ========= #
+# مدت نگه‌داری پاسخ صفحه‌ی اصلی در مرورگر و CDN (ثانیه)؛ بعد از آن با ETag اعتبارسنجی می‌شود
+HOME_FEED_MAX_AGE = env.int('HOME_FEED_MAX_AGE', default=300)
+
+# ========= Celery Beat Schedule ========= #
+CELERY_BEAT_SCHEDULE = {
+    'refresh-google-analytics-report': {
+        'task': 'apps.dashboard.tasks.refresh_google_analytics_report',
+        'schedule': 10 * 60,
+    },
+    'resume-stalled-announcement-deliveries': {
+        'task': 'apps.notifications.tasks.resume_stalled_announcement_deliveries',
+        'schedule': 5 * 60,
+    },
+    'process-pending-notification-outbox': {
+        'task': 'apps.notifications.tasks.process_pending_outbox_events',
+        'schedule': 60,
+    },
+    'archive-read-notifications': {
+        'task': 'apps.notifications.tasks.archive_read_notifications',
+        'schedule': 24 * 60 * 60,
+    },
+    'prune-sync-tombstones': {
+        'task': 'apps.sync.tasks.prune_sync_tombstones',
+        'schedule': 24 * 60 * 60,
+    },
+    'rebuild-related-prescriptions': {
+        'task': 'apps.prescriptions.tasks.rebuild_all_related_prescriptions',
+        'schedule': 24 * 60 * 60,
+    },
+    'flush-view-counters': {
+        'task': 'apps.popularity.tasks.flush_view_counters',
+        'schedule': 5 * 60,
+    },
+}
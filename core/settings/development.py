@@ -20,6 +20,15 @@ ZARINPAL_CONFIG = {
 }
 
 
+# ========= Google Analytics ========= #
+GA4_BACKEND = env('GA4_BACKEND', default='fake')
+
+# ========= Notification Events ========= #
+NOTIFICATIONS_BROKER = env('NOTIFICATIONS_BROKER', default='memory')
+
+# ========= View Counters ========= #
+VIEW_COUNTER_BACKEND = env('VIEW_COUNTER_BACKEND', default='memory')
+
 # ======= CACHE CONFIGS ======= #
 # CACHES = {
 #     "default": {
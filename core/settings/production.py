@@ -82,6 +82,12 @@ CACHES = {
     }
 }
 
+# رویدادهای لحظه‌ای اعلان‌ها (Redis pub/sub)
+NOTIFICATIONS_REDIS_URL = "unix:///home/drcodeme/redis/redis.sock?db=3"
+
+# شمارنده‌های بازدید (HINCRBY و HyperLogLog)
+VIEW_COUNTER_REDIS_URL = "unix:///home/drcodeme/redis/redis.sock?db=4"
+
 # Broker (Redis با socket)
 CELERY_BROKER_URL = "redis+socket:///home/drcodeme/redis/redis.sock?virtual_host=1"
 
@@ -0,0 +1,21 @@
+import unicodedata
+
+
+# ====== Persian Text Normalization ====== #
+# نویسه‌های عربی هم‌شکل، اعداد فارسی/عربی و کشیده یکسان‌سازی می‌شوند
+_PERSIAN_TEXT_TABLE = str.maketrans({
+    'ي': 'ی', 'ى': 'ی', 'ك': 'ک',
+    'ـ': None,
+    '\u200c': ' ', '\u200d': None,
+    **{chr(0x06F0 + digit): str(digit) for digit in range(10)},
+    **{chr(0x0660 + digit): str(digit) for digit in range(10)},
+})
+
+
+def normalize_persian_text(text):
+    """
+    شکل استاندارد متن فارسی برای مقایسه و جستجو؛ متن‌هایی که فقط در فاصله‌ها،
+    نیم‌فاصله، ی/ک عربی یا اعداد فارسی تفاوت دارند یکسان می‌شوند.
+    """
+    text = unicodedata.normalize('NFKC', text or '').translate(_PERSIAN_TEXT_TABLE)
+    return ' '.join(text.split())
@@ -190,9 +190,10 @@ const API = {
             },
     
             // علامت زدن به عنوان خوانده شده
-            async markAsRead(notificationId) {
+            async markAsRead(notificationId, kind = 'notification') {
                 try {
-                    const url = `${API.BASE_URL}api/v1/notifications/user/${notificationId}/`;
+                    const path = kind === 'announcement' ? `announcements/${notificationId}` : notificationId;
+                    const url = `${API.BASE_URL}api/v1/notifications/user/${path}/`;
                     
                     console.log('📡 POST:', url);
     
@@ -211,6 +212,82 @@ const API = {
                     console.error('❌ Mark as read error:', error);
                     return API.handleError(error);
                 }
+            },
+
+            // علامت زدن همه به عنوان خوانده شده (یک درخواست)
+            async markAllAsRead() {
+                try {
+                    const url = `${API.BASE_URL}api/v1/notifications/user/mark-all-read/`;
+
+                    const response = await axios.post(url, {}, {
+                        headers: API.getAuthHeaders()
+                    });
+
+                    return {
+                        success: true,
+                        data: response.data
+                    };
+
+                } catch (error) {
+                    console.error('❌ Mark all as read error:', error);
+                    return API.handleError(error);
+                }
+            },
+
+            // دریافت تعداد خوانده نشده‌ها (برای polling)
+            async getUnreadCount() {
+                try {
+                    const url = `${API.BASE_URL}api/v1/notifications/user/unread-count/`;
+
+                    const response = await axios.get(url, {
+                        headers: API.getAuthHeaders()
+                    });
+
+                    return {
+                        success: true,
+                        data: response.data
+                    };
+
+                } catch (error) {
+                    console.error('❌ Unread count error:', error);
+                    return API.handleError(error);
+                }
+            },
+
+            // اتصال به استریم SSE شمارنده‌ی اعلان‌ها
+            // onEvent برای هر رویداد { unread_count, item } صدا زده می‌شود.
+            // خروجی: false اگر سرور استریم را پشتیبانی نکند (باید polling کرد)
+            async stream(onEvent, signal = null) {
+                const url = `${API.BASE_URL}api/v1/notifications/user/stream/`;
+                const response = await fetch(url, {
+                    headers: { ...API.getAuthHeaders(), 'Accept': 'text/event-stream' },
+                    signal
+                });
+
+                if (response.status === 204 || !response.ok || !response.body) {
+                    return false;
+                }
+
+                const reader = response.body.getReader();
+                const decoder = new TextDecoder();
+                let buffer = '';
+
+                while (true) {
+                    const { value, done } = await reader.read();
+                    if (done) break;
+
+                    buffer += decoder.decode(value, { stream: true });
+                    const events = buffer.split('\n\n');
+                    buffer = events.pop();
+
+                    events.forEach(raw => {
+                        const dataLine = raw.split('\n').find(line => line.startsWith('data: '));
+                        if (dataLine) {
+                            onEvent(JSON.parse(dataLine.slice(6)));
+                        }
+                    });
+                }
+                return true;
             }
         },
     
@@ -23,8 +23,11 @@ document.addEventListener('alpine:init', () => {
             this.showForm = true;
         },
 
-        openDelete(id, title) {
-            this.drug = { id, title, code: '', is_for_order: false };
+        openDelete(id, title, prescriptionCount = 0, orderCount = 0) {
+            this.drug = {
+                id, title, code: '', is_for_order: false,
+                prescription_count: prescriptionCount, order_count: orderCount,
+            };
             this.deleteAction = config.deleteUrlTpl.replace('0', id);
             this.showDelete = true;
         },
@@ -61,4 +61,39 @@ document.addEventListener('alpine:init', () => {
             this.showDelete = true;
         },
     }));
+
+    // ===== پیشرفت ارسال پیامک/ایمیل پیام گروهی ===== //
+    // deliveryProgress({ url, status, statusDisplay, percent })
+    Alpine.data('deliveryProgress', (config) => ({
+        status: config.status,
+        statusDisplay: config.statusDisplay,
+        percent: config.percent,
+        timer: null,
+
+        init() {
+            if (this.isRunning()) {
+                this.timer = setInterval(() => this.poll(), 3000);
+            }
+        },
+
+        isRunning() {
+            return this.status === 'pending' || this.status === 'in_progress';
+        },
+
+        poll() {
+            axios.get(config.url)
+                .then(res => {
+                    const data = res.data.data;
+                    this.status = data.status;
+                    this.statusDisplay = data.status_display;
+                    this.percent = data.percent;
+                    if (!this.isRunning()) clearInterval(this.timer);
+                })
+                .catch(() => clearInterval(this.timer));
+        },
+
+        destroy() {
+            clearInterval(this.timer);
+        },
+    }));
 });
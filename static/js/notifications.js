@@ -6,7 +6,6 @@ function notificationsApp() {
         notifications: [],
         loading: true,
         pageLoading: false,
-        totalCount: 0,
         unreadCount: 0,
         nextPage: null,
         previousPage: null,
@@ -30,6 +29,7 @@ function notificationsApp() {
                 this.pageLoading = !!url;
 
 
+                const previousUrl = this.previousPage;
                 const response = await API.notifications.getNotifications(url);
 
                 if (response.success) {
@@ -38,8 +38,6 @@ function notificationsApp() {
                     // الان: response.data.notifications
                     this.notifications = response.data.notifications || response.data.results || [];
                     
-                    this.totalCount = response.data.total_count || 0; // اصلاح نام فیلد
-                    
                     // این فیلدها ممکن است در پاسخ جدید نباشند، اگر پیجینیشن ندارید null بگذارید
                     this.nextPage = response.data.next || null;
                     this.previousPage = response.data.previous || null;
@@ -49,12 +47,13 @@ function notificationsApp() {
                     // الان: response.data.unread_count
                     this.unreadCount = response.data.unread_count || 0;
 
-                    // محاسبه شماره صفحه
-                    if (url) {
-                        const urlParams = new URLSearchParams(url.split('?')[1]);
-                        this.currentPage = parseInt(urlParams.get('page') || '1');
-                    } else {
+                    // محاسبه شماره صفحه (صفحه‌بندی کرسری است)
+                    if (!url) {
                         this.currentPage = 1;
+                    } else if (url === previousUrl) {
+                        this.currentPage = Math.max(1, this.currentPage - 1);
+                    } else {
+                        this.currentPage += 1;
                     }
 
                 } else {
@@ -87,7 +86,7 @@ function notificationsApp() {
 
             try {
 
-                const response = await API.notifications.markAsRead(notification.id);
+                const response = await API.notifications.markAsRead(notification.id, notification.kind);
 
                 if (response.success) {
                     // به‌روزرسانی state
@@ -143,15 +142,11 @@ function notificationsApp() {
                 if (!result.isConfirmed) return;
 
 
-                // فیلتر نوتیف‌های خوانده نشده
-                const unreadNotifications = this.notifications.filter(n => !n.is_read);
-
-                // ارسال درخواست برای همه
-                const promises = unreadNotifications.map(notification => 
-                    API.notifications.markAsRead(notification.id)
-                );
-
-                await Promise.all(promises);
+                // یک درخواست برای همه‌ی اعلان‌ها (حتی صفحه‌های دیگر)
+                const response = await API.notifications.markAllAsRead();
+                if (!response.success) {
+                    throw new Error(response.message);
+                }
 
                 // به‌روزرسانی state
                 this.notifications.forEach(n => n.is_read = true);
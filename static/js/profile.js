@@ -180,9 +180,8 @@ const profileApp = {
 
     async fetchUnreadNotifications() {
         try {
-            // فرض بر این است که API دریافت لیست نوتیفیکیشن‌ها، تعداد خوانده نشده را هم برمی‌گرداند
-            // مشابه کاری که در notificationWidget انجام دادید
-            const response = await API.notifications.getNotifications();
+            // endpoint سبک شمارنده (خواندن از کش)
+            const response = await API.notifications.getUnreadCount();
             if (response.success && response.data) {
                 this.unreadNotificationsCount = response.data.unread_count || 0;
             }